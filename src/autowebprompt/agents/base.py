@@ -6,6 +6,7 @@ ChatGPTWebAgent) must implement. The engine and batch runner operate against thi
 base class, allowing new agents to be added without modifying orchestration logic.
 """
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -83,6 +84,18 @@ class ConversationMessage:
     timestamp: Optional[datetime] = None
     metadata: dict = field(default_factory=dict)
 
+    def __eq__(self, other):
+        # Field-by-field and-chain; the generated dataclass __eq__ builds two
+        # tuples per comparison on Python < 3.13
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.role == other.role
+            and self.content == other.content
+            and self.timestamp == other.timestamp
+            and self.metadata == other.metadata
+        )
+
 
 class WebAgent(ABC):
     """
@@ -115,6 +128,45 @@ class WebAgent(ABC):
         self.messages: list[ConversationMessage] = []
         self.current_response_count = 0
 
+    # Started downloads are saved in parallel, at most this many at once.
+    MAX_CONCURRENT_SAVES = 4
+
+    async def _save_downloads(self, pending: list[tuple]) -> list[str]:
+        """
+        Wait for and save Playwright downloads concurrently.
+
+        Clicks must stay sequential so each expect_download() is paired with its
+        button; the transfers themselves can overlap.
+
+        Args:
+            pending: (download, save_path) pairs; a save_path of None keeps the
+                file where Playwright put it.
+
+        Returns:
+            Paths of the downloads that were saved, in the order given.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SAVES)
+
+        async def save(download, save_path):
+            async with semaphore:
+                if save_path is None:
+                    return str(await download.path())
+                await download.save_as(str(save_path))
+                return str(save_path)
+
+        results = await asyncio.gather(
+            *(save(download, save_path) for download, save_path in pending),
+            return_exceptions=True,
+        )
+        saved = []
+        for (download, _), result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to save {download.suggested_filename}: {result}")
+            else:
+                logger.info(f"Downloaded: {result}")
+                saved.append(result)
+        return saved
+
     @abstractmethod
     async def navigate_to_new_chat(self) -> bool:
         """Navigate to the provider's chat interface to start a fresh conversation."""
@@ -764,6 +764,8 @@ class ChatGPTWebAgent(WebAgent):
             except Exception as e:
                 logger.info(f"CDP download setup failed ({e}), using Playwright fallback")
 
+            # Playwright downloads are started in order and saved concurrently
+            pending = []
             for info in artifact_info:
                 filename = info["filename"]
                 dl_id = info["downloadId"]
@@ -811,14 +813,12 @@ class ChatGPTWebAgent(WebAgent):
                         async with self.page.expect_download(timeout=timeout) as dl_info:
                             await dl_btn.click()
                         download = await dl_info.value
-                        save_path = download_path / download.suggested_filename
-                        await download.save_as(str(save_path))
-                        logger.info(f"Downloaded: {save_path}")
-                        downloaded.append(str(save_path))
+                        pending.append((download, download_path / download.suggested_filename))
 
                 except Exception as e:
                     logger.warning(f"Failed to download {filename}: {e}")
                     continue
+            downloaded.extend(await self._save_downloads(pending))
 
             if downloaded:
                 return downloaded
@@ -846,6 +846,7 @@ class ChatGPTWebAgent(WebAgent):
                 return links;
             }""", baseline)
 
+            pending = []
             for link_info in download_links:
                 try:
                     logger.info(f"Trying sandbox link: {link_info['text']}")
@@ -878,14 +879,12 @@ class ChatGPTWebAgent(WebAgent):
                         async with self.page.expect_download(timeout=timeout) as dl_info:
                             await link.first.click()
                         download = await dl_info.value
-                        save_path = download_path / download.suggested_filename
-                        await download.save_as(str(save_path))
-                        logger.info(f"Downloaded via sandbox link: {save_path}")
-                        downloaded.append(str(save_path))
+                        pending.append((download, download_path / download.suggested_filename))
 
                 except Exception as e:
                     logger.warning(f"Sandbox download failed for {link_info['text']}: {e}")
                     continue
+            downloaded.extend(await self._save_downloads(pending))
 
             if not downloaded:
                 logger.warning("No artifacts downloaded (no preview cards or sandbox links found)")
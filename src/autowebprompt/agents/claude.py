@@ -516,6 +516,8 @@ class ClaudeWebAgent(WebAgent):
                 logger.warning("No download buttons found on page")
             else:
                 logger.info(f"Found {len(all_download_btns)} download button(s)")
+                # Start every download first, then save them concurrently
+                pending = []
                 for i, btn in enumerate(all_download_btns):
                     try:
                         if not await btn.is_visible():
@@ -524,17 +526,17 @@ class ClaudeWebAgent(WebAgent):
                         async with self.page.expect_download(timeout=timeout) as download_info:
                             await btn.click()
                         download = await download_info.value
-                        if download_dir:
-                            save_path = Path(download_dir) / download.suggested_filename
-                            await download.save_as(str(save_path))
-                        else:
-                            save_path = Path(download.path())
-                        downloaded_files.append(str(save_path))
-                        logger.info(f"Downloaded: {save_path}")
+                        save_path = (
+                            Path(download_dir) / download.suggested_filename
+                            if download_dir
+                            else None
+                        )
+                        pending.append((download, save_path))
                         await asyncio.sleep(0.5)
                     except Exception as e:
                         logger.warning(f"Failed to download artifact {i+1}: {e}")
                         continue
+                downloaded_files.extend(await self._save_downloads(pending))
         except Exception as e:
             logger.error(f"Failed to download artifacts: {e}")
 
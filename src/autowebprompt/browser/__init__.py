@@ -1,5 +1,6 @@
 """Browser management for Chrome CDP connections."""
 
 from .manager import BrowserManager
+from .pool import BrowserPool
 
-__all__ = ["BrowserManager"]
+__all__ = ["BrowserManager", "BrowserPool"]
@@ -6,6 +6,7 @@ Supports Chrome, Chrome Canary, and Chromium.
 """
 
 import asyncio
+import json
 import logging
 import os
 import platform
@@ -136,6 +137,10 @@ class BrowserManager:
         self.cdp_port = browser_config.get("cdp_port", DEFAULT_CDP_PORT)
         self.profile_dir = browser_config.get("profile_dir", DEFAULT_PROFILE_DIR)
 
+        # (mtime_ns, storage_state) of the last auth_state.json read or written;
+        # the file only changes on login, so retries skip re-parsing it
+        self._auth_state_cache: tuple[int, dict] | None = None
+
     def is_cdp_mode(self) -> bool:
         """Check if using Chrome CDP mode."""
         return self.browser_type in ("chrome_canary", "cdp", "chrome")
@@ -195,17 +200,7 @@ class BrowserManager:
             logger.error(f"Failed to connect to Chrome: {e}")
             raise
 
-        # Get existing context or create new one
-        contexts = browser.contexts
-        if contexts:
-            context = contexts[0]
-            logger.info(f"Using existing context ({len(context.pages)} page(s))")
-        else:
-            context = await browser.new_context(ignore_https_errors=True)
-            logger.info("Created new browser context")
-
-        context.set_default_timeout(self.timeout)
-        return browser, context
+        return browser, await self.new_context(browser)
 
     async def _launch_browser_classic(self, playwright):
         """Launch browser using classic Playwright mode."""
@@ -218,34 +213,68 @@ class BrowserManager:
         else:
             browser_instance = playwright.chromium
 
-        # Get auth state path
-        auth_state_path = self._get_auth_state_path()
+        browser = await browser_instance.launch(headless=self.headless)
+        return browser, await self.new_context(browser)
 
-        if auth_state_path.exists():
-            logger.info(f"Loading auth state from: {auth_state_path}")
-            import json
-            with open(auth_state_path, "r") as f:
-                storage_state = json.load(f)
+    async def new_context(self, browser):
+        """
+        Get a browser context on an already-launched browser.
 
-            browser = await browser_instance.launch(headless=self.headless)
-            context = await browser.new_context(
-                storage_state=storage_state,
-                ignore_https_errors=True
-            )
-        else:
-            logger.warning(f"No auth state found at: {auth_state_path}")
-            logger.warning("You may need to log in manually")
+        Contexts are far cheaper than browsers, so retries reuse the browser and
+        only ask for a new context here.
 
-            browser = await browser_instance.launch(headless=self.headless)
-            context = await browser.new_context(ignore_https_errors=True)
+        Args:
+            browser: Browser returned by launch_browser()
+
+        Returns:
+            BrowserContext: Chrome's shared context in CDP mode, otherwise a
+            fresh context loaded with the saved auth state.
+        """
+        if self.is_cdp_mode():
+            contexts = browser.contexts
+            if contexts:
+                context = contexts[0]
+                logger.info(f"Using existing context ({len(context.pages)} page(s))")
+            else:
+                context = await browser.new_context(ignore_https_errors=True)
+                logger.info("Created new browser context")
+        else:
+            auth_state_path = self._get_auth_state_path()
+            storage_state = self._load_auth_state(auth_state_path)
+            if storage_state is not None:
+                context = await browser.new_context(
+                    storage_state=storage_state,
+                    ignore_https_errors=True
+                )
+            else:
+                logger.warning(f"No auth state found at: {auth_state_path}")
+                logger.warning("You may need to log in manually")
+                context = await browser.new_context(ignore_https_errors=True)
 
         context.set_default_timeout(self.timeout)
-        return browser, context
+        return context
 
     def _get_auth_state_path(self) -> Path:
         """Get path to auth state file."""
         return Path(self.profile_dir) / "auth_state.json"
 
+    def _load_auth_state(self, auth_state_path: Path) -> dict | None:
+        """Return the saved auth state, re-reading the file only when it changed."""
+        try:
+            mtime_ns = auth_state_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+        cached = self._auth_state_cache
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        logger.info(f"Loading auth state from: {auth_state_path}")
+        with open(auth_state_path, "r") as f:
+            storage_state = json.load(f)
+        self._auth_state_cache = (mtime_ns, storage_state)
+        return storage_state
+
     async def save_auth_state(self, context) -> bool:
         """Save browser auth state for future sessions."""
         try:
@@ -253,9 +282,9 @@ class BrowserManager:
             auth_state_path.parent.mkdir(parents=True, exist_ok=True)
             storage_state = await context.storage_state()
 
-            import json
             with open(auth_state_path, "w") as f:
                 json.dump(storage_state, f, indent=2)
+            self._auth_state_cache = (auth_state_path.stat().st_mtime_ns, storage_state)
 
             logger.info(f"Saved auth state to: {auth_state_path}")
             return True
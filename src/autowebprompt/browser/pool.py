@@ -0,0 +1,162 @@
+"""
+Process-wide browser pool.
+
+One Playwright driver and one browser per provider are launched lazily and
+shared by every task run in the process (e.g. a --daemon engine serving a
+batch). Tasks borrow a context per attempt and hand it back when done; the
+browser itself lives until close_all().
+
+A caller that already runs its own Playwright driver or browser (e.g. a batch
+driver) can hand them to acquire(); the pool uses them but leaves closing them
+to the caller.
+"""
+
+import asyncio
+import logging
+from typing import ClassVar
+
+from playwright.async_api import async_playwright
+
+from .manager import BrowserManager
+
+logger = logging.getLogger(__name__)
+
+
+class _PoolEntry:
+    __slots__ = ("browser", "manager", "owns_browser", "playwright_ctx")
+
+    def __init__(self, playwright_ctx, browser, manager: BrowserManager, owns_browser: bool = True):
+        # playwright_ctx is None when the Playwright driver belongs to the caller
+        self.playwright_ctx = playwright_ctx
+        self.browser = browser
+        self.manager = manager
+        self.owns_browser = owns_browser
+
+
+class BrowserPool:
+    """
+    Shares one browser per provider across tasks.
+
+    Usage:
+        browser_mgr, context = await BrowserPool.acquire("claude_web", config)
+        try:
+            page = await context.new_page()
+            ...
+        finally:
+            await BrowserPool.release(context)
+
+        await BrowserPool.close_all()  # once, before the event loop exits
+
+    The browser settings of the first task for a provider are used for the
+    lifetime of its pooled browser. Playwright objects are bound to the event
+    loop they were created on, so the pool starts over if used from a new loop.
+    """
+
+    _entries: ClassVar[dict[str, _PoolEntry]] = {}
+    _borrowed: ClassVar[dict] = {}
+    _lock: ClassVar[asyncio.Lock | None] = None
+    _loop: ClassVar[asyncio.AbstractEventLoop | None] = None
+
+    @classmethod
+    def _bind_loop(cls):
+        loop = asyncio.get_running_loop()
+        if cls._loop is not loop:
+            if cls._entries:
+                logger.warning("Browser pool used from a new event loop; dropping stale browsers")
+            cls._entries = {}
+            cls._borrowed = {}
+            cls._lock = asyncio.Lock()
+            cls._loop = loop
+
+    @classmethod
+    async def acquire(
+        cls,
+        provider_key: str,
+        config: dict,
+        playwright=None,
+        browser=None,
+    ) -> tuple[BrowserManager, object]:
+        """
+        Borrow a browser context for provider_key, launching the browser on first use.
+
+        Args:
+            provider_key: 'claude_web' or 'chatgpt_web'
+            config: Task configuration (browser settings are read on first launch)
+            playwright: Caller-owned Playwright instance to launch on instead of
+                starting a driver of our own
+            browser: Caller-owned, already-launched browser to borrow contexts from
+
+        Returns:
+            tuple: (BrowserManager, BrowserContext)
+        """
+        cls._bind_loop()
+        async with cls._lock:
+            entry = cls._entries.get(provider_key)
+            if browser is not None and (entry is None or entry.browser is not browser):
+                if entry is not None:
+                    await cls._close_entry(entry)
+                entry = _PoolEntry(None, browser, BrowserManager(config), owns_browser=False)
+                cls._entries[provider_key] = entry
+
+            if entry is not None and entry.browser.is_connected():
+                context = await entry.manager.new_context(entry.browser)
+            elif entry is not None and not entry.owns_browser:
+                cls._entries.pop(provider_key, None)
+                raise RuntimeError(f"Shared browser for {provider_key} is disconnected")
+            else:
+                if entry is not None:
+                    logger.warning(f"Pooled browser for {provider_key} disconnected; relaunching")
+                    await cls._close_entry(entry)
+                manager = BrowserManager(config)
+                playwright_ctx = None
+                if playwright is None:
+                    playwright_ctx = async_playwright()
+                    playwright = await playwright_ctx.__aenter__()
+                try:
+                    launched, context = await manager.launch_browser(playwright)
+                except BaseException:
+                    if playwright_ctx is not None:
+                        await playwright_ctx.__aexit__(None, None, None)
+                    cls._entries.pop(provider_key, None)
+                    raise
+                entry = _PoolEntry(playwright_ctx, launched, manager)
+                cls._entries[provider_key] = entry
+
+            cls._borrowed[context] = entry
+            return entry.manager, context
+
+    @classmethod
+    async def release(cls, context):
+        """Return a borrowed context; it is closed unless it is Chrome's shared CDP context."""
+        entry = cls._borrowed.pop(context, None)
+        if entry is None:
+            return
+        try:
+            await entry.manager.close_browser(context)
+        except Exception as e:
+            logger.warning(f"Error releasing browser context: {e}")
+
+    @classmethod
+    async def close_all(cls):
+        """Close every pooled browser and stop their Playwright drivers."""
+        if cls._loop is not asyncio.get_running_loop():
+            return
+        entries = list(cls._entries.values())
+        cls._entries = {}
+        cls._borrowed = {}
+        for entry in entries:
+            await cls._close_entry(entry)
+
+    @staticmethod
+    async def _close_entry(entry: _PoolEntry):
+        try:
+            if entry.owns_browser and not entry.manager.is_cdp_mode():
+                await entry.browser.close()
+        except Exception:
+            pass
+        if entry.playwright_ctx is None:
+            return
+        try:
+            await entry.playwright_ctx.__aexit__(None, None, None)
+        except Exception:
+            pass
@@ -118,19 +118,22 @@ def init(api_key, name, region, env_file):
 
     # 5. Test connection.
     console.print("Testing connection...", style="dim")
-    from autowebprompt.storage.schema import check_connection
+    from autowebprompt.storage.schema import check_connection, close_connections
 
-    if not check_connection(project.connection_uri):
-        console.print("[red]Connection test failed.[/red]")
-        raise SystemExit(1)
-    console.print("[green]Connection OK.[/green]")
+    try:
+        if not check_connection(project.connection_uri):
+            console.print("[red]Connection test failed.[/red]")
+            raise SystemExit(1)
+        console.print("[green]Connection OK.[/green]")
 
-    # 6. Save to env file.
-    saved_path = _save_database_url(project.connection_uri, env_file)
-    console.print(f"[green]DATABASE_URL saved to {saved_path}[/green]")
+        # 6. Save to env file.
+        saved_path = _save_database_url(project.connection_uri, env_file)
+        console.print(f"[green]DATABASE_URL saved to {saved_path}[/green]")
 
-    # 7. Run migration.
-    _run_migrate_inner(project.connection_uri)
+        # 7. Run migration (reuses the connection opened by check_connection).
+        _run_migrate_inner(project.connection_uri)
+    finally:
+        close_connections()
 
     console.print("\n[bold green]Database ready![/bold green] Run tasks with --fetch-from-db.")
 
@@ -195,7 +198,11 @@ def status(database_url, env_file):
         )
         raise SystemExit(1)
 
-    from autowebprompt.storage.schema import check_connection, get_table_status
+    from autowebprompt.storage.schema import (
+        check_connection,
+        close_connections,
+        get_table_status,
+    )
 
     # Connection test.
     console.print("Testing connection...", style="dim")
@@ -204,8 +211,11 @@ def status(database_url, env_file):
         raise SystemExit(1)
     console.print("[green]Connected.[/green]\n")
 
-    # Table status.
-    info = get_table_status(url)
+    # Table status (reuses the connection opened by check_connection).
+    try:
+        info = get_table_status(url)
+    finally:
+        close_connections()
 
     table = Table(title="Database Status")
     table.add_column("Item", style="bold")
@@ -219,6 +229,6 @@ def status(database_url, env_file):
         exists_str = "[green]yes[/green]" if tbl_info["exists"] else "[red]no[/red]"
         table.add_row(f"{tbl_name} exists", exists_str)
         if tbl_info["exists"]:
-            table.add_row(f"{tbl_name} rows", str(tbl_info["rows"]))
+            table.add_row(f"{tbl_name} rows (est.)", str(tbl_info["rows"]))
 
     console.print(table)
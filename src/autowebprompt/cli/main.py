@@ -36,7 +36,10 @@ def setup():
 @click.option("--start", type=int, default=0, help="Start from this task index")
 @click.option("--end", type=int, default=None, help="Stop at this task index")
 @click.option("--timeout", type=int, default=None, help="Timeout per task in seconds")
-def run(tasks, template, provider, csv_file, task, files, fetch_from_db, dry_run, start, end, timeout):
+@click.option("--concurrency", type=int, default=1, help="Number of tasks to run at once (not in Chrome CDP mode)")
+@click.option("--persistent-engine", is_flag=True, help="Reuse one engine process across tasks")
+def run(tasks, template, provider, csv_file, task, files, fetch_from_db, dry_run, start, end, timeout,
+        concurrency, persistent_engine):
     """Run automation tasks against ChatGPT or Claude."""
     from autowebprompt.engine.batch import BatchRunner
 
@@ -44,6 +47,7 @@ def run(tasks, template, provider, csv_file, task, files, fetch_from_db, dry_run
         runner = BatchRunner(
             template_path=template,
             fetch_from_db=fetch_from_db,
+            persistent_engine=persistent_engine,
         )
         runner.provider = provider
 
@@ -59,6 +63,7 @@ def run(tasks, template, provider, csv_file, task, files, fetch_from_db, dry_run
             start_index=start,
             end_index=end,
             default_timeout=timeout,
+            concurrency=concurrency,
         )
 
         # Print summary
@@ -1,39 +1,78 @@
 """Configuration loading and validation."""
 
+import functools
 import logging
+import os
 from pathlib import Path
+from typing import IO
 
 import yaml
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader when PyYAML was built with it; same semantics as safe_load
+_LOADER = yaml.CSafeLoader if hasattr(yaml, "CSafeLoader") else yaml.SafeLoader
 
-def load_config(config_path: str | Path) -> dict:
+# Provider keys with their own config section; anything else means claude_web
+_KNOWN_PROVIDERS = frozenset({"claude_web", "chatgpt_web"})
+
+
+def _fast_copy(obj):
+    """
+    Deep-copy a config value.
+
+    Configs hold only YAML/JSON types, so dicts and lists are the only
+    containers to copy; anything else is returned as is. Much cheaper than
+    copy.deepcopy, which pays for a memo dict and per-type dispatch.
+    """
+    if isinstance(obj, dict):
+        return {k: _fast_copy(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_fast_copy(v) for v in obj]
+    return obj
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_cached(path: str, mtime_ns: int, size: int):
+    """Parse a YAML file; mtime_ns and size are only part of the cache key."""
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_LOADER)
+
+
+def load_config(config_path: str | Path | IO[str]) -> dict:
     """
     Load configuration from a YAML file.
 
     Handles template nesting (if config has a 'template' key, unwraps it).
+    Parsed files are cached until their mtime or size changes; every call
+    returns a fresh copy.
 
     Args:
-        config_path: Path to YAML config file
+        config_path: Path to YAML config file, or an open text stream
+            (parsed directly, never cached)
 
     Returns:
         Configuration dictionary
     """
-    config_path = Path(config_path)
-    if not config_path.exists():
-        raise FileNotFoundError(f"Config file not found: {config_path}")
+    if hasattr(config_path, "read"):
+        return _unwrap_template(yaml.load(config_path, Loader=_LOADER))
 
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+    path = os.path.abspath(config_path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {Path(config_path)}") from None
 
-    if config is None:
-        config = {}
+    # Unwrap before copying so keys beside 'template' are never copied
+    return _fast_copy(_unwrap_template(_parse_cached(path, st.st_mtime_ns, st.st_size)))
 
-    # Handle template nesting
-    if "template" in config:
-        config = config["template"]
 
+def _unwrap_template(config) -> dict:
+    """Return the 'template' section of a parsed config, or the config itself."""
+    if config is None:
+        return {}
+    if "template" in config:
+        return config["template"]
     return config
 
 
@@ -41,7 +80,11 @@ def merge_task_config(task_config: dict, template_config: dict) -> dict:
     """
     Merge task-specific config with template defaults.
 
-    Task values override template values. Nested dicts are merged recursively.
+    Task values override template values. Dicts present in both are merged
+    one level deep (task keys win); anything below that is replaced. Neither
+    input is mutated: every template value that ends up in the result is
+    copied, while template values the task overrides are never copied and
+    task values are used as given.
 
     Args:
         task_config: Task-specific configuration
@@ -50,15 +93,16 @@ def merge_task_config(task_config: dict, template_config: dict) -> dict:
     Returns:
         Merged configuration dictionary
     """
-    import copy
-
-    config = copy.deepcopy(template_config)
+    config = {
+        key: value if key in task_config else _fast_copy(value)
+        for key, value in template_config.items()
+    }
 
     for key, value in task_config.items():
-        if isinstance(value, dict) and key in config and isinstance(config[key], dict):
-            config[key].update(value)
-        else:
-            config[key] = value
+        base = template_config.get(key)
+        if isinstance(value, dict) and isinstance(base, dict):
+            value = {k: v if k in value else _fast_copy(v) for k, v in base.items()} | value
+        config[key] = value
 
     return config
 
@@ -74,7 +118,7 @@ def get_provider_config(config: dict) -> tuple[str, dict]:
         Tuple of (provider_key, agent_config) where provider_key is
         'claude_web' or 'chatgpt_web'
     """
-    agent_type = config.get("agent_type", "claude_web")
-    if agent_type == "chatgpt_web":
-        return "chatgpt_web", config.get("chatgpt_web", {})
-    return "claude_web", config.get("claude_web", {})
+    key = config.get("agent_type", "claude_web")
+    if key not in _KNOWN_PROVIDERS:
+        key = "claude_web"
+    return key, config.get(key, {})
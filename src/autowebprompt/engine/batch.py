@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-autowebprompt Batch Runner - Run multiple tasks through web automation sequentially.
+autowebprompt Batch Runner - Run multiple tasks through web automation.
 
 This script orchestrates running multiple tasks through web automation providers,
 supporting both Claude.ai and ChatGPT.
@@ -18,43 +18,82 @@ Usage:
     # Run specific task indices
     python -m autowebprompt.engine.batch --tasks tasks.yaml --start 0 --end 5
 
+    # Run up to 3 tasks at once
+    python -m autowebprompt.engine.batch --tasks tasks.yaml --concurrency 3
+
     # Fetch task files from database (for WSP tasks)
     python -m autowebprompt.engine.batch --tasks tasks_wsp_1.yaml --fetch-from-db
 """
 
 import argparse
+import concurrent.futures
 import json
 import logging
 import os
+import select
 import signal
 import subprocess
 import sys
 import tempfile
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
+from urllib.parse import urlparse
 
 import yaml
 
+from autowebprompt.browser.manager import BrowserManager
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
-# Global for signal handling
-_current_process = None
+# libyaml-backed dumper when available
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Marker line printed by a --daemon engine after each task
+# (must match runner.DAEMON_RESULT_PREFIX)
+ENGINE_RESULT_PREFIX = b"__AUTOWEBPROMPT_RESULT__ "
+
+# Running engine subprocesses, for signal handling
+_active_processes = set()
+_active_processes_lock = threading.Lock()
+_shutdown_requested = threading.Event()
+
+
+def _register_process(process: subprocess.Popen):
+    """Track a running engine process; terminate it at once if shutdown has begun."""
+    with _active_processes_lock:
+        _active_processes.add(process)
+    # Checked after adding, so a process started while the signal handler runs
+    # is either in its snapshot or sees the flag here
+    if _shutdown_requested.is_set():
+        process.terminate()
+
+
+def _unregister_process(process: subprocess.Popen):
+    """Stop tracking an engine process."""
+    with _active_processes_lock:
+        _active_processes.discard(process)
 
 
 def _signal_handler(signum, frame):
-    """Handle Ctrl+C - terminate current task."""
-    global _current_process
-    if _current_process:
-        logger.warning("Interrupt received - terminating current task...")
-        _current_process.terminate()
-        try:
-            _current_process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            _current_process.kill()
+    """Handle Ctrl+C - terminate all running tasks."""
+    _shutdown_requested.set()
+    # No lock here: the handler may interrupt a thread that holds it.
+    # Copying the set is atomic under the GIL.
+    processes = list(_active_processes)
+    if processes:
+        logger.warning("Interrupt received - terminating running tasks...")
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
     sys.exit(1)
 
 
@@ -66,12 +105,28 @@ class BatchRunner:
     # Default download directory for task files
     TASK_DOWNLOAD_DIR = Path("/tmp/claude_web_tasks")
 
+    # Maximum number of concurrent S3 downloads per task
+    MAX_DOWNLOAD_WORKERS = 8
+
+    # Number of upcoming tasks whose files are prefetched while a task runs
+    PREFETCH_LOOKAHEAD = 2
+
+    # Temp configs go to tmpfs when available so they never hit disk
+    TEMP_CONFIG_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+    # Prepared SELECT statements, built on first database use
+    _statements = None
+
+    # Keys of each entry in the run_all_tasks() "tasks" summary
+    RESULT_FIELDS = ("task_name", "index", "success", "duration_seconds")
+
     def __init__(
         self,
         template_path: Path = None,
         engine_script: Path = None,
         python_cmd: list = None,
         fetch_from_db: bool = False,
+        persistent_engine: bool = False,
     ):
         """
         Initialize batch runner.
@@ -81,13 +136,32 @@ class BatchRunner:
             engine_script: Path to the engine runner script
             python_cmd: Python command to use (default: [sys.executable])
             fetch_from_db: If True, fetch task files from database
+            persistent_engine: If True, feed tasks to a long-lived engine
+                process (--daemon) instead of starting one per task
         """
         self.template_path = template_path
         self.template = self._load_template() if template_path else {}
+        self._json_encoder = json.JSONEncoder(default=str)
+        # Template values are identical for every task, so encode them once
+        self._template_json = {
+            key: self._json_encoder.encode(value) for key, value in self.template.items()
+        }
         self.fetch_from_db = fetch_from_db
+        self.persistent_engine = persistent_engine
         self.provider = "claude"  # Default, overridden by CLI
         self.db_session = None
         self._SessionLocal = None
+        self._s3_client = None
+        self._s3_client_lock = threading.Lock()
+        self._prefetch_executor = None
+        self._prefetched = {}  # task index -> future, until run_task takes it
+        self._prefetch_claimed = set()  # task indices submitted or taken, never resubmitted
+        self._prefetch_lock = threading.Lock()
+        self._db_cache = {}  # (task_name, task_source) -> row summary or None
+        self._engine_local = threading.local()  # one engine daemon per worker thread
+        self._engine_daemons = []
+        # Output a daemon wrote after its last result line, shown with its next task
+        self._daemon_output = {}
 
         # Find engine script
         if engine_script:
@@ -178,6 +252,11 @@ class BatchRunner:
         Returns:
             Dict with 'files' (list of S3 URIs), 'found' (bool), 'deprecated' (bool or None)
         """
+        # Served from prefetch_db_tasks() when the batch was looked up up front
+        key = (task_name, task_source)
+        if key in self._db_cache:
+            return self._task_files_result(task_name, self._db_cache[key])
+
         result = {"files": [], "found": False, "deprecated": None, "error": None}
 
         if not self.db_session:
@@ -189,36 +268,16 @@ class BatchRunner:
             try:
                 from models import Task
 
+                stmt = self._get_statements(Task)["task_files"]
                 task = (
-                    self.db_session.query(Task)
-                    .filter(
-                        Task.task_name == task_name,
-                        Task.task_source == task_source,
-                        Task.deprecated == False,  # noqa: E712
+                    self.db_session.execute(
+                        stmt, {"task_name": task_name, "task_source": task_source}
                     )
+                    .scalars()
                     .first()
                 )
 
-                if task:
-                    result["found"] = True
-                    result["deprecated"] = task.deprecated
-                    result["files"] = task.task_starting_files or []
-                else:
-                    # Check if task exists but is deprecated
-                    deprecated_task = (
-                        self.db_session.query(Task)
-                        .filter(
-                            Task.task_name == task_name,
-                            Task.task_source == task_source,
-                        )
-                        .first()
-                    )
-                    if deprecated_task:
-                        result["found"] = True
-                        result["deprecated"] = deprecated_task.deprecated
-                        result["error"] = f"Task '{task_name}' is deprecated"
-
-                return result
+                return self._task_files_result(task_name, self._summarize_task_row(task))
             except Exception as e:
                 error_str = str(e)
                 # Check for connection-related errors
@@ -236,6 +295,140 @@ class BatchRunner:
 
         return result
 
+    @classmethod
+    def _get_statements(cls, Task) -> dict:
+        """
+        Build the hot-path SELECT statements once, with bound parameters.
+
+        Reusing the same statement objects skips rebuilding the expression on
+        every call and lets SQLAlchemy serve the compiled SQL from its cache.
+        """
+        if cls._statements is None:
+            from sqlalchemy import Text, bindparam, cast, false, select
+
+            starting_files = cast(Task.task_starting_files, Text)
+            cls._statements = {
+                # Non-deprecated rows sort first, so a single query tells us
+                # both whether the task exists and whether it is deprecated
+                "task_files": select(Task)
+                .where(
+                    Task.task_name == bindparam("task_name"),
+                    Task.task_source == bindparam("task_source"),
+                )
+                .order_by(Task.deprecated)
+                .limit(1),
+                # Only the columns we return - skips loading the JSON file lists
+                "tasks_with_files": select(Task.id, Task.task_name, Task.task_source)
+                .where(
+                    Task.task_source == bindparam("task_source"),
+                    Task.deprecated == false(),
+                    # Only tasks with files: a non-empty JSON array. Compared as
+                    # text so JSON null/objects are skipped rather than making
+                    # json_array_length() fail the whole query.
+                    starting_files.like("[%"),
+                    starting_files != "[]",
+                )
+                .order_by(Task.task_name),
+            }
+        return cls._statements
+
+    @staticmethod
+    def _summarize_task_row(task) -> dict:
+        """Reduce a Task row to the fields needed for file preparation (None stays None)."""
+        if task is None:
+            return None
+        return {"deprecated": task.deprecated, "files": task.task_starting_files or []}
+
+    @staticmethod
+    def _task_files_result(task_name: str, summary: dict) -> dict:
+        """Build the get_task_files_from_db() result from a row summary."""
+        result = {"files": [], "found": False, "deprecated": None, "error": None}
+        if summary is not None:
+            result["found"] = True
+            result["deprecated"] = summary["deprecated"]
+            if summary["deprecated"]:
+                result["error"] = f"Task '{task_name}' is deprecated"
+            else:
+                result["files"] = summary["files"]
+        return result
+
+    def prefetch_db_tasks(self, tasks: list):
+        """
+        Look up the database rows for all tasks in a single query.
+
+        The results are cached so get_task_files_from_db() does not need a
+        round-trip per task. On failure the cache is left untouched and lookups
+        fall back to per-task queries.
+
+        Args:
+            tasks: List of task configurations
+        """
+        if not self.db_session:
+            return
+
+        pairs = {
+            (task.get("task_name"), task.get("task_source", "wsp"))
+            for task in tasks
+            if not task.get("files_to_upload")
+        }
+        if not pairs:
+            return
+
+        # Try up to 2 times (initial + 1 retry after reconnect)
+        for attempt in range(2):
+            try:
+                from models import Task
+                from sqlalchemy import tuple_
+
+                rows = (
+                    self.db_session.query(Task)
+                    .filter(tuple_(Task.task_name, Task.task_source).in_(list(pairs)))
+                    .all()
+                )
+                break
+            except Exception as e:
+                error_str = str(e)
+                if attempt == 0 and (
+                    "SSL" in error_str
+                    or "connection" in error_str.lower()
+                    or "reconnect" in error_str.lower()
+                ):
+                    logger.warning("Database connection error, attempting reconnect...")
+                    if self._reconnect_database():
+                        continue
+                logger.warning(f"Failed to prefetch tasks from database: {e}")
+                return
+
+        cache = dict.fromkeys(pairs)
+        for row in rows:
+            key = (row.task_name, row.task_source)
+            cached = cache.get(key)
+            # Prefer the non-deprecated row when a task has several
+            if cached is None or (cached["deprecated"] and not row.deprecated):
+                cache[key] = self._summarize_task_row(row)
+        self._db_cache.update(cache)
+        logger.info(f"Prefetched {len(rows)} task row(s) from database")
+
+    @property
+    def s3_client(self):
+        """Shared boto3 S3 client (created on first use), or None if boto3 is missing."""
+        if self._s3_client is None:
+            with self._s3_client_lock:
+                if self._s3_client is None:
+                    try:
+                        import boto3
+                        from botocore.config import Config
+                    except ImportError:
+                        return None
+                    self._s3_client = boto3.client(
+                        "s3",
+                        config=Config(
+                            max_pool_connections=32,
+                            retries={"max_attempts": 5, "mode": "adaptive"},
+                        ),
+                    )
+        return self._s3_client
+
     def download_s3_file(self, s3_uri: str, download_dir: Path = None) -> Path:
         """
         Download a file from S3.
@@ -256,7 +449,18 @@ class BatchRunner:
         filename = s3_uri.split("/")[-1]
         local_path = download_dir / filename
 
-        # Download using AWS CLI
+        client = self.s3_client
+        if client is not None:
+            parsed = urlparse(s3_uri)
+            try:
+                client.download_file(parsed.netloc, parsed.path.lstrip("/"), str(local_path))
+                logger.info(f"Downloaded: {s3_uri} -> {local_path}")
+                return local_path
+            except Exception as e:
+                logger.error(f"S3 download error: {e}")
+                return None
+
+        # Fall back to the AWS CLI when boto3 is not installed
         try:
             result = subprocess.run(
                 ["aws", "s3", "cp", s3_uri, str(local_path)],
@@ -309,13 +513,67 @@ class BatchRunner:
 
             s3_files = db_result.get("files", [])
 
-            for s3_uri in s3_files:
-                local_path = self.download_s3_file(s3_uri)
-                if local_path:
-                    result["files"].append(str(local_path))
+            if s3_files:
+                # Per-task directory so prefetching the next task's files never
+                # overwrites a same-named file the current task is uploading
+                safe_task_name = task_name.replace("/", "_").replace("\\", "_").replace(" ", "_")
+                download_dir = self.TASK_DOWNLOAD_DIR / safe_task_name
+                download_dir.mkdir(parents=True, exist_ok=True)
+
+                # Downloads are I/O bound - fetch them concurrently
+                max_workers = min(self.MAX_DOWNLOAD_WORKERS, len(s3_files))
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+                    local_paths = list(
+                        ex.map(lambda uri: self.download_s3_file(uri, download_dir), s3_files)
+                    )
+                result["files"].extend(str(p) for p in local_paths if p)
 
         return result
 
+    def _prefetch_files(self, tasks: list, start_index: int):
+        """
+        Start preparing task files in the background.
+
+        All preparation runs on a single worker thread, so the database session
+        is never used concurrently; S3 downloads within a task are still parallel.
+
+        Args:
+            tasks: Tasks to prefetch
+            start_index: Task index of the first entry in tasks
+        """
+        if not self.fetch_from_db:
+            return
+
+        with self._prefetch_lock:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="prefetch"
+                )
+
+            for task_index, task in enumerate(tasks, start=start_index):
+                # A slower worker's lookahead may reach an index another worker
+                # already took; resubmitting it would download its files again
+                if task_index not in self._prefetch_claimed:
+                    self._prefetch_claimed.add(task_index)
+                    self._prefetched[task_index] = self._prefetch_executor.submit(
+                        self.prepare_task_files, task
+                    )
+
+    def _take_prefetched(self, task_index: int):
+        """Claim a task's prefetch future (None if it was never submitted)."""
+        with self._prefetch_lock:
+            self._prefetch_claimed.add(task_index)
+            return self._prefetched.pop(task_index, None)
+
+    def _shutdown_prefetch(self):
+        """Cancel pending prefetches and stop the background worker."""
+        with self._prefetch_lock:
+            if self._prefetch_executor is not None:
+                self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+                self._prefetch_executor = None
+            self._prefetched.clear()
+            self._prefetch_claimed.clear()
+
     def _load_template(self) -> dict:
         """Load template configuration."""
         with open(self.template_path, "r") as f:
@@ -355,6 +613,31 @@ class BatchRunner:
 
         return config
 
+    def _dump_config(self, task: dict, config: dict) -> str:
+        """
+        Serialize a merged config to single-line JSON.
+
+        Top-level template values the task does not override are taken from
+        the pre-encoded template, so only task-specific values are encoded.
+
+        Args:
+            task: Task-specific configuration
+            config: Merged configuration from _merge_config()
+
+        Returns:
+            JSON document
+        """
+        encode = self._json_encoder.encode
+        parts = []
+        for key, value in config.items():
+            fragment = None
+            if key not in task and key != "agent_type":
+                fragment = self._template_json.get(key)
+            if fragment is None:
+                fragment = encode(value)
+            parts.append(f"{encode(str(key))}: {fragment}")
+        return "{" + ", ".join(parts) + "}"
+
     def load_tasks(self, tasks_path: Path) -> list:
         """
         Load tasks from YAML file.
@@ -410,27 +693,15 @@ class BatchRunner:
                 from models import Task
 
                 try:
-                    import sqlalchemy
-                    from sqlalchemy import func
-
-                    tasks = (
-                        self.db_session.query(Task)
-                        .filter(
-                            Task.task_source == task_source,
-                            Task.deprecated == False,  # noqa: E712
-                            func.cast(Task.task_starting_files, sqlalchemy.Text)
-                            != "[]",  # Only tasks with files
-                        )
-                        .order_by(Task.task_name)
-                        .all()
-                    )
+                    stmt = self._get_statements(Task)["tasks_with_files"]
+                    tasks = self.db_session.execute(stmt, {"task_source": task_source}).all()
                 except ImportError:
                     logger.warning(
                         "sqlalchemy not available for advanced filtering, "
                         "using basic query"
                     )
                     tasks = (
-                        self.db_session.query(Task)
+                        self.db_session.query(Task.id, Task.task_name, Task.task_source)
                         .filter(
                             Task.task_source == task_source,
                             Task.deprecated == False,  # noqa: E712
@@ -490,8 +761,6 @@ class BatchRunner:
         Returns:
             True if task succeeded
         """
-        global _current_process
-
         task_name = task.get("task_name", f"task_{task_index}")
         logger.info(f"\n{'='*60}")
         logger.info(f"TASK {task_index}: {task_name}")
@@ -499,7 +768,11 @@ class BatchRunner:
 
         # Prepare task files (download from S3 if needed)
         if self.fetch_from_db:
-            prep_result = self.prepare_task_files(task)
+            prefetched = self._take_prefetched(task_index)
+            if prefetched is not None:
+                prep_result = prefetched.result()
+            else:
+                prep_result = self.prepare_task_files(task)
             if prep_result.get("skip"):
                 logger.warning(
                     f"Skipping task {task_name}: {prep_result['skip_reason']}"
@@ -513,59 +786,68 @@ class BatchRunner:
         # Merge with template
         config = self._merge_config(task)
 
-        # Create temp config file
+        if dry_run:
+            cmd = self._engine_command("<dry-run-config>")
+            logger.info(f"[DRY RUN] Would execute: {' '.join(cmd)}")
+            logger.info(
+                f"Config:\n{yaml.dump(config, Dumper=_YamlDumper, default_flow_style=False)}"
+            )
+            return True
+
+        if self.persistent_engine:
+            return self._run_in_engine_daemon(task, config, task_name, timeout)
+
+        # Create temp config file (JSON is much cheaper than YAML to write and parse)
         with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".yaml", prefix=f"claude_web_{task_name}_", delete=False
+            mode="w",
+            suffix=".json",
+            prefix=f"claude_web_{task_name}_",
+            dir=self.TEMP_CONFIG_DIR,
+            delete=False,
         ) as f:
-            yaml.dump(config, f, default_flow_style=False)
+            f.write(self._dump_config(task, config))
             temp_config_path = f.name
 
         try:
-            # Build command
-            cmd = [
-                *self.python_cmd,
-                str(self.engine_script),
-                "--config",
-                temp_config_path,
-                "--no-hold",
-            ]
-
-            if dry_run:
-                logger.info(f"[DRY RUN] Would execute: {' '.join(cmd)}")
-                logger.info(f"Config:\n{yaml.dump(config, default_flow_style=False)}")
-                return True
-
+            cmd = self._engine_command(temp_config_path)
             logger.info(f"Executing: {' '.join(cmd)}")
 
             # Run task
-            _current_process = subprocess.Popen(
+            process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+                bufsize=0,
             )
+            _register_process(process)
 
-            # Stream output
             try:
-                for line in iter(_current_process.stdout.readline, ""):
-                    print(line, end="", flush=True)
-            except Exception:
-                pass
+                # Stream output in raw chunks rather than decoding line by line
+                try:
+                    fd = process.stdout.fileno()
+                    out = sys.stdout.buffer
+                    while True:
+                        chunk = os.read(fd, 65536)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+                        out.flush()
+                except Exception:
+                    pass
 
-            # Wait for completion
-            try:
-                return_code = _current_process.wait(timeout=timeout)
-            except subprocess.TimeoutExpired:
-                logger.error(f"Task {task_name} timed out after {timeout}s")
-                _current_process.terminate()
+                # Wait for completion
                 try:
-                    _current_process.wait(timeout=5)
+                    return_code = process.wait(timeout=timeout)
                 except subprocess.TimeoutExpired:
-                    _current_process.kill()
-                return False
-
-            _current_process = None
+                    logger.error(f"Task {task_name} timed out after {timeout}s")
+                    process.terminate()
+                    try:
+                        process.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+                    return False
+            finally:
+                _unregister_process(process)
 
             if return_code == 0:
                 logger.info(f"Task {task_name} completed successfully")
@@ -585,6 +867,126 @@ class BatchRunner:
                 except Exception:
                     pass
 
+    def _engine_command(self, config_path: str) -> list:
+        """Build the engine command line for a single task."""
+        return [
+            *self.python_cmd,
+            str(self.engine_script),
+            "--config",
+            config_path,
+            "--no-hold",
+        ]
+
+    def _get_engine_daemon(self) -> subprocess.Popen:
+        """Return this thread's engine daemon, starting one if needed."""
+        daemon = getattr(self._engine_local, "daemon", None)
+        if daemon is not None and daemon.poll() is None:
+            return daemon
+
+        cmd = [*self.python_cmd, str(self.engine_script), "--daemon", "--no-hold"]
+        logger.info(f"Starting engine daemon: {' '.join(cmd)}")
+        daemon = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+        )
+        self._engine_daemons.append(daemon)
+        _register_process(daemon)
+        self._engine_local.daemon = daemon
+        return daemon
+
+    def _stop_engine_daemon(self, daemon: subprocess.Popen, graceful: bool = True):
+        """Stop an engine daemon (closing stdin lets it exit after the current task)."""
+        try:
+            if graceful:
+                daemon.stdin.close()
+                daemon.wait(timeout=5)
+        except Exception:
+            pass
+        if daemon.poll() is None:
+            daemon.terminate()
+            try:
+                daemon.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                daemon.kill()
+        _unregister_process(daemon)
+        self._daemon_output.pop(daemon, None)
+        if daemon in self._engine_daemons:
+            self._engine_daemons.remove(daemon)
+
+    def close_engine_daemons(self):
+        """Stop all engine daemons started by this runner."""
+        for daemon in list(self._engine_daemons):
+            self._stop_engine_daemon(daemon)
+
+    def _run_in_engine_daemon(
+        self, task: dict, config: dict, task_name: str, timeout: int = None
+    ) -> bool:
+        """
+        Run one task on this thread's engine daemon.
+
+        Engine output is streamed through until the daemon's result line.
+
+        Returns:
+            True if task succeeded
+        """
+        daemon = self._get_engine_daemon()
+        deadline = time.monotonic() + timeout if timeout else None
+
+        try:
+            daemon.stdin.write(self._dump_config(task, config).encode() + b"\n")
+            daemon.stdin.flush()
+        except OSError as e:
+            logger.error(f"Engine daemon is not accepting tasks: {e}")
+            self._stop_engine_daemon(daemon, graceful=False)
+            return False
+
+        fd = daemon.stdout.fileno()
+        out = sys.stdout.buffer
+        keep = len(ENGINE_RESULT_PREFIX) - 1
+        buf = self._daemon_output.pop(daemon, b"")
+
+        while True:
+            idx = buf.find(ENGINE_RESULT_PREFIX)
+            end = buf.find(b"\n", idx) if idx != -1 else -1
+            if end != -1:
+                out.write(buf[:idx])
+                out.flush()
+                result = json.loads(buf[idx + len(ENGINE_RESULT_PREFIX) : end])
+                # Anything after the result line already belongs to the next task
+                self._daemon_output[daemon] = buf[end + 1 :]
+                break
+
+            # Hold back a possible partial marker at the end of the buffer
+            if idx == -1 and len(buf) > keep:
+                out.write(buf[: len(buf) - keep])
+                out.flush()
+                buf = buf[len(buf) - keep :]
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                    logger.error(f"Task {task_name} timed out after {timeout}s")
+                    self._stop_engine_daemon(daemon, graceful=False)
+                    return False
+
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                out.write(buf)
+                out.flush()
+                logger.error(f"Engine daemon exited during task {task_name}")
+                self._stop_engine_daemon(daemon, graceful=False)
+                return False
+            buf += chunk
+
+        if result.get("success"):
+            logger.info(f"Task {task_name} completed successfully")
+            return True
+        logger.error(f"Task {task_name} failed (engine handles retries internally)")
+        return False
+
     def run_all_tasks(
         self,
         tasks: list,
@@ -593,9 +995,10 @@ class BatchRunner:
         end_index: int = None,
         continue_on_failure: bool = True,
         default_timeout: int = None,
+        concurrency: int = 1,
     ) -> dict:
         """
-        Run all tasks sequentially.
+        Run all tasks, sequentially by default.
 
         Args:
             tasks: List of task configurations
@@ -604,6 +1007,8 @@ class BatchRunner:
             end_index: Stop at this task index (exclusive)
             continue_on_failure: Continue running tasks even if one fails
             default_timeout: Default timeout per task in seconds
+            concurrency: Number of tasks to run at once (forced to 1 when a
+                task uses Chrome CDP mode)
 
         Returns:
             Dict with results summary
@@ -616,62 +1021,182 @@ class BatchRunner:
             f"Running {len(tasks_to_run)} tasks (indices {start_index}-{end_index-1})"
         )
 
-        results = {
+        concurrency = max(1, concurrency)
+        if concurrency > 1 and any(self._uses_shared_browser(task) for task in tasks_to_run):
+            logger.warning(
+                "Chrome CDP mode shares one browser context between engines; "
+                "running tasks one at a time (--concurrency ignored)"
+            )
+            concurrency = 1
+
+        if self.fetch_from_db:
+            self.prefetch_db_tasks(tasks_to_run)
+
+        # One (task_name, index, success, duration_seconds) tuple per finished task
+        rows = []
+        try:
+            skipped = self._run_tasks(
+                tasks_to_run,
+                rows,
+                dry_run=dry_run,
+                start_index=start_index,
+                continue_on_failure=continue_on_failure,
+                default_timeout=default_timeout,
+                concurrency=concurrency,
+            )
+        finally:
+            self._shutdown_prefetch()
+            self.close_engine_daemons()
+
+        rows.sort(key=lambda row: row[1])
+        succeeded = sum(1 for row in rows if row[2])
+
+        return {
             "total": len(tasks_to_run),
-            "succeeded": 0,
-            "failed": 0,
-            "skipped": 0,
-            "tasks": [],
+            "succeeded": succeeded,
+            "failed": len(rows) - succeeded,
+            "skipped": skipped,
+            "tasks": [dict(zip(self.RESULT_FIELDS, row)) for row in rows],
         }
 
-        for i, task in enumerate(tasks_to_run):
-            task_index = start_index + i
-            task_name = task.get("task_name", f"task_{task_index}")
+    def _uses_shared_browser(self, task: dict) -> bool:
+        """
+        Check whether a task's engine would attach to the shared CDP Chrome.
 
-            # Get timeout
-            timeout = task.get("timeout", default_timeout)
-            if timeout is None:
-                timeout = task.get("claude_web", {}).get("max_sec_per_task")
+        In CDP mode every engine connects to the same Chrome on the same debug
+        port and gets its first context, where each attempt closes all pages;
+        such tasks cannot run side by side.
+        """
+        return BrowserManager(self._merge_config(task)).is_cdp_mode()
 
-            start_time = datetime.now()
+    def _run_tasks(
+        self,
+        tasks_to_run: list,
+        rows: list,
+        dry_run: bool,
+        start_index: int,
+        continue_on_failure: bool,
+        default_timeout: int,
+        concurrency: int,
+    ) -> int:
+        """
+        Run tasks (sequentially or concurrently), appending result rows.
 
+        Returns:
+            Number of tasks skipped
+        """
+        if concurrency > 1:
+            return self._run_tasks_concurrently(
+                tasks_to_run,
+                rows,
+                dry_run=dry_run,
+                start_index=start_index,
+                continue_on_failure=continue_on_failure,
+                default_timeout=default_timeout,
+                concurrency=concurrency,
+            )
+
+        for i in range(len(tasks_to_run)):
             try:
-                success = self.run_task(
-                    task=task,
-                    task_index=task_index,
-                    dry_run=dry_run,
-                    timeout=timeout,
+                row = self._execute_task(
+                    tasks_to_run, i, start_index, dry_run, default_timeout
                 )
             except KeyboardInterrupt:
                 logger.warning("Interrupted by user")
-                results["skipped"] += len(tasks_to_run) - i - 1
-                break
-            except Exception as e:
-                logger.error(f"Task {task_name} failed with exception: {e}")
-                success = False
-
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-
-            results["tasks"].append(
-                {
-                    "task_name": task_name,
-                    "index": task_index,
-                    "success": success,
-                    "duration_seconds": duration,
-                }
-            )
+                return len(tasks_to_run) - i - 1
 
-            if success:
-                results["succeeded"] += 1
-            else:
-                results["failed"] += 1
-                if not continue_on_failure:
-                    logger.error("Stopping due to failure (--stop-on-failure)")
-                    results["skipped"] += len(tasks_to_run) - i - 1
-                    break
+            rows.append(row)
 
-        return results
+            if not row[2] and not continue_on_failure:
+                logger.error("Stopping due to failure (--stop-on-failure)")
+                return len(tasks_to_run) - i - 1
+
+        return 0
+
+    def _run_tasks_concurrently(
+        self,
+        tasks_to_run: list,
+        rows: list,
+        dry_run: bool,
+        start_index: int,
+        continue_on_failure: bool,
+        default_timeout: int,
+        concurrency: int,
+    ) -> int:
+        """Run up to `concurrency` tasks at once, each in its own engine subprocess."""
+        skipped = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as ex:
+            futures = [
+                ex.submit(
+                    self._execute_task, tasks_to_run, i, start_index, dry_run, default_timeout
+                )
+                for i in range(len(tasks_to_run))
+            ]
+            stopping = False
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    row = future.result()
+                    rows.append(row)
+
+                    if not row[2] and not continue_on_failure and not stopping:
+                        logger.error("Stopping due to failure (--stop-on-failure)")
+                        stopping = True
+                        skipped += sum(f.cancel() for f in futures)
+            except KeyboardInterrupt:
+                logger.warning("Interrupted by user")
+                skipped += sum(f.cancel() for f in futures)
+            except BaseException:
+                # e.g. SystemExit from the signal handler - don't start queued tasks
+                for f in futures:
+                    f.cancel()
+                raise
+
+        return skipped
+
+    def _execute_task(
+        self,
+        tasks_to_run: list,
+        i: int,
+        start_index: int,
+        dry_run: bool,
+        default_timeout: int,
+    ) -> tuple:
+        """Run tasks_to_run[i] and return its (task_name, index, success, duration) row."""
+        task = tasks_to_run[i]
+        task_index = start_index + i
+        task_name = task.get("task_name", f"task_{task_index}")
+
+        if _shutdown_requested.is_set():
+            return (task_name, task_index, False, 0.0)
+
+        # Prepare this task's files and those of the next few tasks in the
+        # background, so S3 latency overlaps with the running engine
+        self._prefetch_files(tasks_to_run[i : i + 1 + self.PREFETCH_LOOKAHEAD], task_index)
+
+        # Get timeout
+        timeout = task.get("timeout", default_timeout)
+        if timeout is None:
+            timeout = task.get("claude_web", {}).get("max_sec_per_task")
+
+        start_ns = time.perf_counter_ns()
+
+        try:
+            success = self.run_task(
+                task=task,
+                task_index=task_index,
+                dry_run=dry_run,
+                timeout=timeout,
+            )
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            logger.error(f"Task {task_name} failed with exception: {e}")
+            success = False
+
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+        return (task_name, task_index, success, duration)
 
 
 def main():
@@ -724,6 +1249,17 @@ def main():
         default=None,
         help="Default timeout per task in seconds",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of tasks to run at once (default: 1; Chrome CDP mode always runs one)",
+    )
+    parser.add_argument(
+        "--persistent-engine",
+        action="store_true",
+        help="Reuse one engine process for all tasks instead of starting one per task",
+    )
     parser.add_argument(
         "--fetch-from-db",
         action="store_true",
@@ -781,6 +1317,7 @@ def main():
         runner = BatchRunner(
             template_path=template_path,
             fetch_from_db=fetch_from_db,
+            persistent_engine=args.persistent_engine,
         )
         runner.provider = args.provider
 
@@ -812,6 +1349,7 @@ def main():
             end_index=args.end,
             continue_on_failure=not args.stop_on_failure,
             default_timeout=args.timeout,
+            concurrency=args.concurrency,
         )
 
         # Print summary
@@ -1,19 +1,261 @@
 """
 Completion logger — tracks task and prompt timing, produces JSON logs.
 
-Writes to disk on every state change for crash safety.
+Every state change is appended as one compact line to a JSONL event log
+next to the session file; the session JSON (including the in-progress task)
+is rewritten only at task boundaries and on save(). Disk I/O happens on a
+background writer thread, which coalesces pending snapshots into one write.
+The thread is stopped by close(), or by a finalizer if a logger is dropped
+or the interpreter exits without it.
 """
 
+import collections
 import json
 import logging
+import os
 import re
+import threading
+import time
+import weakref
 from datetime import datetime
 from pathlib import Path
 
 from autowebprompt.agents.base import TaskStatus
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Hot-path callables bound once, instead of a module attribute lookup per call.
+_now = datetime.now
+_monotonic = time.monotonic
+_time = time.time
+
+
+def _iso_now() -> str:
+    return _now().isoformat()
+
+
+_CLEAN_TABLE = str.maketrans({"/": "-", "\\": "-", " ": "_"})
+_UNSAFE_CHARS = re.compile(r"[^a-zA-Z0-9._-]")
+
+
+class _TaskRecord:
+    """One task attempt; serialized to the same dict shape the log has always had."""
+
+    __slots__ = (
+        "agent_failed",
+        "agent_failed_reason",
+        "attempt_number",
+        "deprecated",
+        "deprecated_reason",
+        "duration_seconds",
+        "end_time",
+        "prompts",
+        "start_time",
+        "task_name",
+        "task_status",
+    )
+
+    # Serialized key order, which the log has always used
+    _FIELDS = (
+        "task_name",
+        "attempt_number",
+        "start_time",
+        "end_time",
+        "task_status",
+        "agent_failed",
+        "agent_failed_reason",
+        "deprecated",
+        "deprecated_reason",
+        "duration_seconds",
+        "prompts",
+    )
+
+    def __init__(self, task_name: str, attempt_number: int, start_time: str, prompts):
+        self.task_name = task_name
+        self.attempt_number = attempt_number
+        self.start_time = start_time
+        self.end_time = None
+        self.task_status = None
+        self.agent_failed = None
+        self.agent_failed_reason = None
+        self.deprecated = False
+        self.deprecated_reason = None
+        self.duration_seconds = None
+        self.prompts = prompts
+
+    def finish(self, end_time, task_status, duration_seconds, agent_failed, agent_failed_reason):
+        self.end_time = end_time
+        self.task_status = task_status
+        self.duration_seconds = duration_seconds
+        self.agent_failed = agent_failed
+        self.agent_failed_reason = agent_failed_reason
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self._FIELDS}
+
+
+class _PromptRecord:
+    """One prompt within a task; response_length is only emitted when set."""
+
+    __slots__ = (
+        "duration_seconds",
+        "end_time",
+        "prompt_text",
+        "response_length",
+        "start_time",
+        "success",
+    )
+
+    def __init__(self, prompt_text: str, start_time: str):
+        self.prompt_text = prompt_text
+        self.start_time = start_time
+        self.end_time = None
+        self.success = None
+        self.duration_seconds = None
+        self.response_length = 0
+
+    def to_dict(self) -> dict:
+        data = {
+            "prompt_text": self.prompt_text,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "success": self.success,
+            "duration_seconds": self.duration_seconds,
+        }
+        if self.response_length:
+            data["response_length"] = self.response_length
+        return data
+
+
+def _json_default(obj):
+    if isinstance(obj, (_TaskRecord, _PromptRecord)):
+        return obj.to_dict()
+    if isinstance(obj, collections.deque):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Both encoders return UTF-8 bytes; orjson is used when installed, the stdlib
+# fallback produces the same documents.
+if orjson is not None:
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_json_default)
+
+    def _dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2)
+
+else:
+    _json_dumps = json.dumps
+
+    def _dumps(obj) -> bytes:
+        return _json_dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), default=_json_default
+        ).encode("utf-8")
+
+    def _dumps_pretty(obj) -> bytes:
+        return _json_dumps(obj, ensure_ascii=False, indent=2, default=_json_default).encode(
+            "utf-8"
+        )
+
+
+class _Writer:
+    """
+    Background writer for one logger's event log and session snapshots.
+
+    Holds no reference to its CompletionLogger, so a logger that is never
+    closed can still be garbage collected; its finalizer then closes this
+    writer, which drains whatever is queued before the thread exits.
+    """
+
+    def __init__(self, session_file: Path, events_file: Path):
+        self.session_file = session_file
+        self.tmp_file = session_file.with_suffix(".json.tmp")
+        self.events = None
+        try:
+            self.events = open(events_file, "ab", buffering=1 << 16)
+        except OSError as e:
+            logger.error(f"Failed to open completion event log: {e}")
+
+        # Callers encode under cond and hand off; only the latest snapshot is kept.
+        self.cond = threading.Condition()
+        self.pending_events: list[bytes] = []
+        self.pending_payload: bytes | None = None
+        self.queued = 0
+        self.written = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._loop, name="completion-logger", daemon=True)
+        self.thread.start()
+
+    def append_event(self, line: bytes):
+        with self.cond:
+            self.pending_events.append(line)
+            self.queued += 1
+            self.cond.notify_all()
+
+    def submit_snapshot(self, payload: bytes):
+        with self.cond:
+            self.pending_payload = payload
+            self.queued += 1
+            self.cond.notify_all()
+
+    def _loop(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.queued > self.written or self.closed)
+                if self.queued == self.written and self.closed:
+                    return
+                events, self.pending_events = self.pending_events, []
+                payload, self.pending_payload = self.pending_payload, None
+                target = self.queued
+            self._flush_to_disk(events, payload)
+            with self.cond:
+                self.written = target
+                self.cond.notify_all()
+
+    def _flush_to_disk(self, events: list[bytes], payload: bytes | None):
+        if events and self.events is not None:
+            try:
+                self.events.writelines(events)
+            except Exception as e:
+                logger.error(f"Failed to append completion event: {e}")
+        if payload is None:
+            return
+        try:
+            if self.events is not None:
+                self.events.flush()
+            # Write beside the live file and swap it in, so a crash mid-write
+            # leaves the previous snapshot intact rather than a truncated one.
+            with open(self.tmp_file, "wb") as f:
+                f.write(payload)
+            os.replace(self.tmp_file, self.session_file)
+        except Exception as e:
+            logger.error(f"Failed to write completion log: {e}")
+
+    def flush(self, timeout: float | None = None) -> bool:
+        with self.cond:
+            target = self.queued
+            return self.cond.wait_for(lambda: self.written >= target, timeout)
+
+    def close(self):
+        with self.cond:
+            if self.closed:
+                return
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join()
+        if self.events is not None:
+            try:
+                self.events.close()
+            except OSError as e:
+                logger.error(f"Failed to close completion event log: {e}")
+            self.events = None
+
 
 class CompletionLogger:
     """
@@ -25,6 +267,11 @@ class CompletionLogger:
         cl.start_prompt("prompt text...")
         cl.end_prompt(success=True, response_length=1234)
         cl.end_task(TaskStatus.SUCCESS)
+        cl.close()  # flushes pending writes and stops the writer thread
+
+    close() is required: writes happen on a background thread. A logger that
+    is dropped or still open at interpreter exit is finalized instead, which
+    writes what is queued but not a snapshot held back by defer_snapshots.
     """
 
     def __init__(
@@ -34,8 +281,13 @@ class CompletionLogger:
         agent_name: str = "web_agent",
         prompt_version: int = 1,
         task_source: str = "",
+        flush_interval: float = 0,
+        max_retained_tasks: int | None = None,
+        max_retained_prompts: int | None = None,
+        include_iso_timestamps: bool = True,
+        defer_snapshots: bool = False,
     ):
-        self.log_dir = Path(log_dir)
+        self.log_dir = log_dir if isinstance(log_dir, Path) else Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
         self.task_identifier = task_identifier
@@ -49,104 +301,169 @@ class CompletionLogger:
             "agent_name": agent_name,
             "prompt_version": prompt_version,
             "task_source": task_source,
-            "tasks": [],
+            "tasks": collections.deque(maxlen=max_retained_tasks),
         }
+        # Long-running sessions can cap what the snapshot retains. Evicted tasks
+        # and prompts are not lost: every end_task/end_prompt event already
+        # carries the full record in the JSONL event log.
+        self.max_retained_prompts = max_retained_prompts
+
+        # Snapshots are assembled from the encoded header, the already-encoded
+        # completed tasks and the in-progress task, so a finished task is
+        # serialized exactly once.
+        header = {k: v for k, v in self.session_data.items() if k != "tasks"}
+        self._session_header = _dumps(header)[:-1] + b',"tasks":['
+        self._completed_tasks_json: collections.deque[bytes] = collections.deque(
+            maxlen=max_retained_tasks
+        )
 
         self.current_task = None
         self.current_prompt = None
+        # Monotonic start stamps for duration math; ISO strings are display-only.
+        self._task_started = 0.0
+        self._prompt_started = 0.0
+        # Prompt boundaries only reach the session JSON if flush_interval (seconds)
+        # has elapsed since the last snapshot; 0 leaves it to task boundaries.
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+        # With defer_snapshots, task boundaries also wait for flush_interval and
+        # the final snapshot is written once by close(); the JSONL event log
+        # still records every boundary as it happens.
+        self.defer_snapshots = defer_snapshots
+        self._snapshot_due = False
+        # Task/prompt start and end times are ISO strings by default; consumers
+        # that only need durations can take raw epoch floats, which skip the
+        # datetime formatting on every boundary.
+        self._stamp = _iso_now if include_iso_timestamps else _time
 
         timestamp = self.session_start.strftime("%Y%m%d_%H%M%S")
         clean_id = self._clean_name(task_identifier or "unknown")
         filename = f"completion_{agent_name}_{timestamp}_{clean_id}.json"
         self.session_file = self.log_dir / filename
+        self.events_file = self.session_file.with_suffix(".jsonl")
+        self._writer = _Writer(self.session_file, self.events_file)
+        self._finalizer = weakref.finalize(self, self._writer.close)
 
         self._write_to_disk()
 
     @staticmethod
     def _clean_name(name: str) -> str:
-        name = name.replace("/", "-").replace("\\", "-").replace(" ", "_")
-        name = re.sub(r"[^a-zA-Z0-9._-]", "", name)
-        return name
+        return _UNSAFE_CHARS.sub("", name.translate(_CLEAN_TABLE))
 
-    def _write_to_disk(self):
-        try:
-            with open(self.session_file, "w") as f:
-                json.dump(self.session_data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to write completion log: {e}")
+    def _append_event(self, event_type: str, record):
+        self._writer.append_event(_dumps({"type": event_type, "data": record}) + b"\n")
 
-    def start_task(self, task_name: str, attempt_number: int = 1):
-        self.current_task = {
-            "task_name": task_name,
-            "attempt_number": attempt_number,
-            "start_time": datetime.now().isoformat(),
-            "end_time": None,
-            "task_status": None,
-            "agent_failed": None,
-            "agent_failed_reason": None,
-            "deprecated": False,
-            "deprecated_reason": None,
-            "duration_seconds": None,
-            "prompts": [],
-        }
+    def _write_to_disk(self, pretty: bool = False):
+        # Encode in memory and write once; json.dump() issues one write per token.
+        # Indentation is only paid for on save(), where a human may read the file.
+        if pretty:
+            data = self.session_data
+            if self.current_task:
+                data = {**data, "tasks": [*data["tasks"], self.current_task]}
+            payload = _dumps_pretty(data)
+        else:
+            tasks = list(self._completed_tasks_json)
+            if self.current_task:
+                tasks.append(_dumps(self.current_task))
+            payload = b"".join((self._session_header, b",".join(tasks), b"]}"))
+        self._writer.submit_snapshot(payload)
+        self._last_flush = _monotonic()
+        self._snapshot_due = False
+
+    def _task_boundary_snapshot(self):
+        if self.defer_snapshots and not (
+            self.flush_interval and _monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self._snapshot_due = True
+            return
         self._write_to_disk()
 
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until everything queued so far is on disk. Returns False on timeout."""
+        return self._writer.flush(timeout)
+
+    def close(self):
+        """Flush pending writes, stop the writer thread and close the event log."""
+        if not self._finalizer.alive:
+            return
+        if self._snapshot_due:
+            self._write_to_disk()
+        self._finalizer()
+
+    def start_task(self, task_name: str, attempt_number: int = 1):
+        self._task_started = _monotonic()
+        self.current_task = _TaskRecord(
+            task_name,
+            attempt_number,
+            self._stamp(),
+            collections.deque(maxlen=self.max_retained_prompts),
+        )
+        self._append_event("start_task", self.current_task)
+        self._task_boundary_snapshot()
+
     def end_task(self, task_status: TaskStatus):
         if not self.current_task:
             logger.warning("end_task called with no active task")
             return
 
-        now = datetime.now()
-        start = datetime.fromisoformat(self.current_task["start_time"])
-        duration = (now - start).total_seconds()
+        duration = _monotonic() - self._task_started
+        end_time = self._stamp()
 
-        self.current_task["end_time"] = now.isoformat()
-        self.current_task["task_status"] = task_status.value
-        self.current_task["duration_seconds"] = round(duration, 2)
-
-        if task_status == TaskStatus.SUCCESS:
-            self.current_task["agent_failed"] = False
-            self.current_task["agent_failed_reason"] = None
-        else:
-            self.current_task["agent_failed"] = True
-            self.current_task["agent_failed_reason"] = task_status.value
+        status = task_status.value
+        failed = task_status != TaskStatus.SUCCESS
+        self.current_task.finish(
+            end_time, status, round(duration, 2), failed, status if failed else None
+        )
 
         self.session_data["tasks"].append(self.current_task)
+        self._completed_tasks_json.append(_dumps(self.current_task))
+        self._append_event("end_task", self.current_task)
         self.current_task = None
-        self._write_to_disk()
+        self._task_boundary_snapshot()
 
-    def start_prompt(self, prompt_text: str):
-        self.current_prompt = {
-            "prompt_text": prompt_text[:500],
-            "start_time": datetime.now().isoformat(),
-            "end_time": None,
-            "success": None,
-            "duration_seconds": None,
-        }
-        self._write_to_disk()
+    def start_prompt(self, prompt_text: str | bytes):
+        if isinstance(prompt_text, (bytes, bytearray, memoryview)):
+            return self.start_prompt_bytes(prompt_text)
+        self._prompt_started = _monotonic()
+        self.current_prompt = _PromptRecord(prompt_text[:500], self._stamp())
+        self._append_event("start_prompt", self.current_prompt)
+
+    def start_prompt_bytes(self, prompt_bytes: bytes | bytearray | memoryview):
+        """
+        Start a prompt from raw UTF-8 bytes without decoding the whole payload.
+
+        Only the first 2000 bytes are decoded, which always covers the 500
+        characters that are kept.
+        """
+        text = bytes(prompt_bytes[:2000]).decode("utf-8", "replace")
+        self.start_prompt(text)
 
     def end_prompt(self, success: bool, response_length: int = 0):
         if not self.current_prompt:
             logger.warning("end_prompt called with no active prompt")
             return
 
-        now = datetime.now()
-        start = datetime.fromisoformat(self.current_prompt["start_time"])
-        duration = (now - start).total_seconds()
+        duration = _monotonic() - self._prompt_started
+        end_time = self._stamp()
 
-        self.current_prompt["end_time"] = now.isoformat()
-        self.current_prompt["success"] = success
-        self.current_prompt["duration_seconds"] = round(duration, 2)
-        if response_length:
-            self.current_prompt["response_length"] = response_length
+        prompt = self.current_prompt
+        prompt.end_time = end_time
+        prompt.success = success
+        prompt.duration_seconds = round(duration, 2)
+        prompt.response_length = response_length
 
         if self.current_task:
-            self.current_task["prompts"].append(self.current_prompt)
+            self.current_task.prompts.append(prompt)
 
+        self._append_event("end_prompt", self.current_prompt)
         self.current_prompt = None
-        self._write_to_disk()
+
+        if self.flush_interval and _monotonic() - self._last_flush >= self.flush_interval:
+            self._write_to_disk()
 
     def save(self, output_dir: Path | str | None = None) -> Path:
+        self._write_to_disk(pretty=True)
+        self.flush()
         if output_dir is None:
             return self.session_file
 
@@ -155,8 +472,30 @@ class CompletionLogger:
 
         dest = output_dir / self.session_file.name
         if dest != self.session_file:
-            import shutil
-            shutil.copy2(self.session_file, dest)
+            self._copy_session_file(dest)
             logger.info(f"Copied completion log to: {dest}")
 
         return dest
+
+    def _copy_session_file(self, dest: Path):
+        # Snapshots are swapped in with os.replace, so a hard link keeps pointing
+        # at this snapshot even as the session file moves on.
+        try:
+            os.link(self.session_file, dest)
+            return
+        except OSError:
+            pass
+        try:
+            with open(self.session_file, "rb") as src, open(dest, "wb") as dst:
+                size = os.fstat(src.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            return
+        except (OSError, AttributeError):
+            pass
+        import shutil
+        shutil.copy2(self.session_file, dest)
@@ -22,6 +22,9 @@ Usage:
 
     # Non-interactive mode
     python -m autowebprompt.engine.runner --config config.yaml --no-hold
+
+    # Persistent worker: one JSON config per stdin line
+    python -m autowebprompt.engine.runner --daemon --no-hold
 """
 
 import argparse
@@ -29,32 +32,61 @@ import asyncio
 import json
 import logging
 import os
+import random
 import re
 import shutil
 import signal
 import sys
 import time
+import traceback
 from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
-from playwright.async_api import async_playwright
 
 from autowebprompt.agents.claude import ClaudeWebAgent
 from autowebprompt.agents.chatgpt import ChatGPTWebAgent
 from autowebprompt.agents.base import WebAgent, AgentState
-from autowebprompt.browser.manager import BrowserManager
+from autowebprompt.browser.pool import BrowserPool
+from autowebprompt.config.loader import load_config as _load_yaml_config
 from autowebprompt.engine.completion_logger import CompletionLogger
 from autowebprompt.validators.excel import validate_excel_file
 from autowebprompt.storage.uploader import ResultUploader
 from autowebprompt.agents.base import PipelineError, TaskStatus
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize logger
 logger = logging.getLogger(__name__)
 
 # Global shutdown event
 shutdown_event = asyncio.Event()
 
+# Prefix of the line a --daemon engine prints after each task
+DAEMON_RESULT_PREFIX = "__AUTOWEBPROMPT_RESULT__ "
+
+# Retry delays double (plus up to 10% jitter) up to this cap; a rate-limited
+# pipeline jumps straight to at least RATE_LIMIT_RETRY_DELAY.
+MAX_RETRY_DELAY = 300
+RATE_LIMIT_RETRY_DELAY = 60
+
+# Solution file names: "/" -> "-", " " -> "_", then drop anything else unsafe
+_SAFE_TASK_TRANSLATE = str.maketrans({"/": "-", " ": "_"})
+_SAFE_TASK_RE = re.compile(r"[^a-zA-Z0-9._-]")
+
+# Downloads with these suffixes are validated and renamed as solution workbooks
+_EXCEL_SUFFIXES = (".xlsx", ".xls")
+
+
+# Signals that request a graceful shutdown (SIGTERM cannot be handled on Windows)
+_SHUTDOWN_SIGNALS = (
+    (signal.SIGINT,) if sys.platform == "win32" else (signal.SIGINT, signal.SIGTERM)
+)
+_signal_handlers_installed = False
+
 
 def _handle_signal(signum, frame):
     """Handle shutdown signals gracefully."""
@@ -65,6 +97,16 @@ def _handle_signal(signum, frame):
     signal.signal(signal.SIGINT, signal.SIG_DFL)
 
 
+def _install_signal_handlers():
+    """Install the process-level shutdown handlers (once)."""
+    global _signal_handlers_installed
+    if _signal_handlers_installed:
+        return
+    for sig in _SHUTDOWN_SIGNALS:
+        signal.signal(sig, _handle_signal)
+    _signal_handlers_installed = True
+
+
 # ---------------------------------------------------------------------------
 # Helper utilities
 # ---------------------------------------------------------------------------
@@ -91,10 +133,11 @@ def create_run_directory(
     return run_dir
 
 
-def rename_solution_file(
+async def rename_solution_file(
     file_path: str | Path,
     task_name: str,
     agent_name: str = "claude_web",
+    timestamp: str | None = None,
 ) -> Path:
     """
     Rename a downloaded solution file to match upload_tabai_folder.py regex.
@@ -102,59 +145,182 @@ def rename_solution_file(
     Target pattern (Pattern 2):
         {YYYYMMDD}_{HHMMSS}_{task_name}_Solution_{agent}_Model.xlsx
 
+    Pass timestamp (from _file_timestamp()) to share one stamp across all files
+    of an attempt; it defaults to the current time.
+
+    The collision checks and the move run in a worker thread so a slow disk
+    does not stall the event loop driving the browser.
+
     Returns the new file path.
     """
     file_path = Path(file_path)
-    safe_task = task_name.replace("/", "-").replace(" ", "_")
-    safe_task = re.sub(r"[^a-zA-Z0-9._-]", "", safe_task)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    new_name = f"{timestamp}_{safe_task}_Solution_{agent_name}_Model{file_path.suffix}"
-    new_path = file_path.parent / new_name
+    safe_task = _SAFE_TASK_RE.sub("", task_name.translate(_SAFE_TASK_TRANSLATE))
+    if timestamp is None:
+        timestamp = _file_timestamp()
+    stem = f"{timestamp}_{safe_task}_Solution_{agent_name}_Model"
+
+    new_path = await asyncio.to_thread(_move_to_free_name, file_path, stem)
+    logger.info(f"Renamed solution: {file_path.name} -> {new_path.name}")
+    return new_path
+
+
+def _file_timestamp() -> str:
+    """Local time as YYYYMMDD_HHMMSS, built from the time fields (no format parsing)."""
+    t = time.localtime()
+    return f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+
+
+async def _attempt_timeout_guard(
+    deadline_s: float, timed_out: asyncio.Event, shutdown: asyncio.Event
+):
+    """Flag the attempt as timed out and request shutdown once deadline_s elapses."""
+    if deadline_s > 0:
+        await asyncio.sleep(deadline_s)
+        timed_out.set()
+        shutdown.set()
+
+
+def _log_upload_result(upload_task: asyncio.Task):
+    """Done-callback for the background ResultUploader.upload_results() call."""
+    if upload_task.cancelled():
+        logger.warning("Upload cancelled")
+        return
+    if upload_task.exception() is not None:
+        logger.error(f"Upload failed: {upload_task.exception()}")
+        return
+
+    upload_result = upload_task.result()
+    if upload_result["success"]:
+        logger.info("Upload successful!")
+        logger.info(f"  Artifact S3 URIs: {upload_result['artifact_s3_uris']}")
+        logger.info(f"  Conversation S3 URI: {upload_result['conversation_s3_uri']}")
+        logger.info(f"  TaskAttempt ID: {upload_result['attempt_id']}")
+    else:
+        logger.warning(f"Upload completed with errors: {upload_result['errors']}")
+
+
+def _move_to_free_name(file_path: Path, stem: str) -> Path:
+    new_path = file_path.parent / f"{stem}{file_path.suffix}"
 
     # Handle collision
     counter = 1
     while new_path.exists():
-        stem = f"{timestamp}_{safe_task}_Solution_{agent_name}_Model_{counter}"
-        new_path = file_path.parent / f"{stem}{file_path.suffix}"
+        new_path = file_path.parent / f"{stem}_{counter}{file_path.suffix}"
         counter += 1
 
     shutil.move(str(file_path), str(new_path))
-    logger.info(f"Renamed solution: {file_path.name} -> {new_path.name}")
     return new_path
 
 
-def mark_json_deprecated(
+async def mark_json_deprecated(
     json_path: str | Path, reason: str = "Superseded by later attempt"
 ):
-    """Mark a completion JSON as deprecated by updating it on disk."""
+    """Mark a completion JSON as deprecated by updating it on disk (in a worker thread)."""
     json_path = Path(json_path)
-    if not json_path.exists():
-        return
     try:
-        with open(json_path) as f:
-            data = json.load(f)
-        for task in data.get("tasks", []):
-            task["deprecated"] = True
-            task["deprecated_reason"] = reason
-        with open(json_path, "w") as f:
-            json.dump(data, f, indent=2)
-        logger.info(f"Marked as deprecated: {json_path.name}")
+        if await asyncio.to_thread(_rewrite_deprecated, json_path, reason):
+            logger.info(f"Marked as deprecated: {json_path.name}")
     except Exception as e:
         logger.warning(f"Failed to mark JSON deprecated: {e}")
 
 
-async def _cleanup_browser(browser_mgr, context, browser, page):
-    """Best-effort browser cleanup."""
+def _rewrite_deprecated(json_path: Path, reason: str) -> bool:
+    if not json_path.exists():
+        return False
+    data = _loads_json(json_path.read_bytes())
+    for task in data.get("tasks", []):
+        task["deprecated"] = True
+        task["deprecated_reason"] = reason
+    json_path.write_bytes(_dumps_json_pretty(data))
+    return True
+
+
+def _loads_json(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_json_line(data) -> bytes:
+    """Compact JSON plus a trailing newline, for NDJSON files."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _dumps_json_pretty(data) -> bytes:
+    """Indented JSON as bytes, via orjson when installed (it also handles datetimes)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+async def _sleep_before_retry(delay: float) -> float:
+    """
+    Sleep for delay seconds plus up to 10% jitter, capped at MAX_RETRY_DELAY,
+    and return the next, exponentially backed-off delay.
+    """
+    await asyncio.sleep(min(MAX_RETRY_DELAY, delay + random.uniform(0, delay * 0.1)))
+    return min(MAX_RETRY_DELAY, delay * 2)
+
+
+async def _wait_for_login(agent, page, login_timeout: int = 300, check_every: int = 30):
+    """
+    Wait for the user to log in, re-checking auth state as the page navigates.
+
+    Instead of polling every few seconds, the state is re-checked whenever the
+    main frame navigates (login flows end in a redirect) and, as a fallback,
+    every check_every seconds -- which is also when a page stranded on an
+    external auth site is sent back to the provider.
+
+    Returns the last observed AgentState.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + login_timeout
+    navigated = asyncio.Event()
+
+    def _on_navigated(frame):
+        if frame == page.main_frame:
+            navigated.set()
+
+    page.on("framenavigated", _on_navigated)
+    state = AgentState.AUTH_REQUIRED
+    try:
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                await asyncio.wait_for(navigated.wait(), timeout=min(check_every, remaining))
+            except asyncio.TimeoutError:
+                elapsed = int(login_timeout - (deadline - loop.time()))
+                logger.info(f"Still waiting for login... ({elapsed}s / {login_timeout}s)")
+                # After auth redirect, try lightweight navigation back
+                current_url = page.url
+                if "chatgpt.com" not in current_url and "claude.ai" not in current_url:
+                    logger.info(f"Still on auth page ({current_url[:60]}...), retrying navigation...")
+                    try:
+                        await page.goto(agent.project_url if hasattr(agent, 'project_url') else "https://chatgpt.com",
+                                        wait_until="domcontentloaded", timeout=15000)
+                        await page.wait_for_timeout(2000)
+                    except Exception:
+                        pass
+            navigated.clear()
+
+            state = await agent.get_state()
+            if state == AgentState.READY:
+                break
+    finally:
+        page.remove_listener("framenavigated", _on_navigated)
+    return state
+
+
+async def _cleanup_attempt(context, page):
+    """Best-effort cleanup of one attempt's page; the context goes back to the pool."""
     try:
         if page:
             await page.close()
     except Exception:
         pass
-    try:
-        if browser_mgr and context and browser:
-            await browser_mgr.close_browser(context, browser)
-    except Exception:
-        pass
+    if context:
+        await BrowserPool.release(context)
 
 
 # ---------------------------------------------------------------------------
@@ -208,11 +374,17 @@ def setup_logging(config: dict, name: str, task_name: str = None) -> tuple:
 
 
 def load_config(config_path: str) -> dict:
-    """Load configuration from YAML file."""
-    import yaml
+    """
+    Load configuration from a YAML file (or JSON, as written by the batch runner).
+
+    YAML goes through autowebprompt.config.loader.load_config (libyaml when
+    available, cached by mtime and size, fresh copy per call).
+    """
+    if not config_path.endswith(".json"):
+        return _load_yaml_config(config_path)
 
     with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+        config = json.load(f)
 
     # Handle template nesting
     if "template" in config:
@@ -243,6 +415,8 @@ PROVIDER_DEFAULTS = {
     "claude_web": {
         "folder_prefix": "claudeGUI",
         "agent_name": "claude_web",
+        "provider_name": "Claude.ai",
+        "default_log_dir": "claude_web_logs",
         "agent_model_name": "Opus 4.5",
         "agent_model_type": "gui",
         "s3_artifact_prefix": "attempts/claude_web",
@@ -251,6 +425,8 @@ PROVIDER_DEFAULTS = {
     "chatgpt_web": {
         "folder_prefix": "chatgptGUI",
         "agent_name": "chatgpt_web",
+        "provider_name": "ChatGPT",
+        "default_log_dir": "chatgpt_web_logs",
         "agent_model_name": "GPT-5.2",
         "agent_model_type": "gui",
         "s3_artifact_prefix": "attempts/chatgpt_web",
@@ -341,8 +517,10 @@ async def run_automation(config: dict) -> bool:
     agent_attempts = 0
     total_attempts = 0
     agent_json_paths: list[Path] = []
-    task_wall_start = time.time()
+    task_wall_start = time.monotonic()
     task_success = False
+    completion_logger = None
+    retry_delay = sleep_between_retries
 
     while True:
         # Check termination conditions
@@ -352,7 +530,7 @@ async def run_automation(config: dict) -> bool:
         if agent_attempts >= max_agent_attempts:
             logger.error(f"Max agent attempts ({max_agent_attempts}) exhausted")
             break
-        if max_sec_per_task > 0 and (time.time() - task_wall_start) >= max_sec_per_task:
+        if max_sec_per_task > 0 and (time.monotonic() - task_wall_start) >= max_sec_per_task:
             logger.error(f"Wall-clock budget ({max_sec_per_task}s) exhausted")
             break
         if shutdown_event.is_set():
@@ -366,22 +544,21 @@ async def run_automation(config: dict) -> bool:
         )
         logger.info(f"{'=' * 60}")
 
-        browser = None
         context = None
         page = None
-        browser_mgr = None
+        if completion_logger is not None:
+            completion_logger.close()
         completion_logger = None
 
         # =====================================================================
         # PHASE 1: Pipeline (no JSON created, no agent_attempts counted)
         # =====================================================================
         try:
-            browser_mgr = BrowserManager(config)
-            playwright_ctx = async_playwright()
-            playwright = await playwright_ctx.__aenter__()
+            # The browser is pooled for the whole process (launched on first use);
+            # each attempt borrows a fresh context and returns it when done.
+            browser_mgr, context = await BrowserPool.acquire(provider_key, config)
 
             try:
-                browser, context = await browser_mgr.launch_browser(playwright)
                 # Close stale pages from previous attempts, then create a fresh page.
                 # NOTE: Do NOT call set_viewport_size on CDP pages -- it uses
                 # Emulation.setDeviceMetricsOverride which crashes ChatGPT tabs.
@@ -402,7 +579,7 @@ async def run_automation(config: dict) -> bool:
                 )
 
                 # Navigate
-                provider_name = "ChatGPT" if provider_key == "chatgpt_web" else "Claude.ai"
+                provider_name = provider_defaults["provider_name"]
                 if not await agent.navigate_to_new_chat():
                     raise PipelineError(
                         TaskStatus.NAVIGATION_FAILED, f"Failed to navigate to {provider_name}"
@@ -416,29 +593,10 @@ async def run_automation(config: dict) -> bool:
                     logger.info(
                         "Authentication required -- waiting for login (max 5 min)..."
                     )
-                    login_timeout = 300
-                    elapsed = 0
-                    while elapsed < login_timeout:
-                        await asyncio.sleep(10)
-                        elapsed += 10
-                        # After auth redirect, try lightweight navigation back
-                        current_url = page.url
-                        if "chatgpt.com" not in current_url and "claude.ai" not in current_url:
-                            if elapsed % 30 == 0:
-                                logger.info(f"Still on auth page ({current_url[:60]}...), retrying navigation...")
-                            try:
-                                await page.goto(agent.project_url if hasattr(agent, 'project_url') else "https://chatgpt.com",
-                                                wait_until="domcontentloaded", timeout=15000)
-                                await page.wait_for_timeout(2000)
-                            except Exception:
-                                pass
-                        state = await agent.get_state()
-                        if state == AgentState.READY:
-                            logger.info("Login successful!")
-                            await browser_mgr.save_auth_state(context)
-                            break
-                        if elapsed % 30 == 0:
-                            logger.info(f"Still waiting for login... ({elapsed}s / {login_timeout}s)")
+                    state = await _wait_for_login(agent, page, login_timeout=300)
+                    if state == AgentState.READY:
+                        logger.info("Login successful!")
+                        await browser_mgr.save_auth_state(context)
 
                     if state != AgentState.READY:
                         raise PipelineError(TaskStatus.AUTH_FAILED, "Login timeout")
@@ -460,20 +618,22 @@ async def run_automation(config: dict) -> bool:
                         )
 
             except PipelineError:
-                # Close playwright before re-raising
-                await _cleanup_browser(browser_mgr, context, browser, page)
-                await playwright_ctx.__aexit__(None, None, None)
+                await _cleanup_attempt(context, page)
                 raise
 
         except PipelineError as e:
             logger.warning(f"Pipeline failure ({e.status.value}): {e}")
-            logger.info(f"Retrying in {sleep_between_retries}s...")
-            await asyncio.sleep(sleep_between_retries)
+            if e.status == TaskStatus.RATE_LIMITED:
+                retry_delay = max(retry_delay, RATE_LIMIT_RETRY_DELAY)
+            logger.info(f"Retrying in {retry_delay:.0f}s...")
+            retry_delay = await _sleep_before_retry(retry_delay)
             continue
 
         # =====================================================================
         # PHASE 2: Agent (JSON created, attempt counted)
         # =====================================================================
+        # retry_delay keeps growing across failures of either phase; only a
+        # successful attempt ends the loop.
         try:
             # Create completion logger for this attempt
             completion_logger = CompletionLogger(
@@ -482,6 +642,7 @@ async def run_automation(config: dict) -> bool:
                 agent_name=agent_name,
                 prompt_version=prompt_version,
                 task_source=task_source,
+                defer_snapshots=True,
             )
             completion_logger.start_task(task_name, attempt_number=total_attempts)
 
@@ -489,27 +650,22 @@ async def run_automation(config: dict) -> bool:
             agent.completion_logger = completion_logger
 
             # Set up per-attempt timeout
-            attempt_timed_out = False
-
-            async def _attempt_timeout_guard():
-                nonlocal attempt_timed_out
-                effective_timeout = max_sec_per_attempt
-                if max_sec_per_task > 0:
-                    remaining = max_sec_per_task - (time.time() - task_wall_start)
-                    effective_timeout = min(effective_timeout, remaining)
-                if effective_timeout > 0:
-                    await asyncio.sleep(effective_timeout)
-                    attempt_timed_out = True
-                    shutdown_event.set()
-
-            guard_task = asyncio.create_task(_attempt_timeout_guard())
+            attempt_deadline = max_sec_per_attempt
+            if max_sec_per_task > 0:
+                attempt_deadline = min(
+                    attempt_deadline, max_sec_per_task - (time.monotonic() - task_wall_start)
+                )
+            attempt_timed_out = asyncio.Event()
+            guard_task = asyncio.create_task(
+                _attempt_timeout_guard(attempt_deadline, attempt_timed_out, shutdown_event)
+            )
 
             try:
                 # Process prompts (files already uploaded in Phase 1)
                 prompt_success = await agent.process_all_prompts(files_to_upload=[])
 
                 if not prompt_success:
-                    if attempt_timed_out:
+                    if attempt_timed_out.is_set():
                         status = TaskStatus.TIMEOUT
                     else:
                         status = TaskStatus.PROMPT_FAILED
@@ -526,13 +682,9 @@ async def run_automation(config: dict) -> bool:
                     except Exception:
                         pass
 
-                    try:
-                        await _cleanup_browser(browser_mgr, context, browser, page)
-                        await playwright_ctx.__aexit__(None, None, None)
-                    except Exception:
-                        pass
+                    await _cleanup_attempt(context, page)
 
-                    await asyncio.sleep(sleep_between_retries)
+                    retry_delay = await _sleep_before_retry(retry_delay)
                     continue
 
                 # Prompt succeeded -- download artifacts
@@ -547,63 +699,54 @@ async def run_automation(config: dict) -> bool:
                     agent_json_paths.append(completion_logger.session_file)
                     logger.warning("Download failed -- no artifacts retrieved")
 
-                    try:
-                        await _cleanup_browser(browser_mgr, context, browser, page)
-                        await playwright_ctx.__aexit__(None, None, None)
-                    except Exception:
-                        pass
-                    await asyncio.sleep(sleep_between_retries)
+                    await _cleanup_attempt(context, page)
+                    retry_delay = await _sleep_before_retry(retry_delay)
                     continue
 
-                # Validate downloaded files
-                excel_files = [
-                    f for f in downloaded_files if f.lower().endswith((".xlsx", ".xls"))
+                # Classify each download once, validate the workbooks, then rename
+                classified = [
+                    (f, f.lower().endswith(_EXCEL_SUFFIXES)) for f in downloaded_files
                 ]
+                excel_files = [f for f, is_excel in classified if is_excel]
+
                 if not excel_files:
-                    agent_attempts += 1
-                    completion_logger.end_task(TaskStatus.DOWNLOAD_FAILED)
-                    agent_json_paths.append(completion_logger.session_file)
-                    logger.warning(
-                        f"No Excel files among {len(downloaded_files)} downloaded file(s)"
+                    failure = (
+                        TaskStatus.DOWNLOAD_FAILED,
+                        f"No Excel files among {len(downloaded_files)} downloaded file(s)",
+                    )
+                else:
+                    # Parse all workbooks in worker threads at once; report the first failure
+                    validations = await asyncio.gather(
+                        *(asyncio.to_thread(validate_excel_file, fpath) for fpath in excel_files)
+                    )
+                    failure = next(
+                        (
+                            (val_status, f"Validation failed ({val_status.value}): {val_msg}")
+                            for is_valid, val_status, val_msg in validations
+                            if not is_valid
+                        ),
+                        None,
                     )
-                    try:
-                        await _cleanup_browser(browser_mgr, context, browser, page)
-                        await playwright_ctx.__aexit__(None, None, None)
-                    except Exception:
-                        pass
-                    await asyncio.sleep(sleep_between_retries)
-                    continue
-
-                validation_failed = False
-                for fpath in excel_files:
-                    is_valid, val_status, val_msg = validate_excel_file(fpath)
-                    if not is_valid:
-                        agent_attempts += 1
-                        completion_logger.end_task(val_status)
-                        agent_json_paths.append(completion_logger.session_file)
-                        logger.warning(
-                            f"Validation failed ({val_status.value}): {val_msg}"
-                        )
-                        validation_failed = True
-                        break
 
-                if validation_failed:
-                    try:
-                        await _cleanup_browser(browser_mgr, context, browser, page)
-                        await playwright_ctx.__aexit__(None, None, None)
-                    except Exception:
-                        pass
-                    await asyncio.sleep(sleep_between_retries)
+                if failure:
+                    status, message = failure
+                    agent_attempts += 1
+                    completion_logger.end_task(status)
+                    agent_json_paths.append(completion_logger.session_file)
+                    logger.warning(message)
+                    await _cleanup_attempt(context, page)
+                    retry_delay = await _sleep_before_retry(retry_delay)
                     continue
 
-                # Rename solution files to match upload_tabai_folder.py pattern
-                renamed_files = []
-                for fpath in downloaded_files:
-                    if fpath.lower().endswith((".xlsx", ".xls")):
-                        new_path = rename_solution_file(fpath, task_name, agent_name)
-                        renamed_files.append(str(new_path))
-                    else:
-                        renamed_files.append(fpath)
+                # Rename solution files to match upload_tabai_folder.py pattern;
+                # one timestamp covers every file and the conversation history
+                timestamp = _file_timestamp()
+                renamed_files = [
+                    str(await rename_solution_file(fpath, task_name, agent_name, timestamp))
+                    if is_excel
+                    else fpath
+                    for fpath, is_excel in classified
+                ]
 
                 # SUCCESS
                 agent_attempts += 1
@@ -613,33 +756,34 @@ async def run_automation(config: dict) -> bool:
 
                 # Save conversation history
                 history = await agent.get_conversation_history()
-                default_log_dir = "chatgpt_web_logs" if provider_key == "chatgpt_web" else "claude_web_logs"
                 log_dir = Path(
                     agent_config.get("logging", {}).get(
-                        "log_directory", default_log_dir
+                        "log_directory", provider_defaults["default_log_dir"]
                     )
                 )
                 history_dir = log_dir / "conversations"
                 history_dir.mkdir(parents=True, exist_ok=True)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                # NDJSON: a header line, then one line per message
                 history_file = (
-                    history_dir / f"conversation_{timestamp}_{task_name}.json"
+                    history_dir / f"conversation_{timestamp}_{task_name}.ndjson"
                 )
-                with open(history_file, "w") as f:
-                    json.dump(
-                        {
-                            "task_name": task_name,
-                            "task_source": task_source,
-                            "timestamp": datetime.now().isoformat(),
-                            "messages": history,
-                        },
-                        f,
-                        indent=2,
+                with open(history_file, "wb") as f:
+                    f.write(
+                        _dumps_json_line(
+                            {
+                                "task_name": task_name,
+                                "task_source": task_source,
+                                "timestamp": datetime.now().isoformat(),
+                                "message_count": len(history),
+                            }
+                        )
                     )
+                    f.writelines(_dumps_json_line(msg) for msg in history)
                 logger.info(f"Saved conversation to: {history_file}")
 
                 # Upload to S3 and database if configured
                 upload_to_cloud = config.get("upload_to_cloud", False)
+                upload_task = None
                 if upload_to_cloud:
                     logger.info("Uploading results to S3 and database...")
                     upload_config = {
@@ -666,74 +810,67 @@ async def run_automation(config: dict) -> bool:
                     if not task_start_time:
                         task_start_time = completion_logger.session_start
 
-                    upload_result = uploader.upload_results(
-                        task_id=task_id,
-                        task_name=task_name,
-                        task_source=task_source,
-                        artifact_paths=renamed_files,
-                        conversation_history=history,
-                        start_time=task_start_time,
-                        end_time=datetime.now(),
-                        additional_metadata={
-                            "config_file": str(config.get("_config_path", "unknown")),
-                            "prompts_count": len(config.get("prompts", [])),
-                            "files_uploaded": len(files_to_upload),
-                        },
-                    )
-
-                    if upload_result["success"]:
-                        logger.info("Upload successful!")
-                        logger.info(
-                            f"  Artifact S3 URIs: {upload_result['artifact_s3_uris']}"
-                        )
-                        logger.info(
-                            f"  Conversation S3 URI: {upload_result['conversation_s3_uri']}"
-                        )
-                        logger.info(f"  TaskAttempt ID: {upload_result['attempt_id']}")
-                    else:
-                        logger.warning(
-                            f"Upload completed with errors: {upload_result['errors']}"
+                    # Upload in the background (S3/DB calls run in executor threads)
+                    # so the round-trips overlap the hold period and browser cleanup
+                    upload_task = asyncio.create_task(
+                        uploader.upload_results_async(
+                            task_id=task_id,
+                            task_name=task_name,
+                            task_source=task_source,
+                            artifact_paths=renamed_files,
+                            conversation_history=history,
+                            start_time=task_start_time,
+                            end_time=datetime.now(),
+                            additional_metadata={
+                                "config_file": str(config.get("_config_path", "unknown")),
+                                "prompts_count": len(config.get("prompts", [])),
+                                "files_uploaded": len(files_to_upload),
+                            },
                         )
+                    )
+                    upload_task.add_done_callback(_log_upload_result)
 
                 # Hold browser open unless --no-hold
                 if not no_hold:
                     logger.info("Browser staying open for inspection...")
                     logger.info("Press Ctrl+C to exit")
-                    while not shutdown_event.is_set():
-                        await asyncio.sleep(1)
+                    await shutdown_event.wait()
 
-                await _cleanup_browser(browser_mgr, context, browser, page)
-                await playwright_ctx.__aexit__(None, None, None)
+                await _cleanup_attempt(context, page)
+                if upload_task is not None:
+                    await asyncio.wait([upload_task])
                 task_success = True
                 break  # Done
 
             finally:
                 guard_task.cancel()
                 # Reset shutdown for potential next attempt
-                if attempt_timed_out:
+                if attempt_timed_out.is_set():
                     shutdown_event.clear()
 
         except Exception as e:
             logger.error(f"Unexpected error in Phase 2: {e}")
-            import traceback
-
-            logger.debug(traceback.format_exc())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
             agent_attempts += 1
             if completion_logger and completion_logger.current_task:
                 completion_logger.end_task(TaskStatus.UNKNOWN)
                 agent_json_paths.append(completion_logger.session_file)
-            await _cleanup_browser(browser_mgr, context, browser, page)
-            try:
-                await playwright_ctx.__aexit__(None, None, None)
-            except Exception:
-                pass
-            await asyncio.sleep(sleep_between_retries)
+            await _cleanup_attempt(context, page)
+            retry_delay = await _sleep_before_retry(retry_delay)
             continue
+    if completion_logger is not None:
+        completion_logger.close()
 
     # ---- Post-loop: deprecate earlier agent JSONs ----
     if len(agent_json_paths) > 1:
-        for path in agent_json_paths[:-1]:
-            mark_json_deprecated(path, "Superseded by later attempt")
+        # Rewrite all superseded files concurrently. Attempts started within the
+        # same second share a file name, so never deprecate the final attempt's file.
+        final_path = agent_json_paths[-1]
+        superseded = [p for p in dict.fromkeys(agent_json_paths[:-1]) if p != final_path]
+        await asyncio.gather(
+            *(mark_json_deprecated(p, "Superseded by later attempt") for p in superseded)
+        )
 
     if not task_success:
         logger.error(
@@ -744,6 +881,88 @@ async def run_automation(config: dict) -> bool:
     return task_success
 
 
+async def _run_and_close_browsers(config: dict) -> bool:
+    """Run one task, then close the pooled browsers before the event loop exits.
+
+    While it runs, shutdown signals are delivered through the event loop: the
+    first one sets shutdown_event so the attempt winds down and in-flight
+    uploads are awaited; a second one interrupts as before.
+    """
+    loop = asyncio.get_running_loop()
+
+    def _on_signal(sig):
+        shutdown_event.set()
+        loop.remove_signal_handler(sig)
+
+    installed = []
+    for sig in _SHUTDOWN_SIGNALS:
+        try:
+            loop.add_signal_handler(sig, _on_signal, sig)
+            installed.append(sig)
+        except (NotImplementedError, RuntimeError):
+            # e.g. Windows event loops; the process-level handler still applies
+            pass
+    try:
+        return await run_automation(config)
+    finally:
+        await BrowserPool.close_all()
+        for sig in installed:
+            loop.remove_signal_handler(sig)
+
+
+def run_daemon(max_runtime: int = 0):
+    """
+    Serve tasks from stdin, one JSON config per line.
+
+    Keeps a single interpreter (with Playwright and the agents already imported)
+    and a single event loop alive across tasks, so the pooled browser is shared
+    by the whole batch. After each task a line starting with DAEMON_RESULT_PREFIX
+    followed by a JSON result is printed to stdout.
+    """
+    root_logger = logging.getLogger()
+    base_handlers = list(root_logger.handlers)
+
+    with asyncio.Runner() as loop_runner:
+        try:
+            _serve_daemon_tasks(loop_runner, max_runtime, root_logger, base_handlers)
+        finally:
+            loop_runner.run(BrowserPool.close_all())
+
+
+def _serve_daemon_tasks(loop_runner, max_runtime, root_logger, base_handlers):
+    global shutdown_event, logger
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        success = False
+        try:
+            config = json.loads(line)
+
+            if max_runtime > 0:
+                config.setdefault("claude_web", {})["max_sec_per_task"] = max_runtime
+
+            # Fresh event per task so a finished task's shutdown does not leak
+            shutdown_event = asyncio.Event()
+            task_name = config.get("task_name", "unknown_task")
+            logger, _ = setup_logging(config, __name__, task_name=task_name)
+            logger.info(f"Daemon task: {task_name}")
+
+            success = loop_runner.run(run_automation(config))
+        except Exception as e:
+            logger.error(f"Daemon task failed: {e}")
+        finally:
+            # Drop the per-task handlers added by setup_logging()
+            for handler in root_logger.handlers[:]:
+                if handler not in base_handlers:
+                    root_logger.removeHandler(handler)
+                    handler.close()
+
+        print(f"{DAEMON_RESULT_PREFIX}{json.dumps({'success': success})}", flush=True)
+
+
 def main():
     """Main entry point."""
     # CLI Arguments
@@ -778,11 +997,21 @@ Examples:
         default=0,
         help="Maximum runtime in seconds (0 = unlimited)",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Read one JSON task config per line from stdin (used by the batch runner)",
+    )
     args = parser.parse_args()
 
-    # Signal handlers
-    signal.signal(signal.SIGINT, _handle_signal)
-    signal.signal(signal.SIGTERM, _handle_signal)
+    _install_signal_handlers()
+
+    if args.daemon:
+        env_path = Path(__file__).parent / ".env"
+        if env_path.exists():
+            load_dotenv(env_path)
+        run_daemon(max_runtime=args.max_runtime)
+        return
 
     try:
         # Load .env
@@ -824,7 +1053,7 @@ Examples:
         logger.info(f"Config: {config_path}")
         logger.info(f"Task: {task_name}")
 
-        success = asyncio.run(run_automation(config))
+        success = asyncio.run(_run_and_close_browsers(config))
 
         if success:
             print("\nSUCCESS")
@@ -837,9 +1066,8 @@ Examples:
         logger.info("Interrupted by user")
     except Exception as e:
         logger.error(f"Script failed: {e}")
-        import traceback
-
-        logger.debug(traceback.format_exc())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
         sys.exit(1)
 
 
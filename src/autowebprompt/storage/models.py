@@ -8,10 +8,33 @@ import logging
 import os
 from typing import Optional
 
+try:
+    from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, JSON, ForeignKey, Text
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import DeclarativeBase, sessionmaker
+    from sqlalchemy.sql import func
+
+    HAS_SQLA = True
+except ImportError:
+    HAS_SQLA = False
+
 logger = logging.getLogger(__name__)
 
 _Session = None
 
+# Sized for several concurrent runners sharing the module-level engine. Pooled
+# connections are health-checked before use and recycled before server-side
+# idle timeouts drop them. The one set of pool options for autowebprompt's
+# engines; an external `database` module used by the batch runner should pass
+# the same options where it creates its engine.
+DB_POOL_OPTIONS = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_timeout": 30,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
 
 def get_session():
     """Get a database session. Returns None if not configured."""
@@ -23,15 +46,13 @@ def get_session():
             logger.debug("DATABASE_URL not set — database features disabled")
             return None
 
-        try:
-            from sqlalchemy import create_engine
-            from sqlalchemy.orm import sessionmaker
-
-            engine = create_engine(database_url)
-            _Session = sessionmaker(bind=engine)
-        except ImportError:
+        if not HAS_SQLA:
             logger.warning("sqlalchemy not installed — install with: pip install autowebprompt[storage]")
             return None
+
+        try:
+            engine = create_engine(database_url, echo=False, **DB_POOL_OPTIONS)
+            _Session = sessionmaker(bind=engine)
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             return None
@@ -43,15 +64,8 @@ def get_session():
         return None
 
 
-# Lazy model definitions — only created when SQLAlchemy is available
-def _define_models():
-    """Define SQLAlchemy models. Called lazily to avoid import errors."""
-    try:
-        from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, JSON, ForeignKey, Text
-        from sqlalchemy.orm import DeclarativeBase, relationship
-        from sqlalchemy.sql import func
-    except ImportError:
-        return None, None
+# Models are only defined when SQLAlchemy is available
+if HAS_SQLA:
 
     class Base(DeclarativeBase):
         pass
@@ -86,22 +100,6 @@ def _define_models():
         cost = Column(Float)
         created_at = Column(DateTime, server_default=func.now())
 
-    return Task, TaskAttempt
-
-
-# Module-level lazy initialization
-_models_defined = False
-Task = None
-TaskAttempt = None
-
-
-def _ensure_models():
-    global _models_defined, Task, TaskAttempt
-    if not _models_defined:
-        result = _define_models()
-        if result:
-            Task, TaskAttempt = result
-        _models_defined = True
-
-
-_ensure_models()
+else:
+    Task = None
+    TaskAttempt = None
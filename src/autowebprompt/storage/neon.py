@@ -5,13 +5,41 @@ Provisions free-tier PostgreSQL databases via the Neon console API.
 Requires ``httpx`` — install with: pip install autowebprompt[storage]
 """
 
+import functools
+import importlib.util
 import logging
+import time
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 NEON_API_BASE = "https://console.neon.tech/api/v2"
 
+# Defaults for create_project().
+DEFAULT_PROJECT_NAME = "autowebprompt"
+DEFAULT_REGION_ID = "aws-us-east-2"
+
+# A successful key check is trusted for this long before /projects is hit again.
+VALIDATION_TTL_SECONDS = 60.0
+
+
+def _decode_json(resp):
+    """Parse a response body, via orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
+@functools.cache
+def _h2_available() -> bool:
+    """Whether the h2 package is importable; looked up once per process."""
+    return importlib.util.find_spec("h2") is not None
+
 
 @dataclass
 class NeonProject:
@@ -47,6 +75,9 @@ class NeonClient:
             )
 
         self._api_key = api_key
+        self._validated_at: float | None = None
+        # One keep-alive client for every call; HTTP/2 only when h2 is installed
+        # (httpx refuses http2=True without it).
         self._client = httpx.Client(
             base_url=NEON_API_BASE,
             headers={
@@ -54,7 +85,11 @@ class NeonClient:
                 "Content-Type": "application/json",
                 "Accept": "application/json",
             },
-            timeout=30.0,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            transport=httpx.HTTPTransport(
+                http2=_h2_available(),
+                retries=2,
+            ),
         )
 
     # ------------------------------------------------------------------
@@ -62,38 +97,43 @@ class NeonClient:
     # ------------------------------------------------------------------
 
     def validate_api_key(self) -> bool:
-        """Return ``True`` if the API key is valid (can list projects)."""
+        """Return ``True`` if the API key is valid (can list projects).
+
+        A successful check is cached for ``VALIDATION_TTL_SECONDS``.
+        """
+        now = time.monotonic()
+        if self._validated_at is not None and now - self._validated_at < VALIDATION_TTL_SECONDS:
+            return True
         try:
-            resp = self._client.get("/projects")
-            return resp.status_code == 200
+            # One project is enough to prove the key works; the full list isn't needed
+            resp = self._client.get("/projects", params={"limit": 1})
         except Exception as exc:
             logger.debug("API key validation failed: %s", exc)
             return False
+        if resp.status_code != 200:
+            return False
+        self._validated_at = now
+        return True
 
     def create_project(
         self,
-        name: str = "autowebprompt",
-        region_id: str = "aws-us-east-2",
+        name: str = DEFAULT_PROJECT_NAME,
+        region_id: str = DEFAULT_REGION_ID,
     ) -> NeonProject:
         """Create a new Neon project and return connection details."""
-        body = {
-            "project": {
-                "name": name,
-                "region_id": region_id,
-            }
-        }
-
-        resp = self._client.post("/projects", json=body)
+        resp = self._client.post(
+            "/projects", json={"project": {"name": name, "region_id": region_id}}
+        )
 
         if resp.status_code not in (200, 201):
             error_msg = resp.text
             try:
-                error_msg = resp.json().get("message", resp.text)
+                error_msg = _decode_json(resp).get("message", resp.text)
             except Exception:
                 pass
             raise NeonAPIError(resp.status_code, error_msg)
 
-        data = resp.json()
+        data = _decode_json(resp)
         project = data["project"]
         connection_uris = data.get("connection_uris", [])
 
@@ -9,8 +9,14 @@ Install with: pip install autowebprompt[storage]
 """
 
 import logging
+import sys
 from textwrap import dedent
 
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
 logger = logging.getLogger(__name__)
 
 SCHEMA_VERSION = "1"
@@ -63,14 +69,21 @@ TASK_ATTEMPTS_INDEX_SQL = (
     "CREATE INDEX IF NOT EXISTS idx_task_attempts_task_id ON task_attempts (task_id);"
 )
 
-# Ordered list of all migration statements for v1.
-MIGRATION_SQL = [
+# Ordered migration statements for v1 (a tuple so the shared copy can't be mutated).
+# Built once at import and interned, so every caller shares the same objects.
+MIGRATION_SQL = tuple(sys.intern(sql) for sql in (
     META_TABLE_SQL,
     TASKS_TABLE_SQL,
     TASKS_INDEX_SQL,
     TASK_ATTEMPTS_TABLE_SQL,
     TASK_ATTEMPTS_INDEX_SQL,
-]
+))
+
+# Serializes concurrent `db migrate` runs; released when the transaction ends.
+MIGRATION_LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext('autowebprompt_migrate'));"
+
+# Lock plus all DDL as the single string run_migration() sends.
+MIGRATION_BATCH_SQL = "\n".join([MIGRATION_LOCK_SQL, *MIGRATION_SQL])
 
 # Insert / update schema version (last step).
 SET_VERSION_SQL = dedent("""\
@@ -79,6 +92,13 @@ SET_VERSION_SQL = dedent("""\
 """)
 
 
+def _require_psycopg2():
+    if psycopg2 is None:
+        raise RuntimeError(
+            "psycopg2 is required. Install with: pip install autowebprompt[storage]"
+        )
+
+
 def get_migration_sql() -> list[str]:
     """Return the full list of SQL statements for the current schema version."""
     return list(MIGRATION_SQL)
@@ -87,23 +107,27 @@ def get_migration_sql() -> list[str]:
 def run_migration(database_url: str) -> str:
     """Run schema migration against *database_url*.
 
+    Reuses the connection check_connection() left open for *database_url*,
+    if any; otherwise connects and closes its own.
     Returns the schema version string after migration.
     Raises ``RuntimeError`` if psycopg2 is not installed.
     """
-    try:
-        import psycopg2
-    except ImportError:
-        raise RuntimeError(
-            "psycopg2 is required for migrations. "
-            "Install with: pip install autowebprompt[storage]"
-        )
+    _require_psycopg2()
 
-    conn = psycopg2.connect(database_url)
+    shared = _CONNECTIONS.get(database_url)
+    if shared is not None and not shared.closed:
+        conn = shared
+    else:
+        shared = None
+        conn = psycopg2.connect(database_url)
     try:
         conn.autocommit = False
         cur = conn.cursor()
-        for stmt in MIGRATION_SQL:
-            cur.execute(stmt)
+        # The lock and all DDL go to the server as one multi-statement string:
+        # one round-trip instead of one per statement. (execute_batch() can't
+        # do this: it binds parameters into a fixed template, and DDL statements
+        # aren't parameters.)
+        cur.execute(MIGRATION_BATCH_SQL)
         cur.execute(SET_VERSION_SQL, (SCHEMA_VERSION,))
         conn.commit()
         logger.info("Migration complete — schema version %s", SCHEMA_VERSION)
@@ -112,32 +136,77 @@ def run_migration(database_url: str) -> str:
         conn.rollback()
         raise
     finally:
-        conn.close()
+        if shared is None:
+            conn.close()
+        else:
+            try:
+                conn.autocommit = True
+            except Exception:
+                _drop_connection(database_url)
+
+
+# Live connections by URL. `db status` runs check_connection() and then
+# get_table_status() against the same database, and `db init` runs
+# check_connection() and then run_migration(); sharing the connection saves a
+# full connect/TLS/auth handshake.
+_CONNECTIONS: dict[str, object] = {}
+
+# Existence and live-row estimate for every status table in one round-trip.
+# n_live_tup comes from the statistics collector, so no table is scanned.
+TABLE_STATUS_SQL = dedent("""\
+    SELECT t.name, c.oid IS NOT NULL, COALESCE(s.n_live_tup, 0)
+    FROM unnest(%s::text[]) AS t(name)
+    LEFT JOIN pg_class c
+        ON c.relname = t.name AND c.relkind = 'r' AND pg_table_is_visible(c.oid)
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid;
+""")
+
+STATUS_TABLES = ("tasks", "task_attempts")
+
+
+def _shared_connection(database_url: str):
+    """Return the cached autocommit connection for *database_url*, opening it if needed."""
+    conn = _CONNECTIONS.get(database_url)
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(database_url)
+        conn.autocommit = True
+        _CONNECTIONS[database_url] = conn
+    return conn
+
+
+def _drop_connection(database_url: str):
+    conn = _CONNECTIONS.pop(database_url, None)
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def close_connections():
+    """Close every connection shared by check_connection()/get_table_status()."""
+    for database_url in list(_CONNECTIONS):
+        _drop_connection(database_url)
 
 
 def check_connection(database_url: str) -> bool:
     """Return ``True`` if we can execute ``SELECT 1`` against *database_url*."""
-    try:
-        import psycopg2
-    except ImportError:
-        raise RuntimeError(
-            "psycopg2 is required. Install with: pip install autowebprompt[storage]"
-        )
+    _require_psycopg2()
 
     try:
-        conn = psycopg2.connect(database_url)
+        conn = _shared_connection(database_url)
         cur = conn.cursor()
         cur.execute("SELECT 1")
         cur.close()
-        conn.close()
         return True
     except Exception as exc:
         logger.debug("Connection test failed: %s", exc)
+        _drop_connection(database_url)
         return False
 
 
 def get_table_status(database_url: str) -> dict:
-    """Return a dict with table existence and row counts.
+    """Return a dict with table existence and (estimated) row counts.
 
     Example return::
 
@@ -149,14 +218,9 @@ def get_table_status(database_url: str) -> dict:
             },
         }
     """
-    try:
-        import psycopg2
-    except ImportError:
-        raise RuntimeError(
-            "psycopg2 is required. Install with: pip install autowebprompt[storage]"
-        )
+    _require_psycopg2()
 
-    conn = psycopg2.connect(database_url)
+    conn = _shared_connection(database_url)
     cur = conn.cursor()
 
     # Schema version
@@ -169,30 +233,17 @@ def get_table_status(database_url: str) -> dict:
         if row:
             version = row[0]
     except Exception:
-        conn.rollback()
+        pass  # autocommit: a failed read leaves no transaction to roll back
 
     # Table status
-    tables = {}
-    for table_name in ("tasks", "task_attempts"):
-        try:
-            cur.execute(
-                "SELECT EXISTS ("
-                "  SELECT 1 FROM information_schema.tables"
-                "  WHERE table_name = %s"
-                ")",
-                (table_name,),
-            )
-            exists = cur.fetchone()[0]
-            rows = 0
-            if exists:
-                cur.execute(f"SELECT COUNT(*) FROM {table_name}")  # noqa: S608
-                rows = cur.fetchone()[0]
-            tables[table_name] = {"exists": exists, "rows": rows}
-        except Exception:
-            conn.rollback()
-            tables[table_name] = {"exists": False, "rows": 0}
+    tables = {name: {"exists": False, "rows": 0} for name in STATUS_TABLES}
+    try:
+        cur.execute(TABLE_STATUS_SQL, (list(STATUS_TABLES),))
+        for table_name, exists, rows in cur.fetchall():
+            tables[table_name] = {"exists": exists, "rows": rows if exists else 0}
+    except Exception as exc:
+        logger.debug("Table status query failed: %s", exc)
 
     cur.close()
-    conn.close()
 
     return {"schema_version": version, "tables": tables}
@@ -5,19 +5,85 @@ All cloud features are optional. If AWS credentials or DATABASE_URL are not set,
 those features gracefully skip with a warning.
 """
 
+import asyncio
+import functools
+import hashlib
+import io
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# S3 key segment for a task name: path separators and spaces become "_"
+_SAFE_KEY_TRANSLATE = str.maketrans({"/": "_", "\\": "_", " ": "_"})
+
+# Compact, UTF-8-native encoder for conversation payloads (stdlib fallback)
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _encode_json(data) -> bytes:
+    """Serialize a payload to compact UTF-8 JSON, via orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers wider than 64 bits; the stdlib encoder copes
+            pass
+    return _JSON_ENCODER.encode(data).encode("utf-8")
+
+
+def _file_digest(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """BLAKE2b content hash, read in chunks so large artifacts stay out of memory."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _duplicate_sources(paths: list) -> list[int]:
+    """
+    Map each path to the index of the first path with identical contents.
+
+    Only files that share a size with another file are hashed; unreadable
+    files are treated as unique (their upload reports the error).
+    """
+    sources = list(range(len(paths)))
+    by_size: dict[int, list[int]] = {}
+    for i, path in enumerate(paths):
+        try:
+            by_size.setdefault(os.stat(path).st_size, []).append(i)
+        except OSError:
+            pass
+    for indices in by_size.values():
+        if len(indices) < 2:
+            continue
+        first_by_digest: dict[str, int] = {}
+        for i in indices:
+            try:
+                digest = _file_digest(paths[i])
+            except OSError:
+                continue
+            sources[i] = first_by_digest.setdefault(digest, i)
+    return sources
+
 
 class ResultUploader:
     """Handles uploading automation results to S3 and database."""
 
+    # Upper bound on concurrent S3 uploads per upload_results() call
+    MAX_UPLOAD_WORKERS = 8
+
     def __init__(self, config: dict = None):
         self.config = config or {}
         self.s3_bucket = self.config.get(
@@ -32,13 +98,24 @@ class ResultUploader:
         self.s3_conversation_prefix = self.config.get("s3_conversation_prefix", "conversations")
 
         self._s3_client = None
+        # (task_name, task_source) -> Task.id, filled as lookups succeed
+        self._task_id_cache: dict[tuple[str, str], int] = {}
 
     @property
     def s3_client(self):
         if self._s3_client is None:
             try:
                 import boto3
-                self._s3_client = boto3.client("s3")
+                from botocore.config import Config
+
+                # Enough pooled connections for the parallel uploads in upload_results()
+                self._s3_client = boto3.client(
+                    "s3",
+                    config=Config(
+                        max_pool_connections=16,
+                        retries={"max_attempts": 3, "mode": "adaptive"},
+                    ),
+                )
             except ImportError:
                 logger.warning("boto3 not installed — S3 uploads disabled. Install with: pip install autowebprompt[storage]")
                 return None
@@ -73,10 +150,52 @@ class ResultUploader:
             logger.error(f"S3 upload failed: {e}")
             return None
 
-    def upload_artifact(self, local_path: Path, task_name: str, task_source: str = "") -> Optional[str]:
+    # Payloads above this go through the transfer manager (multipart) instead of put_object
+    MULTIPART_THRESHOLD = 5 * 1024 * 1024
+
+    def upload_bytes_to_s3(
+        self, payload: bytes, s3_key: str, content_type: str = "application/octet-stream"
+    ) -> Optional[str]:
+        """Upload an in-memory payload to S3 without staging it on disk."""
+        if not self.s3_bucket:
+            logger.warning("No S3 bucket configured — skipping upload")
+            return None
+
+        client = self.s3_client
+        if client is None:
+            return None
+
+        try:
+            if self.s3_prefix:
+                s3_key = f"{self.s3_prefix}/{s3_key}"
+
+            if len(payload) > self.MULTIPART_THRESHOLD:
+                client.upload_fileobj(
+                    io.BytesIO(payload), self.s3_bucket, s3_key,
+                    ExtraArgs={"ContentType": content_type},
+                )
+            else:
+                client.put_object(
+                    Bucket=self.s3_bucket, Key=s3_key, Body=payload, ContentType=content_type,
+                )
+            s3_uri = f"s3://{self.s3_bucket}/{s3_key}"
+            logger.info(f"Uploaded to S3: {s3_uri}")
+            return s3_uri
+        except Exception as e:
+            logger.error(f"S3 upload failed: {e}")
+            return None
+
+    def upload_artifact(
+        self,
+        local_path: Path,
+        task_name: str,
+        task_source: str = "",
+        timestamp: str | None = None,
+    ) -> Optional[str]:
         local_path = Path(local_path)
-        timestamp = self._get_timestamp_prefix()
-        safe_task_name = task_name.replace("/", "_").replace("\\", "_").replace(" ", "_")
+        if timestamp is None:
+            timestamp = self._get_timestamp_prefix()
+        safe_task_name = task_name.translate(_SAFE_KEY_TRANSLATE)
         s3_key = (
             f"{self.s3_artifact_prefix}/{task_source}/{safe_task_name}/"
             f"{timestamp}_{local_path.name}"
@@ -89,11 +208,11 @@ class ResultUploader:
         task_name: str,
         task_source: str = "",
         additional_metadata: dict = None,
+        timestamp: str | None = None,
     ) -> Optional[str]:
-        import tempfile
-
-        timestamp = self._get_timestamp_prefix()
-        safe_task_name = task_name.replace("/", "_").replace("\\", "_").replace(" ", "_")
+        if timestamp is None:
+            timestamp = self._get_timestamp_prefix()
+        safe_task_name = task_name.translate(_SAFE_KEY_TRANSLATE)
 
         data = {
             "task_name": task_name,
@@ -106,15 +225,9 @@ class ResultUploader:
         if additional_metadata:
             data["metadata"] = additional_metadata
 
-        temp_path = Path(tempfile.gettempdir()) / f"conversation_{timestamp}_{safe_task_name}.json"
-        try:
-            with open(temp_path, "w") as f:
-                json.dump(data, f, indent=2, default=str)
-            s3_key = f"{self.s3_conversation_prefix}/{timestamp}_{safe_task_name}.json"
-            return self.upload_file_to_s3(temp_path, s3_key)
-        finally:
-            if temp_path.exists():
-                temp_path.unlink()
+        payload = _encode_json(data)
+        s3_key = f"{self.s3_conversation_prefix}/{timestamp}_{safe_task_name}.json"
+        return self.upload_bytes_to_s3(payload, s3_key, content_type="application/json")
 
     def save_to_database(
         self,
@@ -131,60 +244,148 @@ class ResultUploader:
             logger.info("Database saving disabled, skipping")
             return None
 
+        return self.save_batch_to_database([{
+            "task_name": task_name,
+            "task_source": task_source,
+            "artifact_s3_uris": artifact_s3_uris,
+            "conversation_s3_uri": conversation_s3_uri,
+            "start_time": start_time,
+            "end_time": end_time,
+            "cost": cost,
+            "task_id": task_id,
+        }])[0]
+
+    def save_batch_to_database(self, rows: list[dict]) -> list[Optional[int]]:
+        """
+        Insert one TaskAttempt per row in a single transaction.
+
+        Each row holds save_to_database()'s keyword arguments. Task lookups take
+        at most two queries (names this uploader already resolved are not looked
+        up again) and all attempts go in with one multi-row INSERT ... RETURNING,
+        so N results cost one commit instead of N.
+
+        Returns:
+            New attempt IDs in row order; None where the task was not found
+            (every entry is None if the save failed).
+        """
+        ids: list[Optional[int]] = [None] * len(rows)
+        if not self.db_enabled:
+            logger.info("Database saving disabled, skipping")
+            return ids
+        if not rows:
+            return ids
+
         try:
+            from sqlalchemy import insert, select, tuple_
+
             from autowebprompt.storage.models import Task, TaskAttempt, get_session
         except ImportError:
             logger.warning("Database modules not available — install with: pip install autowebprompt[storage]")
-            return None
+            return ids
 
+        session = None
         try:
             session = get_session()
             if session is None:
                 logger.warning("No database connection — skipping save")
-                return None
-
-            time_taken_mins = None
-            if start_time and end_time:
-                time_taken_mins = (end_time - start_time).total_seconds() / 60
-
-            if task_id:
-                task = session.query(Task).filter(Task.id == task_id).first()
-                if not task:
-                    logger.warning(f"Task ID {task_id} not found in database")
-                    return None
-            else:
-                task = session.query(Task).filter(
-                    Task.task_name == task_name,
-                    Task.task_source == task_source,
-                ).first()
-                if not task:
-                    logger.warning(f"Task not found in database: {task_name}")
-                    return None
-
-            prompt_files = [conversation_s3_uri] if conversation_s3_uri else []
-
-            attempt = TaskAttempt(
-                task_id=task.id,
-                prompt_files=prompt_files,
-                start_end_times=[[
-                    start_time.isoformat() if start_time else None,
-                    end_time.isoformat() if end_time else None,
-                ]],
-                agent_model_name=self.agent_model_name,
-                agent_model_type=self.agent_model_type,
-                attempt_files=artifact_s3_uris or [],
-                time_taken_mins=time_taken_mins,
-                cost=cost,
-            )
-            session.add(attempt)
+                return ids
+
+            # Resolve every referenced task up front; names seen before come from the cache
+            ids_by_name = self._task_id_cache
+            wanted_ids = {row["task_id"] for row in rows if row.get("task_id")}
+            wanted_names = {
+                (row["task_name"], row["task_source"])
+                for row in rows
+                if not row.get("task_id") and (row["task_name"], row["task_source"]) not in ids_by_name
+            }
+            known_ids = set()
+            if wanted_ids:
+                known_ids = set(session.scalars(select(Task.id).where(Task.id.in_(wanted_ids))))
+            if wanted_names:
+                found = session.execute(
+                    select(Task.id, Task.task_name, Task.task_source)
+                    .where(tuple_(Task.task_name, Task.task_source).in_(wanted_names))
+                    .order_by(Task.id)
+                )
+                for found_id, name, source in found:
+                    ids_by_name.setdefault((name, source), found_id)
+
+            positions, mappings = [], []
+            for i, row in enumerate(rows):
+                task_id = row.get("task_id")
+                if task_id:
+                    if task_id not in known_ids:
+                        logger.warning(f"Task ID {task_id} not found in database")
+                        continue
+                else:
+                    task_id = ids_by_name.get((row["task_name"], row["task_source"]))
+                    if task_id is None:
+                        logger.warning(f"Task not found in database: {row['task_name']}")
+                        continue
+
+                start_time, end_time = row.get("start_time"), row.get("end_time")
+                time_taken_mins = None
+                if start_time and end_time:
+                    time_taken_mins = (end_time - start_time).total_seconds() / 60
+                conversation_s3_uri = row.get("conversation_s3_uri")
+
+                positions.append(i)
+                mappings.append({
+                    "task_id": task_id,
+                    "prompt_files": [conversation_s3_uri] if conversation_s3_uri else [],
+                    "start_end_times": [[
+                        start_time.isoformat() if start_time else None,
+                        end_time.isoformat() if end_time else None,
+                    ]],
+                    "agent_model_name": self.agent_model_name,
+                    "agent_model_type": self.agent_model_type,
+                    "attempt_files": row.get("artifact_s3_uris") or [],
+                    "time_taken_mins": time_taken_mins,
+                    "cost": row.get("cost"),
+                })
+
+            if not mappings:
+                return ids
+
+            new_ids = session.scalars(
+                insert(TaskAttempt).returning(TaskAttempt.id, sort_by_parameter_order=True),
+                mappings,
+            ).all()
             session.commit()
 
-            logger.info(f"Created TaskAttempt ID: {attempt.id}")
-            return attempt.id
+            for i, attempt_id in zip(positions, new_ids):
+                ids[i] = attempt_id
+                logger.info(f"Created TaskAttempt ID: {attempt_id}")
+            return ids
 
         except Exception as e:
             logger.error(f"Database save failed: {e}")
-            return None
+            return [None] * len(rows)
+        finally:
+            # Hand the connection back to the pool on every path
+            if session is not None:
+                session.close()
+
+    @staticmethod
+    def _upload_result(
+        artifact_paths: list, artifact_uris: list, conversation_history, conversation_uri
+    ) -> dict:
+        """Build the upload_results() dict from per-upload S3 URIs (None = failed)."""
+        result = {
+            "success": True,
+            "artifact_s3_uris": [],
+            "conversation_s3_uri": conversation_uri,
+            "attempt_id": None,
+            "errors": [],
+        }
+        for path, s3_uri in zip(artifact_paths, artifact_uris):
+            if s3_uri:
+                result["artifact_s3_uris"].append(s3_uri)
+            else:
+                result["errors"].append(f"Failed to upload artifact: {path}")
+        if conversation_history and not conversation_uri:
+            result["errors"].append("Failed to upload conversation")
+        return result
 
     def upload_results(
         self,
@@ -198,30 +399,41 @@ class ResultUploader:
         additional_metadata: dict = None,
         task_id: int = None,
     ) -> dict:
-        result = {
-            "success": True,
-            "artifact_s3_uris": [],
-            "conversation_s3_uri": None,
-            "attempt_id": None,
-            "errors": [],
-        }
-
         logger.info(f"Uploading results for task: {task_name}")
 
-        if artifact_paths:
-            for path in artifact_paths:
-                s3_uri = self.upload_artifact(path, task_name, task_source)
-                if s3_uri:
-                    result["artifact_s3_uris"].append(s3_uri)
-                else:
-                    result["errors"].append(f"Failed to upload artifact: {path}")
-
-        if conversation_history:
-            result["conversation_s3_uri"] = self.upload_conversation(
-                conversation_history, task_name, task_source, additional_metadata,
-            )
-            if not result["conversation_s3_uri"]:
-                result["errors"].append("Failed to upload conversation")
+        artifact_paths = artifact_paths or []
+        artifact_uris, conversation_uri = [], None
+        # One timestamp for the whole result set keeps its S3 keys together
+        timestamp = self._get_timestamp_prefix()
+        # Byte-identical artifacts (e.g. a re-saved retry) are uploaded once
+        sources = _duplicate_sources(artifact_paths)
+        unique = [i for i, source in enumerate(sources) if source == i]
+        uploads = len(unique) + (1 if conversation_history else 0)
+        if uploads:
+            # boto3 clients are thread-safe, but create it once up front
+            _ = self.s3_client
+            # Artifacts and the conversation are independent PUTs; run them together
+            with ThreadPoolExecutor(max_workers=min(self.MAX_UPLOAD_WORKERS, uploads)) as executor:
+                artifact_futures = {
+                    i: executor.submit(
+                        self.upload_artifact, artifact_paths[i], task_name, task_source, timestamp
+                    )
+                    for i in unique
+                }
+                conversation_future = None
+                if conversation_history:
+                    conversation_future = executor.submit(
+                        self.upload_conversation,
+                        conversation_history, task_name, task_source, additional_metadata,
+                        timestamp,
+                    )
+                artifact_uris = [artifact_futures[source].result() for source in sources]
+                if conversation_future is not None:
+                    conversation_uri = conversation_future.result()
+
+        result = self._upload_result(
+            artifact_paths, artifact_uris, conversation_history, conversation_uri
+        )
 
         if self.db_enabled:
             result["attempt_id"] = self.save_to_database(
@@ -237,3 +449,71 @@ class ResultUploader:
 
         result["success"] = len(result["errors"]) == 0
         return result
+
+    async def upload_results_async(
+        self,
+        task_name: str,
+        task_source: str,
+        artifact_paths: list = None,
+        conversation_history: list = None,
+        start_time: datetime = None,
+        end_time: datetime = None,
+        cost: Optional[float] = None,
+        additional_metadata: dict = None,
+        task_id: int = None,
+    ) -> dict:
+        """
+        Event-loop friendly upload_results().
+
+        Each S3 upload and the database save run in the loop's default executor,
+        so a coroutine driving the browser is never blocked on network I/O.
+        """
+        loop = asyncio.get_running_loop()
+        logger.info(f"Uploading results for task: {task_name}")
+
+        artifact_paths = artifact_paths or []
+        artifact_uris, conversation_uri = [], None
+        timestamp = self._get_timestamp_prefix()
+        if artifact_paths or conversation_history:
+            # Client construction reads credentials/config files; keep it off the loop
+            await loop.run_in_executor(None, lambda: self.s3_client)
+            # Hashing reads files too, so it also runs off the loop
+            sources = await loop.run_in_executor(None, _duplicate_sources, artifact_paths)
+            unique = [i for i, source in enumerate(sources) if source == i]
+            jobs = [
+                loop.run_in_executor(
+                    None, self.upload_artifact, artifact_paths[i], task_name, task_source, timestamp
+                )
+                for i in unique
+            ]
+            if conversation_history:
+                jobs.append(loop.run_in_executor(
+                    None, self.upload_conversation,
+                    conversation_history, task_name, task_source, additional_metadata,
+                    timestamp,
+                ))
+            uris = await asyncio.gather(*jobs)
+            uri_by_index = dict(zip(unique, uris))
+            artifact_uris = [uri_by_index[source] for source in sources]
+            if conversation_history:
+                conversation_uri = uris[-1]
+
+        result = self._upload_result(
+            artifact_paths, artifact_uris, conversation_history, conversation_uri
+        )
+
+        if self.db_enabled:
+            result["attempt_id"] = await loop.run_in_executor(None, functools.partial(
+                self.save_to_database,
+                task_id=task_id,
+                task_name=task_name,
+                task_source=task_source,
+                artifact_s3_uris=result["artifact_s3_uris"],
+                conversation_s3_uri=result["conversation_s3_uri"],
+                start_time=start_time or datetime.now(),
+                end_time=end_time or datetime.now(),
+                cost=cost,
+            ))
+
+        result["success"] = len(result["errors"]) == 0
+        return result
@@ -1,12 +1,83 @@
 """Excel file validation for downloaded artifacts."""
 
+import functools
 import logging
+import os
+import unicodedata
+import zipfile
 from pathlib import Path
+from xml.etree import ElementTree
 
 from autowebprompt.agents.base import TaskStatus
 
 logger = logging.getLogger(__name__)
 
+_ZIP_MAGIC = b"PK\x03\x04"
+
+_SHEETS_TAG = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}sheets"
+_SHEET_TAG = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}sheet"
+
+
+def _check_zip_magic(f) -> None:
+    """Raise zipfile.BadZipFile unless binary file *f* starts with a zip local header."""
+    # Rejects non-zip input after 4 bytes, before zipfile seeks and scans the
+    # end of the file.
+    if f.read(4) != _ZIP_MAGIC:
+        raise zipfile.BadZipFile("not a zip package (bad magic)")
+
+
+def _read_sheet_names(file_path: str | Path) -> list[str]:
+    """
+    Read sheet names straight from the package's xl/workbook.xml.
+
+    Raises (zipfile.BadZipFile, ElementTree.ParseError, ...) if the file is
+    not a readable .xlsx package.
+    """
+    with open(file_path, "rb") as f:
+        _check_zip_magic(f)
+        f.seek(0)
+        with zipfile.ZipFile(f) as archive:
+            try:
+                member = archive.getinfo("xl/workbook.xml")
+            except KeyError:
+                raise zipfile.BadZipFile("not an .xlsx package (no xl/workbook.xml)") from None
+            # Stream the XML and stop at </sheets>: defined names, pivot caches
+            # and the like that follow it are never parsed, and are only
+            # decompressed as far as the current read buffer.
+            names = []
+            with archive.open(member) as xml:
+                for _, element in ElementTree.iterparse(xml, events=("end",)):
+                    if element.tag == _SHEET_TAG:
+                        names.append(element.get("name", ""))
+                    elif element.tag == _SHEETS_TAG:
+                        break
+    return names
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_sheet_names(path: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    """Sheet names of a file; mtime_ns and size are only part of the cache key."""
+    return tuple(_read_sheet_names(path))
+
+
+def _find_required_sheets(
+    sheet_names, want_model: bool = True, want_answers: bool = True
+) -> tuple[bool, bool]:
+    """
+    (has a "model" sheet, has an "answer(s)" sheet), ignoring case and accents.
+
+    A word that isn't wanted is not searched for and reported as False.
+    """
+    # Neither word can match across the newline, so one casefold() and up to two
+    # C-level substring scans of the joined names replace a per-sheet Python loop.
+    joined = "\n".join(sheet_names).casefold()
+    if not joined.isascii():
+        # Strip combining marks so e.g. "Modèle" matches "model"
+        joined = "".join(
+            c for c in unicodedata.normalize("NFKD", joined) if not unicodedata.combining(c)
+        )
+    return want_model and "model" in joined, want_answers and "answer" in joined
+
 
 def validate_excel_file(
     file_path,
@@ -18,8 +89,11 @@ def validate_excel_file(
 
     Checks:
     1. File exists and has non-zero size
-    2. openpyxl can open it (not corrupted)
-    3. Optionally checks for sheets containing "model" and "answers"
+    2. The file is a zip package (not corrupted); with no sheet required,
+       this header check is all that is done
+    3. Optionally checks for sheets containing "model" and "answers"; sheet
+       names are read from the package's xl/workbook.xml, so no spreadsheet
+       library is needed, and cached until the file's mtime or size changes
 
     Args:
         file_path: Path to the Excel file
@@ -29,55 +103,59 @@ def validate_excel_file(
     Returns:
         (is_valid, status, message) tuple
     """
-    file_path = Path(file_path)
-
-    if not file_path.exists():
+    # One stat call answers both "exists?" and "empty?"
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
         return False, TaskStatus.DOWNLOAD_FAILED, f"File does not exist: {file_path}"
 
-    if file_path.stat().st_size == 0:
+    if st.st_size == 0:
         return False, TaskStatus.DOWNLOAD_FAILED, f"File is empty: {file_path}"
 
+    if not (require_model_sheet or require_answers_sheet):
+        # Only a format check is wanted; the zip header is enough for that
+        try:
+            with open(file_path, "rb") as f:
+                _check_zip_magic(f)
+        except Exception as e:
+            return False, TaskStatus.FILE_CORRUPTED, f"Cannot open Excel file: {e}"
+        return True, TaskStatus.SUCCESS, "Valid"
+
     try:
-        import openpyxl
-
-        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-        sheet_names = [s.lower() for s in wb.sheetnames]
-        wb.close()
-    except ImportError:
-        logger.warning("openpyxl not installed — skipping corruption check")
-        return True, TaskStatus.SUCCESS, "openpyxl not available, skipping validation"
+        sheet_names = _cached_sheet_names(
+            os.path.abspath(file_path), st.st_mtime_ns, st.st_size
+        )
     except Exception as e:
         return False, TaskStatus.FILE_CORRUPTED, f"Cannot open Excel file: {e}"
 
-    if require_model_sheet or require_answers_sheet:
-        has_model = any("model" in name for name in sheet_names)
-        has_answers = any("answers" in name or "answer" in name for name in sheet_names)
-
-        if require_model_sheet and require_answers_sheet:
-            if not has_model and not has_answers:
-                return (
-                    False, TaskStatus.MISSING_SHEETS,
-                    f"Missing both 'model' and 'answers' sheets. Found: {sheet_names}",
-                )
-            if not has_model:
-                return (
-                    False, TaskStatus.MISSING_SHEETS,
-                    f"Missing 'model' sheet. Found: {sheet_names}",
-                )
-            if not has_answers:
-                return (
-                    False, TaskStatus.MISSING_SHEETS,
-                    f"Missing 'answers' sheet. Found: {sheet_names}",
-                )
-        elif require_model_sheet and not has_model:
+    has_model, has_answers = _find_required_sheets(
+        sheet_names, require_model_sheet, require_answers_sheet
+    )
+    if (has_model or not require_model_sheet) and (has_answers or not require_answers_sheet):
+        return True, TaskStatus.SUCCESS, "Valid"
+    sheet_names = [name.lower() for name in sheet_names]  # for the messages below
+
+    if require_model_sheet and require_answers_sheet:
+        if not has_model and not has_answers:
             return (
                 False, TaskStatus.MISSING_SHEETS,
-                f"Missing 'model' sheet. Found: {sheet_names}",
+                f"Missing both 'model' and 'answers' sheets. Found: {sheet_names}",
             )
-        elif require_answers_sheet and not has_answers:
+        if not has_model:
             return (
                 False, TaskStatus.MISSING_SHEETS,
-                f"Missing 'answers' sheet. Found: {sheet_names}",
+                f"Missing 'model' sheet. Found: {sheet_names}",
             )
-
-    return True, TaskStatus.SUCCESS, "Valid"
+        return (
+            False, TaskStatus.MISSING_SHEETS,
+            f"Missing 'answers' sheet. Found: {sheet_names}",
+        )
+    if require_model_sheet:
+        return (
+            False, TaskStatus.MISSING_SHEETS,
+            f"Missing 'model' sheet. Found: {sheet_names}",
+        )
+    return (
+        False, TaskStatus.MISSING_SHEETS,
+        f"Missing 'answers' sheet. Found: {sheet_names}",
+    )
@@ -0,0 +1,9 @@
+"""Shared pytest configuration for the autowebprompt test suite."""
+
+# Skip the CLI test modules at collection time when click is unavailable,
+# before their imports run.
+collect_ignore = []
+try:
+    import click  # noqa: F401
+except ImportError:
+    collect_ignore += ["test_cli.py", "test_db_cli.py"]
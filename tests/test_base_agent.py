@@ -1,7 +1,8 @@
 """Tests for autowebprompt.agents.base module."""
 
+import asyncio
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -16,16 +17,41 @@ from autowebprompt.agents.base import (
     WebAgent,
 )
 
+# Stand-ins for collaborators that WebAgent.__init__ only stores
+_SENTINEL_PAGE = object()
+_SENTINEL_EVENT = object()
+_SENTINEL_LOGGER = object()
+
+_EXPECTED_AGENT_STATE_NAMES = frozenset(
+    {"RUNNING", "READY", "RATE_LIMITED", "AUTH_REQUIRED", "ERROR", "UNKNOWN"}
+)
+
+_EXPECTED_AGENT_STATUSES = frozenset({
+    TaskStatus.SUCCESS,
+    TaskStatus.TIMEOUT,
+    TaskStatus.PROMPT_FAILED,
+    TaskStatus.DOWNLOAD_FAILED,
+    TaskStatus.FILE_CORRUPTED,
+    TaskStatus.MISSING_SHEETS,
+})
+
+_EXPECTED_PIPELINE_STATUSES = frozenset({
+    TaskStatus.NAVIGATION_FAILED,
+    TaskStatus.AUTH_FAILED,
+    TaskStatus.UPLOAD_FAILED,
+    TaskStatus.RATE_LIMITED,
+    TaskStatus.UNKNOWN,
+})
+
+_CATEGORIZED_STATUSES = AGENT_STATUSES | PIPELINE_STATUSES
+
 
 class TestAgentState:
     """Tests for the AgentState enum."""
 
     def test_all_states_defined(self):
         """All expected states exist in the enum."""
-        expected = {"RUNNING", "READY", "RATE_LIMITED", "AUTH_REQUIRED", "ERROR", "UNKNOWN"}
-        actual = {s.name for s in AgentState}
-
-        assert actual == expected
+        assert frozenset(s.name for s in AgentState) == _EXPECTED_AGENT_STATE_NAMES
 
     def test_state_values_are_strings(self):
         """Each AgentState value is a descriptive string."""
@@ -51,26 +77,11 @@ class TestTaskStatus:
 
     def test_agent_statuses_set(self):
         """AGENT_STATUSES contains exactly the agent-side statuses."""
-        expected = {
-            TaskStatus.SUCCESS,
-            TaskStatus.TIMEOUT,
-            TaskStatus.PROMPT_FAILED,
-            TaskStatus.DOWNLOAD_FAILED,
-            TaskStatus.FILE_CORRUPTED,
-            TaskStatus.MISSING_SHEETS,
-        }
-        assert AGENT_STATUSES == expected
+        assert AGENT_STATUSES == _EXPECTED_AGENT_STATUSES
 
     def test_pipeline_statuses_set(self):
         """PIPELINE_STATUSES contains exactly the pipeline-side statuses."""
-        expected = {
-            TaskStatus.NAVIGATION_FAILED,
-            TaskStatus.AUTH_FAILED,
-            TaskStatus.UPLOAD_FAILED,
-            TaskStatus.RATE_LIMITED,
-            TaskStatus.UNKNOWN,
-        }
-        assert PIPELINE_STATUSES == expected
+        assert PIPELINE_STATUSES == _EXPECTED_PIPELINE_STATUSES
 
     def test_no_overlap_between_agent_and_pipeline(self):
         """Agent and pipeline status sets do not overlap."""
@@ -78,10 +89,7 @@ class TestTaskStatus:
 
     def test_all_members_in_one_set(self):
         """Every TaskStatus member belongs to either AGENT_STATUSES or PIPELINE_STATUSES."""
-        all_statuses = {s for s in TaskStatus}
-        categorized = AGENT_STATUSES | PIPELINE_STATUSES
-
-        assert all_statuses == categorized
+        assert frozenset(TaskStatus) == _CATEGORIZED_STATUSES
 
     def test_string_comparison(self):
         """TaskStatus members can be compared directly with plain strings."""
@@ -184,6 +192,73 @@ class TestConversationMessage:
 
         assert msg1 == msg2
 
+    @pytest.mark.parametrize(
+        "changes,equal",
+        [
+            ({}, True),
+            ({"role": "assistant"}, False),
+            ({"content": "bye"}, False),
+            ({"timestamp": datetime(2026, 1, 2)}, False),
+            ({"timestamp": None}, False),
+            ({"metadata": {"k": 1}}, False),
+        ],
+        ids=["same", "role", "content", "timestamp", "no-timestamp", "metadata"],
+    )
+    def test_equality_compares_every_field(self, changes, equal):
+        """Messages are equal only when every field matches."""
+        fields = {"role": "user", "content": "hi", "timestamp": datetime(2026, 1, 1), "metadata": {}}
+        msg = ConversationMessage(**fields)
+        other = ConversationMessage(**{**fields, **changes})
+
+        assert (msg == other) is equal
+        assert (msg != other) is not equal
+
+    def test_not_equal_to_other_types(self):
+        """Comparing with a non-message falls back to NotImplemented (so False)."""
+        msg = ConversationMessage(role="user", content="hi")
+
+        assert msg != ("user", "hi", None, {})
+        assert msg.__eq__(object()) is NotImplemented
+
+
+class ConcreteAgent(WebAgent):
+    """Minimal concrete WebAgent, defined once for the whole module."""
+
+    async def navigate_to_new_chat(self):
+        return True
+
+    async def get_state(self):
+        return AgentState.READY
+
+    async def upload_files(self, file_paths):
+        return True
+
+    async def submit_prompt(self, prompt, prompt_number=1):
+        return True
+
+    async def wait_for_response(self, prompt_number=1):
+        return "response"
+
+    async def download_all_artifacts(self, download_dir=None, timeout=30000):
+        return []
+
+    async def get_conversation_history(self):
+        return []
+
+    async def process_all_prompts(self, files_to_upload=None):
+        return True
+
+    async def ensure_features_enabled(self):
+        return True
+
+
+class _StoresOnlyAgent(WebAgent):
+    """WebAgent with the abstract-method check switched off, for __init__-only tests."""
+
+
+# Assigned after class creation: ABCMeta would overwrite a class-body value
+_StoresOnlyAgent.__abstractmethods__ = frozenset()
+
 
 class TestWebAgent:
     """Tests for the WebAgent abstract base class."""
@@ -191,7 +266,7 @@ class TestWebAgent:
     def test_cannot_instantiate_directly(self):
         """WebAgent cannot be instantiated because it has abstract methods."""
         with pytest.raises(TypeError, match="abstract method"):
-            WebAgent(page=MagicMock(), config={})
+            WebAgent(page=_SENTINEL_PAGE, config={})
 
     def test_subclass_must_implement_all_abstract_methods(self):
         """A subclass missing any abstract method cannot be instantiated."""
@@ -203,86 +278,57 @@ class TestWebAgent:
             # Missing all other abstract methods
 
         with pytest.raises(TypeError):
-            PartialAgent(page=MagicMock(), config={})
+            PartialAgent(page=_SENTINEL_PAGE, config={})
 
     def test_concrete_subclass_can_be_instantiated(self):
         """A fully concrete subclass can be instantiated."""
+        agent = ConcreteAgent(page=_SENTINEL_PAGE, config={"key": "value"})
 
-        class ConcreteAgent(WebAgent):
-            async def navigate_to_new_chat(self):
-                return True
-
-            async def get_state(self):
-                return AgentState.READY
-
-            async def upload_files(self, file_paths):
-                return True
-
-            async def submit_prompt(self, prompt, prompt_number=1):
-                return True
-
-            async def wait_for_response(self, prompt_number=1):
-                return "response"
-
-            async def download_all_artifacts(self, download_dir=None, timeout=30000):
-                return []
-
-            async def get_conversation_history(self):
-                return []
-
-            async def process_all_prompts(self, files_to_upload=None):
-                return True
-
-            async def ensure_features_enabled(self):
-                return True
-
-        mock_page = MagicMock()
-        agent = ConcreteAgent(page=mock_page, config={"key": "value"})
-
-        assert agent.page is mock_page
+        assert agent.page is _SENTINEL_PAGE
         assert agent.config == {"key": "value"}
         assert agent.messages == []
         assert agent.current_response_count == 0
 
     def test_init_stores_optional_params(self):
         """WebAgent.__init__ stores shutdown_event and completion_logger."""
+        agent = _StoresOnlyAgent(
+            page=_SENTINEL_PAGE,
+            config={},
+            shutdown_event=_SENTINEL_EVENT,
+            completion_logger=_SENTINEL_LOGGER,
+        )
 
-        class ConcreteAgent(WebAgent):
-            async def navigate_to_new_chat(self):
-                return True
+        assert agent.shutdown_event is _SENTINEL_EVENT
+        assert agent.completion_logger is _SENTINEL_LOGGER
 
-            async def get_state(self):
-                return AgentState.READY
 
-            async def upload_files(self, file_paths):
-                return True
+class TestSaveDownloads:
+    """Tests for WebAgent._save_downloads()."""
 
-            async def submit_prompt(self, prompt, prompt_number=1):
-                return True
+    async def test_saves_concurrently_and_skips_failures(self, tmp_path):
+        """Downloads are saved in parallel (capped), failures are logged and dropped."""
+        active = 0
+        peak = 0
 
-            async def wait_for_response(self, prompt_number=1):
-                return "response"
+        async def slow_save(path):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
 
-            async def download_all_artifacts(self, download_dir=None, timeout=30000):
-                return []
+        def make_download(name, fail=False):
+            download = MagicMock(suggested_filename=name)
+            download.save_as = AsyncMock(
+                side_effect=RuntimeError("boom") if fail else slow_save
+            )
+            return download
 
-            async def get_conversation_history(self):
-                return []
+        pending = [(make_download(f"{i}.xlsx"), tmp_path / f"{i}.xlsx") for i in range(6)]
+        pending.insert(2, (make_download("bad.xlsx", fail=True), tmp_path / "bad.xlsx"))
 
-            async def process_all_prompts(self, files_to_upload=None):
-                return True
-
-            async def ensure_features_enabled(self):
-                return True
-
-        mock_event = MagicMock()
-        mock_logger = MagicMock()
-        agent = ConcreteAgent(
-            page=MagicMock(),
-            config={},
-            shutdown_event=mock_event,
-            completion_logger=mock_logger,
-        )
+        agent = ConcreteAgent(page=_SENTINEL_PAGE, config={})
+        saved = await agent._save_downloads(pending)
 
-        assert agent.shutdown_event is mock_event
-        assert agent.completion_logger is mock_logger
+        assert saved == [str(tmp_path / f"{i}.xlsx") for i in range(6)]
+        assert 1 < peak <= WebAgent.MAX_CONCURRENT_SAVES
@@ -0,0 +1,460 @@
+"""Tests for autowebprompt.engine.batch module."""
+
+import json
+import sys
+import textwrap
+import threading
+import time
+from datetime import date
+
+import pytest
+import yaml
+
+from autowebprompt.engine import batch
+from autowebprompt.engine.batch import BatchRunner
+
+
+@pytest.fixture
+def task_statements(monkeypatch):
+    """BatchRunner's statements built fresh against the storage models."""
+    pytest.importorskip("sqlalchemy")
+    from autowebprompt.storage import models
+
+    monkeypatch.setattr(BatchRunner, "_statements", None)
+    return BatchRunner._get_statements(models.Task)
+
+
+@pytest.fixture
+def make_runner(tmp_path):
+    """Build a BatchRunner whose template is the given dict."""
+
+    def _make(template=None, **kwargs):
+        template_path = None
+        if template is not None:
+            template_path = tmp_path / "template.yaml"
+            template_path.write_text(yaml.safe_dump({"template": template}))
+        return BatchRunner(template_path=template_path, **kwargs)
+
+    return _make
+
+
+class TestTasksWithFiles:
+    """Tests for the "tasks_with_files" listing statement."""
+
+    def test_only_non_empty_arrays_are_listed(self, task_statements):
+        """JSON null, objects and SQL NULL are skipped instead of failing the query."""
+        from sqlalchemy import create_engine, null
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+
+        from autowebprompt.storage import models
+
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        models.Task.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        with factory() as session:
+            session.add_all([
+                models.Task(task_name="a_files", task_source="wsp",
+                            task_starting_files=["s3://b/a.xlsx"], deprecated=False),
+                models.Task(task_name="b_empty", task_source="wsp",
+                            task_starting_files=[], deprecated=False),
+                models.Task(task_name="c_json_null", task_source="wsp",
+                            task_starting_files=None, deprecated=False),
+                models.Task(task_name="d_sql_null", task_source="wsp",
+                            task_starting_files=null(), deprecated=False),
+                models.Task(task_name="e_object", task_source="wsp",
+                            task_starting_files={"file": "x"}, deprecated=False),
+                models.Task(task_name="f_deprecated", task_source="wsp",
+                            task_starting_files=["s3://b/f.xlsx"], deprecated=True),
+                models.Task(task_name="g_other_source", task_source="modeloff",
+                            task_starting_files=["s3://b/g.xlsx"], deprecated=False),
+            ])
+            session.commit()
+
+            rows = session.execute(
+                task_statements["tasks_with_files"], {"task_source": "wsp"}
+            ).all()
+
+        engine.dispose()
+        assert [row.task_name for row in rows] == ["a_files"]
+
+
+class TestConcurrencyMode:
+    """Tests for the concurrency run_all_tasks() actually uses."""
+
+    @pytest.fixture
+    def used_concurrency(self, monkeypatch):
+        used = []
+
+        def fake_run_tasks(self, tasks_to_run, rows, **kwargs):
+            used.append(kwargs["concurrency"])
+            return 0
+
+        monkeypatch.setattr(BatchRunner, "_run_tasks", fake_run_tasks)
+        return used
+
+    def test_cdp_mode_runs_one_task_at_a_time(self, make_runner, used_concurrency):
+        """The default Chrome browser attaches over CDP, so --concurrency is ignored."""
+        runner = make_runner({"claude_web": {"timeout": 60}})
+
+        runner.run_all_tasks([{"task_name": "a"}, {"task_name": "b"}], concurrency=3)
+
+        assert used_concurrency == [1]
+
+    def test_task_override_to_cdp_forces_one(self, make_runner, used_concurrency):
+        runner = make_runner({"claude_web": {"browser": {"type": "chromium"}}})
+        tasks = [
+            {"task_name": "a"},
+            {"task_name": "b", "claude_web": {"browser": {"type": "chrome"}}},
+        ]
+
+        runner.run_all_tasks(tasks, concurrency=3)
+
+        assert used_concurrency == [1]
+
+    def test_launched_browsers_run_concurrently(self, make_runner, used_concurrency):
+        runner = make_runner({"claude_web": {"browser": {"type": "chromium"}}})
+
+        runner.run_all_tasks([{"task_name": "a"}, {"task_name": "b"}], concurrency=3)
+
+        assert used_concurrency == [3]
+
+
+@pytest.fixture
+def db_runner(make_runner, monkeypatch):
+    """A fetch_from_db runner with no database and a recording prepare_task_files()."""
+    monkeypatch.setattr(BatchRunner, "_init_database", lambda self: None)
+    runner = make_runner(fetch_from_db=True)
+    runner.prepared = []
+
+    def prepare_task_files(task):
+        runner.prepared.append(task["task_name"])
+        return {"files": [f"/tmp/{task['task_name']}.xlsx"], "skip": False, "skip_reason": None}
+
+    runner.prepare_task_files = prepare_task_files
+    yield runner
+    runner._shutdown_prefetch()
+
+
+class TestPrefetch:
+    """Tests for background file preparation."""
+
+    TASKS = tuple({"task_name": name} for name in ("a", "b", "c", "d"))
+
+    def test_prefetched_result_is_handed_to_run_task(self, db_runner, monkeypatch):
+        configs = []
+        db_runner.persistent_engine = True
+        monkeypatch.setattr(
+            db_runner,
+            "_run_in_engine_daemon",
+            lambda task, config, task_name, timeout: configs.append(config) or True,
+        )
+
+        db_runner._prefetch_files(self.TASKS[:2], 0)
+        db_runner._prefetched[0].result()
+
+        assert db_runner.run_task(dict(self.TASKS[0]), 0) is True
+        assert db_runner.prepared.count("a") == 1
+        assert configs[0]["files_to_upload"] == ["/tmp/a.xlsx"]
+        assert 0 not in db_runner._prefetched
+
+    def test_taken_index_is_never_resubmitted(self, db_runner):
+        """A slower worker's lookahead must not prefetch a task that already started."""
+        db_runner._prefetch_files(self.TASKS[:3], 0)
+        db_runner._take_prefetched(0).result()
+
+        db_runner._prefetch_files(self.TASKS[:3], 0)
+        db_runner._prefetch_files(self.TASKS[1:4], 1)
+        for task_index in (1, 2, 3):
+            db_runner._prefetched[task_index].result()
+
+        assert sorted(db_runner.prepared) == ["a", "b", "c", "d"]
+        assert 0 not in db_runner._prefetched
+
+    def test_index_run_without_prefetch_is_claimed(self, db_runner):
+        assert db_runner._take_prefetched(2) is None
+
+        db_runner._prefetch_files(self.TASKS[:3], 0)
+
+        assert sorted(db_runner._prefetched) == [0, 1]
+
+    def test_shutdown_cancels_and_forgets(self, db_runner):
+        db_runner._prefetch_files(self.TASKS[:2], 0)
+
+        db_runner._shutdown_prefetch()
+
+        assert db_runner._prefetch_executor is None
+        assert db_runner._prefetched == {}
+        assert db_runner._prefetch_claimed == set()
+
+    def test_no_prefetch_without_database(self, make_runner):
+        runner = make_runner()
+
+        runner._prefetch_files(self.TASKS, 0)
+
+        assert runner._prefetch_executor is None
+        assert runner._prefetched == {}
+
+
+# Stand-in for engine/runner.py. In --daemon mode each stdin config line gets
+# a log line, the result marker split across two writes, then a trailing line.
+FAKE_ENGINE = textwrap.dedent(
+    """
+    import json
+    import sys
+    import time
+
+    out = sys.stdout.buffer
+    for line in sys.stdin.buffer:
+        config = json.loads(line)
+        name = config["task_name"].encode()
+        if config.get("hang"):
+            time.sleep(60)
+        if config.get("die"):
+            out.write(b"dying-" + name + b"\\n")
+            out.flush()
+            sys.exit(3)
+        marker = b"__AUTOWEBPROMPT_RESULT__ " + json.dumps({"success": config["ok"]}).encode()
+        out.write(b"before-" + name + b"\\n" + marker[:10])
+        out.flush()
+        time.sleep(0.05)
+        out.write(marker[10:] + b"\\nafter-" + name + b"\\n")
+        out.flush()
+    """
+)
+
+
+@pytest.fixture
+def daemon_runner(make_runner, tmp_path):
+    """A persistent-engine runner whose daemon is FAKE_ENGINE."""
+    engine_script = tmp_path / "fake_engine.py"
+    engine_script.write_text(FAKE_ENGINE)
+    runner = make_runner(
+        engine_script=engine_script, python_cmd=[sys.executable], persistent_engine=True
+    )
+    yield runner
+    runner.close_engine_daemons()
+
+
+class TestEngineDaemon:
+    """Tests for the --daemon protocol in _run_in_engine_daemon()."""
+
+    def run(self, runner, task, timeout=10):
+        return runner._run_in_engine_daemon(task, task, task["task_name"], timeout)
+
+    def test_result_marker_is_parsed_and_hidden(self, daemon_runner, capsysbinary):
+        assert self.run(daemon_runner, {"task_name": "a", "ok": True}) is True
+        assert self.run(daemon_runner, {"task_name": "b", "ok": False}) is False
+
+        out = capsysbinary.readouterr().out
+        assert b"__AUTOWEBPROMPT_RESULT__" not in out
+        assert out == b"before-a\nafter-a\nbefore-b\n"
+
+    def test_output_after_result_is_kept_for_next_task(self, daemon_runner, capsysbinary):
+        self.run(daemon_runner, {"task_name": "a", "ok": True})
+        (daemon,) = daemon_runner._engine_daemons
+
+        assert capsysbinary.readouterr().out == b"before-a\n"
+        assert daemon_runner._daemon_output[daemon] == b"after-a\n"
+
+    def test_one_daemon_serves_consecutive_tasks(self, daemon_runner):
+        self.run(daemon_runner, {"task_name": "a", "ok": True})
+        first = daemon_runner._get_engine_daemon()
+        self.run(daemon_runner, {"task_name": "b", "ok": True})
+
+        assert daemon_runner._engine_daemons == [first]
+
+    def test_daemon_exit_fails_task_and_restarts(self, daemon_runner, capsysbinary):
+        assert self.run(daemon_runner, {"task_name": "a", "die": True}) is False
+        assert daemon_runner._engine_daemons == []
+        assert capsysbinary.readouterr().out == b"dying-a\n"
+
+        assert self.run(daemon_runner, {"task_name": "b", "ok": True}) is True
+        assert len(daemon_runner._engine_daemons) == 1
+
+    def test_timeout_stops_daemon(self, daemon_runner):
+        assert self.run(daemon_runner, {"task_name": "a", "hang": True}, timeout=0.5) is False
+        assert daemon_runner._engine_daemons == []
+        assert daemon_runner._daemon_output == {}
+
+
+@pytest.fixture
+def fake_tasks_runner(make_runner, monkeypatch):
+    """A launched-browser runner whose run_task() sleeps task["sleep"] and returns task["ok"]."""
+    runner = make_runner({"claude_web": {"browser": {"type": "chromium"}}})
+    runner.started = []
+
+    def run_task(task, task_index, dry_run=False, keep_temp_configs=False, timeout=None):
+        runner.started.append(task["task_name"])
+        time.sleep(task.get("sleep", 0))
+        return task.get("ok", True)
+
+    monkeypatch.setattr(runner, "run_task", run_task)
+    return runner
+
+
+class TestConcurrentRun:
+    """Tests for run_all_tasks() with concurrency > 1."""
+
+    def test_rows_are_collected_in_index_order(self, fake_tasks_runner):
+        tasks = [
+            {"task_name": "a", "sleep": 0.15},
+            {"task_name": "b", "ok": False},
+            {"task_name": "c", "sleep": 0.05},
+            {"task_name": "d"},
+        ]
+
+        results = fake_tasks_runner.run_all_tasks(tasks, start_index=1, concurrency=3)
+
+        assert (results["total"], results["succeeded"], results["failed"]) == (3, 2, 1)
+        assert results["skipped"] == 0
+        assert [(t["task_name"], t["index"], t["success"]) for t in results["tasks"]] == [
+            ("b", 1, False),
+            ("c", 2, True),
+            ("d", 3, True),
+        ]
+        assert all(isinstance(t["duration_seconds"], float) for t in results["tasks"])
+
+    def test_tasks_run_in_parallel(self, fake_tasks_runner):
+        tasks = [{"task_name": name, "sleep": 0.2} for name in "abc"]
+
+        start = time.monotonic()
+        fake_tasks_runner.run_all_tasks(tasks, concurrency=3)
+
+        assert time.monotonic() - start < 0.5
+
+    def test_stop_on_failure_cancels_queued_tasks(self, fake_tasks_runner):
+        tasks = [{"task_name": "a", "ok": False}, {"task_name": "b", "sleep": 0.2}]
+        tasks += [{"task_name": f"q{i}", "sleep": 0.1} for i in range(8)]
+
+        results = fake_tasks_runner.run_all_tasks(
+            tasks, continue_on_failure=False, concurrency=2
+        )
+
+        ran = [t["task_name"] for t in results["tasks"]]
+        # The worker freed by "a" may pick up one more task before the cancel
+        assert set(ran) <= {"a", "b", "q0"}
+        assert set(fake_tasks_runner.started) == set(ran)
+        assert results["skipped"] == len(tasks) - len(ran)
+        assert results["failed"] == 1
+
+    def test_shutdown_short_circuits_execute_task(self, fake_tasks_runner, monkeypatch):
+        shutdown = threading.Event()
+        shutdown.set()
+        monkeypatch.setattr(batch, "_shutdown_requested", shutdown)
+
+        row = fake_tasks_runner._execute_task([{"task_name": "a"}], 0, 5, False, None)
+
+        assert row == ("a", 5, False, 0.0)
+        assert fake_tasks_runner.started == []
+
+    def test_shutdown_mid_run_skips_remaining_tasks(self, fake_tasks_runner, monkeypatch):
+        shutdown = threading.Event()
+        monkeypatch.setattr(batch, "_shutdown_requested", shutdown)
+        tasks = [{"task_name": "a", "sleep": 0.1}, {"task_name": "b", "sleep": 0.1}]
+        tasks += [{"task_name": f"q{i}"} for i in range(4)]
+        threading.Timer(0.05, shutdown.set).start()
+
+        results = fake_tasks_runner.run_all_tasks(tasks, concurrency=2)
+
+        assert sorted(fake_tasks_runner.started) == ["a", "b"]
+        assert [t["success"] for t in results["tasks"]] == [True, True] + [False] * 4
+
+
+DUMP_TEMPLATE = {
+    "claude_web": {"browser": {"type": "chromium"}, "timeout": 60},
+    "prompts": ["p1", "p2"],
+    "retries": 2,
+    "created": date(2026, 1, 2),
+}
+
+
+class TestDumpConfig:
+    """Tests for _dump_config()."""
+
+    def test_dump_matches_merged_config(self, make_runner):
+        runner = make_runner(DUMP_TEMPLATE)
+        task = {"task_name": "a", "claude_web": {"timeout": 90}, "files_to_upload": ["/x.xlsx"]}
+        config = runner._merge_config(task)
+
+        dumped = json.loads(runner._dump_config(task, config))
+
+        assert dumped == json.loads(json.dumps(config, default=str))
+        assert dumped["claude_web"] == {"browser": {"type": "chromium"}, "timeout": 90}
+        assert dumped["created"] == "2026-01-02"
+        assert dumped["agent_type"] == "claude_web"
+        assert list(dumped) == list(config)
+
+    def test_only_untouched_template_keys_use_fragments(self, make_runner):
+        runner = make_runner(DUMP_TEMPLATE)
+        runner._template_json["retries"] = "7"
+        runner._template_json["prompts"] = '["cached"]'
+        task = {"task_name": "a", "prompts": ["mine"]}
+
+        dumped = json.loads(runner._dump_config(task, runner._merge_config(task)))
+
+        assert dumped["retries"] == 7
+        assert dumped["prompts"] == ["mine"]
+
+    def test_agent_type_is_encoded_per_call(self, make_runner):
+        runner = make_runner({**DUMP_TEMPLATE, "agent_type": "claude_web"})
+        runner.provider = "chatgpt"
+        task = {"task_name": "a"}
+
+        dumped = json.loads(runner._dump_config(task, runner._merge_config(task)))
+
+        assert dumped["agent_type"] == "chatgpt_web"
+
+
+# Stand-in for a one-shot engine: loads --config like runner.main() does,
+# echoes it as JSON and exits 0 only if the config asks for success.
+FAKE_ONE_SHOT_ENGINE = textwrap.dedent(
+    """
+    import json
+    import sys
+
+    from autowebprompt.engine.runner import load_config
+
+    config = load_config(sys.argv[sys.argv.index("--config") + 1])
+    sys.stdout.write(json.dumps(config))
+    sys.exit(0 if config.get("ok") else 1)
+    """
+)
+
+
+class TestTempConfigRoundTrip:
+    """Tests for the per-task JSON config handed to a one-shot engine."""
+
+    @pytest.fixture
+    def one_shot_runner(self, make_runner, tmp_path, monkeypatch):
+        engine_script = tmp_path / "fake_one_shot_engine.py"
+        engine_script.write_text(FAKE_ONE_SHOT_ENGINE)
+        config_dir = tmp_path / "configs"
+        config_dir.mkdir()
+        monkeypatch.setattr(BatchRunner, "TEMP_CONFIG_DIR", str(config_dir))
+        runner = make_runner(
+            {"claude_web": {"browser": {"type": "chromium"}, "timeout": 60}, "ok": True},
+            engine_script=engine_script,
+            python_cmd=[sys.executable],
+        )
+        runner.config_dir = config_dir
+        return runner
+
+    def test_engine_loads_the_merged_config(self, one_shot_runner, capsysbinary):
+        task = {"task_name": "a b", "claude_web": {"timeout": 90}}
+
+        assert one_shot_runner.run_task(dict(task), 0, timeout=30) is True
+
+        loaded = json.loads(capsysbinary.readouterr().out)
+        assert loaded == one_shot_runner._merge_config(task)
+        assert list(one_shot_runner.config_dir.iterdir()) == []
+
+    def test_engine_exit_code_is_the_result(self, one_shot_runner, capsysbinary):
+        assert one_shot_runner.run_task({"task_name": "a", "ok": False}, 0, timeout=30) is False
+
+    def test_keep_temp_configs(self, one_shot_runner, capsysbinary):
+        one_shot_runner.run_task({"task_name": "a"}, 0, keep_temp_configs=True, timeout=30)
+
+        (path,) = one_shot_runner.config_dir.iterdir()
+        assert path.suffix == ".json"
+        assert json.loads(path.read_text())["task_name"] == "a"
@@ -1,6 +1,10 @@
 """Tests for autowebprompt.browser.manager module."""
 
+import functools
+import json
+import os
 import socket
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -19,82 +23,84 @@ from autowebprompt.browser.manager import (
 class TestFindChrome:
     """Tests for find_chrome()."""
 
-    def test_returns_first_existing_path(self):
-        """find_chrome returns the first path that exists on disk."""
-        # Mock os.path.exists to return True only for a specific path
-        fake_path = CHROME_PATHS[0]
+    @pytest.mark.parametrize("idx", [0, 1, None], ids=["first", "second", "none"])
+    def test_find_chrome(self, idx, monkeypatch):
+        """find_chrome returns the first candidate that exists on disk, else None."""
+        target = CHROME_PATHS[idx] if idx is not None else None
+        monkeypatch.setattr(os.path, "exists", lambda path: path == target)
 
-        def mock_exists(path):
-            return path == fake_path
-
-        with patch("os.path.exists", side_effect=mock_exists):
-            result = find_chrome()
-
-        assert result == fake_path
-
-    def test_returns_none_when_no_chrome_found(self):
-        """find_chrome returns None when no Chrome binary exists."""
-        with patch("os.path.exists", return_value=False):
-            result = find_chrome()
-
-        assert result is None
+        assert find_chrome() == target
 
     def test_prefers_canary_over_regular(self):
         """Chrome Canary paths come before regular Chrome in the search order."""
         # The first entry in CHROME_PATHS should be Chrome Canary (macOS)
         assert "Canary" in CHROME_PATHS[0]
 
-    def test_returns_second_match_if_first_missing(self):
-        """If the first candidate does not exist, the second is tried."""
-        def mock_exists(path):
-            return path == CHROME_PATHS[1]
 
-        with patch("os.path.exists", side_effect=mock_exists):
-            result = find_chrome()
+@functools.lru_cache(maxsize=None)
+def _socket_spec() -> tuple[str, ...]:
+    """Attribute names of socket.socket, introspected once per session."""
+    return tuple(dir(socket.socket))
 
-        assert result == CHROME_PATHS[1]
 
+def make_socket_mock() -> MagicMock:
+    """A socket.socket-shaped mock built from the cached attribute list."""
+    return MagicMock(spec_set=list(_socket_spec()))
 
-class TestIsCdpAvailable:
-    """Tests for is_cdp_available()."""
-
-    def test_returns_true_when_port_open(self):
-        """is_cdp_available returns True when a connection succeeds (connect_ex == 0)."""
-        mock_sock = MagicMock(spec=socket.socket)
-        mock_sock.connect_ex.return_value = 0
 
-        with patch("socket.socket", return_value=mock_sock):
-            result = is_cdp_available(9222)
-
-        assert result is True
-        mock_sock.connect_ex.assert_called_once_with(("127.0.0.1", 9222))
-        mock_sock.close.assert_called_once()
+@pytest.fixture(scope="module")
+def _raw_sock_mock():
+    """One socket mock for the module; mock_sock resets it before each test."""
+    return make_socket_mock()
 
-    def test_returns_false_when_port_closed(self):
-        """is_cdp_available returns False when a connection fails (connect_ex != 0)."""
-        mock_sock = MagicMock(spec=socket.socket)
-        mock_sock.connect_ex.return_value = 111  # Connection refused
 
-        with patch("socket.socket", return_value=mock_sock):
-            result = is_cdp_available(9222)
+@pytest.fixture
+def mock_sock(_raw_sock_mock, monkeypatch):
+    """A socket mock returned by every socket.socket() call in the test."""
+    _raw_sock_mock.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(socket, "socket", lambda *args, **kwargs: _raw_sock_mock)
+    return _raw_sock_mock
 
-        assert result is False
 
-    def test_uses_custom_port(self):
-        """is_cdp_available connects to the specified custom port."""
-        mock_sock = MagicMock(spec=socket.socket)
-        mock_sock.connect_ex.return_value = 0
-
-        with patch("socket.socket", return_value=mock_sock):
-            is_cdp_available(9333)
+class TestIsCdpAvailable:
+    """Tests for is_cdp_available()."""
 
-        mock_sock.connect_ex.assert_called_once_with(("127.0.0.1", 9333))
+    @pytest.mark.parametrize(
+        "connect_result,expected,port",
+        [
+            (0, True, 9222),
+            (111, False, 9222),  # Connection refused
+            (0, True, 9333),  # custom port
+        ],
+        ids=["open", "closed", "custom-port"],
+    )
+    def test_reports_port_state(self, mock_sock, connect_result, expected, port):
+        """is_cdp_available connects to the given port and reports whether it is open."""
+        mock_sock.connect_ex.return_value = connect_result
+
+        assert is_cdp_available(port) is expected
+        mock_sock.connect_ex.assert_called_once_with(("127.0.0.1", port))
+        mock_sock.close.assert_called_once()
 
     def test_default_port_is_9222(self):
         """The default port should be 9222."""
         assert DEFAULT_CDP_PORT == 9222
 
 
+FAKE_CHROME = "/usr/bin/fake-chrome"
+
+
+@pytest.fixture
+def popen_args(monkeypatch):
+    """Stub out Chrome discovery and launch; collects each Popen argument list."""
+    captured = []
+    monkeypatch.setattr("autowebprompt.browser.manager.find_chrome", lambda: FAKE_CHROME)
+    monkeypatch.setattr(
+        "subprocess.Popen", lambda args, *a, **kw: captured.append(args) or MagicMock()
+    )
+    return captured
+
+
 class TestLaunchChromeCdp:
     """Tests for launch_chrome_cdp()."""
 
@@ -105,50 +111,50 @@ class TestLaunchChromeCdp:
 
         assert result is None
 
-    def test_launches_subprocess_with_correct_args(self):
+    def test_launches_subprocess_with_correct_args(self, popen_args):
         """launch_chrome_cdp calls subprocess.Popen with the right arguments."""
-        fake_chrome = "/usr/bin/fake-chrome"
-
-        with (
-            patch("autowebprompt.browser.manager.find_chrome", return_value=fake_chrome),
-            patch("subprocess.Popen") as mock_popen,
-        ):
-            mock_popen.return_value = MagicMock()
-            result = launch_chrome_cdp(port=9333, profile_dir="/tmp/profile")
+        result = launch_chrome_cdp(port=9333, profile_dir="/tmp/profile")
 
         assert result is not None
-        args = mock_popen.call_args[0][0]
-        assert args[0] == fake_chrome
+        args = popen_args[0]
+        assert args[0] == FAKE_CHROME
         assert "--remote-debugging-port=9333" in args
         assert "--user-data-dir=/tmp/profile" in args
 
-    def test_headless_flag_appended(self):
+    def test_headless_flag_appended(self, popen_args):
         """When headless=True, --headless=new is appended to args."""
-        fake_chrome = "/usr/bin/fake-chrome"
+        launch_chrome_cdp(headless=True)
 
-        with (
-            patch("autowebprompt.browser.manager.find_chrome", return_value=fake_chrome),
-            patch("subprocess.Popen") as mock_popen,
-        ):
-            mock_popen.return_value = MagicMock()
-            launch_chrome_cdp(headless=True)
+        assert "--headless=new" in popen_args[0]
 
-        args = mock_popen.call_args[0][0]
-        assert "--headless=new" in args
-
-    def test_headless_flag_not_appended_by_default(self):
+    def test_headless_flag_not_appended_by_default(self, popen_args):
         """When headless=False (default), --headless=new is NOT in args."""
-        fake_chrome = "/usr/bin/fake-chrome"
+        launch_chrome_cdp(headless=False)
+
+        assert "--headless=new" not in popen_args[0]
+
 
-        with (
-            patch("autowebprompt.browser.manager.find_chrome", return_value=fake_chrome),
-            patch("subprocess.Popen") as mock_popen,
-        ):
-            mock_popen.return_value = MagicMock()
-            launch_chrome_cdp(headless=False)
+def _browser_config(provider_key: str, **browser) -> MappingProxyType:
+    """Read-only task config with a single provider browser section."""
+    return MappingProxyType({provider_key: {"browser": browser}})
 
-        args = mock_popen.call_args[0][0]
-        assert "--headless=new" not in args
+
+# BrowserManager only reads its config, so these are built once and shared
+EMPTY_CONFIG = MappingProxyType({})
+CLAUDE_FULL_CONFIG = _browser_config(
+    "claude_web",
+    type="chrome_canary",
+    headless=True,
+    timeout=60000,
+    cdp_port=9333,
+    profile_dir="/custom/profile",
+)
+CHATGPT_CDP_CONFIG = _browser_config("chatgpt_web", type="cdp", headless=False)
+BROWSER_TYPE_CONFIGS = {
+    browser_type: _browser_config("claude_web", type=browser_type)
+    for browser_type in ("chrome_canary", "chrome", "cdp", "firefox", "webkit", "Chrome_Canary")
+}
+BROWSER_TYPE_CONFIGS[None] = EMPTY_CONFIG  # defaults to chrome
 
 
 class TestBrowserManager:
@@ -156,7 +162,7 @@ class TestBrowserManager:
 
     def test_init_defaults(self):
         """BrowserManager with empty config uses sensible defaults."""
-        mgr = BrowserManager({})
+        mgr = BrowserManager(EMPTY_CONFIG)
 
         assert mgr.browser_type == "chrome"
         assert mgr.headless is False
@@ -166,19 +172,7 @@ class TestBrowserManager:
 
     def test_init_from_claude_web_config(self):
         """BrowserManager reads settings from claude_web.browser section."""
-        config = {
-            "claude_web": {
-                "browser": {
-                    "type": "chrome_canary",
-                    "headless": True,
-                    "timeout": 60000,
-                    "cdp_port": 9333,
-                    "profile_dir": "/custom/profile",
-                }
-            }
-        }
-
-        mgr = BrowserManager(config)
+        mgr = BrowserManager(CLAUDE_FULL_CONFIG)
 
         assert mgr.browser_type == "chrome_canary"
         assert mgr.headless is True
@@ -188,57 +182,31 @@ class TestBrowserManager:
 
     def test_init_from_chatgpt_web_config(self):
         """BrowserManager reads settings from chatgpt_web.browser section."""
-        config = {
-            "chatgpt_web": {
-                "browser": {
-                    "type": "cdp",
-                    "headless": False,
-                }
-            }
-        }
-
-        mgr = BrowserManager(config)
+        mgr = BrowserManager(CHATGPT_CDP_CONFIG)
 
         assert mgr.browser_type == "cdp"
         assert mgr.headless is False
 
-    def test_is_cdp_mode_chrome_canary(self):
-        """is_cdp_mode returns True for chrome_canary."""
-        config = {"claude_web": {"browser": {"type": "chrome_canary"}}}
-        mgr = BrowserManager(config)
-
-        assert mgr.is_cdp_mode() is True
-
-    def test_is_cdp_mode_chrome(self):
-        """is_cdp_mode returns True for plain 'chrome'."""
-        mgr = BrowserManager({})  # defaults to chrome
-        assert mgr.is_cdp_mode() is True
-
-    def test_is_cdp_mode_cdp(self):
-        """is_cdp_mode returns True for 'cdp' type."""
-        config = {"claude_web": {"browser": {"type": "cdp"}}}
-        mgr = BrowserManager(config)
-
-        assert mgr.is_cdp_mode() is True
-
-    def test_is_not_cdp_mode_firefox(self):
-        """is_cdp_mode returns False for firefox."""
-        config = {"claude_web": {"browser": {"type": "firefox"}}}
-        mgr = BrowserManager(config)
-
-        assert mgr.is_cdp_mode() is False
-
-    def test_is_not_cdp_mode_webkit(self):
-        """is_cdp_mode returns False for webkit."""
-        config = {"claude_web": {"browser": {"type": "webkit"}}}
-        mgr = BrowserManager(config)
-
-        assert mgr.is_cdp_mode() is False
+    @pytest.mark.parametrize(
+        "browser_type,expected",
+        [
+            ("chrome_canary", True),
+            (None, True),  # defaults to chrome
+            ("chrome", True),
+            ("cdp", True),
+            ("firefox", False),
+            ("webkit", False),
+        ],
+    )
+    def test_is_cdp_mode(self, browser_type, expected):
+        """is_cdp_mode is True for the Chrome/CDP browser types only."""
+        mgr = BrowserManager(BROWSER_TYPE_CONFIGS[browser_type])
+
+        assert mgr.is_cdp_mode() is expected
 
     def test_get_auth_state_path(self):
         """_get_auth_state_path returns profile_dir / auth_state.json."""
-        config = {"claude_web": {"browser": {"profile_dir": "/my/profile"}}}
-        mgr = BrowserManager(config)
+        mgr = BrowserManager(_browser_config("claude_web", profile_dir="/my/profile"))
 
         path = mgr._get_auth_state_path()
 
@@ -246,7 +214,28 @@ class TestBrowserManager:
 
     def test_browser_type_is_lowercased(self):
         """Browser type string is lowercased during init."""
-        config = {"claude_web": {"browser": {"type": "Chrome_Canary"}}}
-        mgr = BrowserManager(config)
+        mgr = BrowserManager(BROWSER_TYPE_CONFIGS["Chrome_Canary"])
 
         assert mgr.browser_type == "chrome_canary"
+
+    def test_auth_state_is_parsed_once_until_file_changes(self, tmp_path):
+        """_load_auth_state reuses the parsed file until its mtime changes."""
+        mgr = BrowserManager(_browser_config("claude_web", profile_dir=str(tmp_path)))
+        auth_path = mgr._get_auth_state_path()
+        auth_path.write_text('{"cookies": [1]}')
+
+        with patch("autowebprompt.browser.manager.json.load", wraps=json.load) as load:
+            assert mgr._load_auth_state(auth_path) == {"cookies": [1]}
+            assert mgr._load_auth_state(auth_path) == {"cookies": [1]}
+            assert load.call_count == 1
+
+            auth_path.write_text('{"cookies": [2]}')
+            os.utime(auth_path, ns=(0, auth_path.stat().st_mtime_ns + 1_000_000))
+            assert mgr._load_auth_state(auth_path) == {"cookies": [2]}
+            assert load.call_count == 2
+
+    def test_missing_auth_state_returns_none(self, tmp_path):
+        """_load_auth_state returns None when no auth state has been saved."""
+        mgr = BrowserManager(_browser_config("claude_web", profile_dir=str(tmp_path)))
+
+        assert mgr._load_auth_state(mgr._get_auth_state_path()) is None
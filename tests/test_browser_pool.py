@@ -0,0 +1,104 @@
+"""Tests for autowebprompt.browser.pool module."""
+
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import pytest
+
+from autowebprompt.browser.pool import BrowserPool
+
+
+CLASSIC_CONFIG = {"claude_web": {"browser": {"type": "chromium"}}}
+
+
+def _fake_playwright():
+    """Build a fake async_playwright() whose chromium.launch() returns a fresh browser."""
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    browser.close = AsyncMock()
+    browser.new_context = AsyncMock(side_effect=lambda **kwargs: MagicMock(close=AsyncMock()))
+
+    playwright = MagicMock()
+    playwright.chromium.launch = AsyncMock(return_value=browser)
+
+    playwright_ctx = MagicMock()
+    playwright_ctx.__aenter__ = AsyncMock(return_value=playwright)
+    playwright_ctx.__aexit__ = AsyncMock(return_value=None)
+    return playwright_ctx, playwright, browser
+
+
+@pytest.fixture
+def fake_playwright(tmp_path):
+    playwright_ctx, playwright, browser = _fake_playwright()
+    with (
+        patch("autowebprompt.browser.pool.async_playwright", return_value=playwright_ctx),
+        patch(
+            "autowebprompt.browser.manager.BrowserManager._get_auth_state_path",
+            return_value=tmp_path / "auth_state.json",
+        ),
+    ):
+        yield playwright_ctx, playwright, browser
+
+
+class TestBrowserPool:
+    """Tests for BrowserPool."""
+
+    async def test_acquire_launches_browser_once(self, fake_playwright):
+        """Repeated acquire() calls for a provider share one launched browser."""
+        playwright_ctx, playwright, browser = fake_playwright
+
+        _, first = await BrowserPool.acquire("claude_web", CLASSIC_CONFIG)
+        await BrowserPool.release(first)
+        _, second = await BrowserPool.acquire("claude_web", CLASSIC_CONFIG)
+        await BrowserPool.release(second)
+        await BrowserPool.close_all()
+
+        playwright.chromium.launch.assert_awaited_once()
+        assert browser.new_context.await_count == 2
+        first.close.assert_awaited_once()
+        second.close.assert_awaited_once()
+
+    async def test_close_all_closes_browser_and_driver(self, fake_playwright):
+        """close_all() closes the pooled browser and exits Playwright."""
+        playwright_ctx, _, browser = fake_playwright
+
+        await BrowserPool.acquire("claude_web", CLASSIC_CONFIG)
+        await BrowserPool.close_all()
+
+        browser.close.assert_awaited_once()
+        playwright_ctx.__aexit__.assert_awaited_once()
+
+    async def test_disconnected_browser_is_relaunched(self, fake_playwright):
+        """A browser that dropped its connection is replaced on the next acquire()."""
+        _, playwright, browser = fake_playwright
+
+        await BrowserPool.acquire("claude_web", CLASSIC_CONFIG)
+        browser.is_connected.return_value = False
+        await BrowserPool.acquire("claude_web", CLASSIC_CONFIG)
+        await BrowserPool.close_all()
+
+        assert playwright.chromium.launch.await_count == 2
+
+    async def test_shared_browser_is_not_closed(self, fake_playwright):
+        """A caller-owned browser is borrowed from but left open by close_all()."""
+        playwright_ctx, playwright, browser = fake_playwright
+
+        _, context = await BrowserPool.acquire("claude_web", CLASSIC_CONFIG, browser=browser)
+        await BrowserPool.release(context)
+        await BrowserPool.close_all()
+
+        playwright_ctx.__aenter__.assert_not_awaited()
+        playwright.chromium.launch.assert_not_awaited()
+        browser.close.assert_not_awaited()
+        context.close.assert_awaited_once()
+
+    async def test_shared_playwright_driver_is_not_exited(self, fake_playwright):
+        """With a caller-owned Playwright, the pool launches on it and never exits it."""
+        playwright_ctx, playwright, browser = fake_playwright
+
+        await BrowserPool.acquire("claude_web", CLASSIC_CONFIG, playwright=playwright)
+        await BrowserPool.close_all()
+
+        playwright.chromium.launch.assert_awaited_once()
+        playwright_ctx.__aenter__.assert_not_awaited()
+        playwright_ctx.__aexit__.assert_not_awaited()
+        browser.close.assert_awaited_once()
@@ -1,99 +1,99 @@
 """Tests for autowebprompt.cli.main module."""
 
-import pytest
-
-click = pytest.importorskip("click", reason="click is required for CLI tests")
-
+import re
 from unittest.mock import patch, MagicMock
 
+import pytest
 from click.testing import CliRunner
 
 from autowebprompt.cli.main import cli
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def runner():
-    """Create a Click test runner."""
+    """Create a Click test runner (invoke() keeps no state, so one is shared)."""
     return CliRunner()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _warm_click():
+    """Build the cli context once so lazy command setup is paid before the first test."""
+    cli.make_context("cli", ["--help"], resilient_parsing=True)
+
+
 class TestCliGroup:
     """Tests for the top-level CLI group."""
 
     def test_cli_help(self, runner):
         """The CLI group prints help text without errors."""
-        result = runner.invoke(cli, ["--help"])
+        result = runner.invoke(cli, ["--help"], catch_exceptions=False)
 
         assert result.exit_code == 0
         assert "autowebprompt" in result.output
 
     def test_cli_version(self, runner):
         """--version flag prints the version string."""
-        result = runner.invoke(cli, ["--version"])
+        result = runner.invoke(cli, ["--version"], catch_exceptions=False)
 
         assert result.exit_code == 0
         assert "0.1.0" in result.output
 
 
-class TestCheckCommand:
-    """Tests for the 'check' command."""
+# Both lines of a successful check, matched in one pass over the output
+_READY_RE = re.compile(r"Chrome found.*Ready for automation", re.S)
 
-    def test_check_chrome_found_and_cdp_running(self, runner):
-        """check succeeds when Chrome is found and CDP is available."""
-        with (
-            patch(
-                "autowebprompt.browser.manager.find_chrome",
-                return_value="/usr/bin/chrome",
-            ),
-            patch("autowebprompt.browser.manager.is_cdp_available", return_value=True),
-        ):
-            result = runner.invoke(cli, ["check"])
 
-        assert result.exit_code == 0
-        assert "Chrome found" in result.output
-        assert "Ready for automation" in result.output
+@pytest.fixture
+def browser_status(monkeypatch):
+    """
+    Stub find_chrome and is_cdp_available for the 'check' command.
 
-    def test_check_chrome_not_found(self, runner):
-        """check fails with exit code 1 when Chrome is not installed."""
-        with patch(
-            "autowebprompt.browser.manager.find_chrome",
-            return_value=None,
-        ):
-            result = runner.invoke(cli, ["check"])
+    Returns (set_status, cdp_ports): set_status(chrome_path, cdp_running)
+    installs the stubs; cdp_ports records each port that was probed.
+    """
+    cdp_ports = []
 
-        assert result.exit_code == 1
-        assert "Chrome not found" in result.output
-
-    def test_check_cdp_not_running(self, runner):
-        """check fails when Chrome is found but CDP is not running."""
-        with (
-            patch(
-                "autowebprompt.browser.manager.find_chrome",
-                return_value="/usr/bin/chrome",
-            ),
-            patch("autowebprompt.browser.manager.is_cdp_available", return_value=False),
-        ):
-            result = runner.invoke(cli, ["check"])
+    def set_status(chrome_path, cdp_running):
+        monkeypatch.setattr("autowebprompt.browser.manager.find_chrome", lambda: chrome_path)
+        monkeypatch.setattr(
+            "autowebprompt.browser.manager.is_cdp_available",
+            lambda port: cdp_ports.append(port) or cdp_running,
+        )
 
-        assert result.exit_code == 1
-        assert "NOT running" in result.output
+    return set_status, cdp_ports
+
+
+class TestCheckCommand:
+    """Tests for the 'check' command."""
 
-    def test_check_custom_port(self, runner):
+    @pytest.mark.parametrize(
+        "chrome_path,cdp_running,exit_code,expected_output",
+        [
+            ("/usr/bin/chrome", True, 0, _READY_RE),
+            (None, False, 1, re.compile("Chrome not found")),
+            ("/usr/bin/chrome", False, 1, re.compile("NOT running")),
+        ],
+        ids=["ready", "chrome-not-found", "cdp-not-running"],
+    )
+    def test_check(self, runner, browser_status, chrome_path, cdp_running, exit_code, expected_output):
+        """check reports Chrome and CDP status and exits non-zero when not ready."""
+        set_status, _ = browser_status
+        set_status(chrome_path, cdp_running)
+
+        result = runner.invoke(cli, ["check"])
+
+        assert result.exit_code == exit_code
+        assert expected_output.search(result.output)
+
+    def test_check_custom_port(self, runner, browser_status):
         """check passes --port to is_cdp_available."""
-        with (
-            patch(
-                "autowebprompt.browser.manager.find_chrome",
-                return_value="/usr/bin/chrome",
-            ),
-            patch(
-                "autowebprompt.browser.manager.is_cdp_available",
-                return_value=True,
-            ) as mock_cdp,
-        ):
-            result = runner.invoke(cli, ["check", "--port", "9333"])
+        set_status, cdp_ports = browser_status
+        set_status("/usr/bin/chrome", True)
+
+        result = runner.invoke(cli, ["check", "--port", "9333"])
 
         assert result.exit_code == 0
-        mock_cdp.assert_called_once_with(9333)
+        assert cdp_ports == [9333]
 
 
 class TestTemplatesCommand:
@@ -101,14 +101,14 @@ class TestTemplatesCommand:
 
     def test_templates_displays_info(self, runner):
         """templates command outputs setup instructions."""
-        result = runner.invoke(cli, ["templates"])
+        result = runner.invoke(cli, ["templates"], catch_exceptions=False)
 
         assert result.exit_code == 0
         assert "template" in result.output.lower()
 
     def test_templates_mentions_setup(self, runner):
         """templates command tells the user about 'autowebprompt setup'."""
-        result = runner.invoke(cli, ["templates"])
+        result = runner.invoke(cli, ["templates"], catch_exceptions=False)
 
         assert "autowebprompt setup" in result.output
 
@@ -134,22 +134,41 @@ class TestRunCommand:
         assert result.exit_code != 0
         assert "provider" in result.output.lower() or "Missing" in result.output
 
-    def test_run_requires_tasks(self, runner, tmp_path):
+    def test_run_requires_tasks(self, runner, monkeypatch):
         """run command prints error when --tasks is not provided."""
-        with patch("autowebprompt.engine.batch.BatchRunner") as MockRunner:
-            mock_instance = MagicMock()
-            MockRunner.return_value = mock_instance
+        monkeypatch.setattr("autowebprompt.engine.batch.BatchRunner", MagicMock())
 
-            result = runner.invoke(cli, ["run", "--provider", "claude"])
+        result = runner.invoke(cli, ["run", "--provider", "claude"])
 
         assert result.exit_code == 1
 
     def test_run_help(self, runner):
         """run --help shows all expected options."""
-        result = runner.invoke(cli, ["run", "--help"])
+        result = runner.invoke(cli, ["run", "--help"], catch_exceptions=False)
 
         assert result.exit_code == 0
         assert "--provider" in result.output
         assert "--tasks" in result.output
         assert "--dry-run" in result.output
         assert "--fetch-from-db" in result.output
+
+    def test_run_passes_concurrency(self, runner, tmp_path, monkeypatch):
+        """run --concurrency is forwarded to run_all_tasks()."""
+        tasks_file = tmp_path / "tasks.yaml"
+        tasks_file.write_text("tasks:\n  - task_a\n")
+
+        mock_instance = MagicMock()
+        mock_instance.run_all_tasks.return_value = {
+            "total": 1, "succeeded": 1, "failed": 0, "skipped": 0, "tasks": [],
+        }
+        monkeypatch.setattr(
+            "autowebprompt.engine.batch.BatchRunner", MagicMock(return_value=mock_instance)
+        )
+
+        result = runner.invoke(
+            cli,
+            ["run", "--provider", "claude", "--tasks", str(tasks_file), "--concurrency", "3"],
+        )
+
+        assert result.exit_code == 0
+        assert mock_instance.run_all_tasks.call_args.kwargs["concurrency"] == 3
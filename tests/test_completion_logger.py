@@ -0,0 +1,245 @@
+"""Tests for autowebprompt.engine.completion_logger module."""
+
+import gc
+import json
+import shutil
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from autowebprompt.agents.base import TaskStatus
+from autowebprompt.engine.completion_logger import CompletionLogger
+
+
+def _read_snapshot(cl: CompletionLogger) -> dict:
+    return json.loads(cl.session_file.read_text())
+
+
+def _read_events(cl: CompletionLogger) -> list[dict]:
+    return [json.loads(line) for line in cl.events_file.read_text().splitlines()]
+
+
+@pytest.fixture
+def make_logger(tmp_path):
+    """Build CompletionLoggers in tmp_path and close any the test leaves open."""
+    loggers = []
+
+    def _make(**kwargs):
+        kwargs.setdefault("task_identifier", "task-a")
+        cl = CompletionLogger(tmp_path / "logs", agent_name="claude_web", **kwargs)
+        loggers.append(cl)
+        return cl
+
+    yield _make
+    for cl in loggers:
+        cl.close()
+
+
+def _run_task(cl: CompletionLogger, name: str, prompts=("p1",), status=TaskStatus.SUCCESS):
+    cl.start_task(name)
+    for text in prompts:
+        cl.start_prompt(text)
+        cl.end_prompt(success=True, response_length=10)
+    cl.end_task(status)
+
+
+class TestLogDir:
+    """Tests for log directory handling."""
+
+    def test_recreates_deleted_log_dir(self, make_logger):
+        first = make_logger()
+        first.close()
+        shutil.rmtree(first.log_dir)
+
+        cl = make_logger()
+        _run_task(cl, "task-a")
+        cl.close()
+
+        assert [t["task_name"] for t in _read_snapshot(cl)["tasks"]] == ["task-a"]
+        assert _read_events(cl)[-1]["type"] == "end_task"
+
+
+class TestEventLog:
+    """Tests for the JSONL event log."""
+
+    def test_events_are_appended_in_order(self, make_logger):
+        cl = make_logger()
+        _run_task(cl, "task-a", prompts=("p1", "p2"))
+        cl.close()
+
+        events = _read_events(cl)
+
+        assert [e["type"] for e in events] == [
+            "start_task",
+            "start_prompt",
+            "end_prompt",
+            "start_prompt",
+            "end_prompt",
+            "end_task",
+        ]
+        assert events[-1]["data"]["task_name"] == "task-a"
+        assert [p["prompt_text"] for p in events[-1]["data"]["prompts"]] == ["p1", "p2"]
+
+
+class TestSnapshot:
+    """Tests for the session JSON snapshot."""
+
+    def test_snapshot_after_end_task(self, make_logger):
+        cl = make_logger(task_source="fmwc")
+        _run_task(cl, "task-a", status=TaskStatus.TIMEOUT)
+        assert cl.flush(timeout=5)
+
+        data = _read_snapshot(cl)
+
+        assert data["agent_name"] == "claude_web"
+        assert data["task_source"] == "fmwc"
+        (task,) = data["tasks"]
+        assert task["task_name"] == "task-a"
+        assert task["task_status"] == "timeout"
+        assert task["agent_failed"] is True
+        assert task["agent_failed_reason"] == "timeout"
+        assert task["prompts"][0]["prompt_text"] == "p1"
+        assert task["prompts"][0]["response_length"] == 10
+
+    def test_record_key_order(self, make_logger):
+        """Task and prompt records keep the key order the log has always used."""
+        cl = make_logger()
+        _run_task(cl, "task-a")
+        cl.close()
+
+        (task,) = _read_snapshot(cl)["tasks"]
+
+        assert list(task) == [
+            "task_name",
+            "attempt_number",
+            "start_time",
+            "end_time",
+            "task_status",
+            "agent_failed",
+            "agent_failed_reason",
+            "deprecated",
+            "deprecated_reason",
+            "duration_seconds",
+            "prompts",
+        ]
+        assert list(task["prompts"][0]) == [
+            "prompt_text",
+            "start_time",
+            "end_time",
+            "success",
+            "duration_seconds",
+            "response_length",
+        ]
+
+    def test_snapshot_after_close(self, make_logger):
+        cl = make_logger()
+        _run_task(cl, "task-a")
+        _run_task(cl, "task-b")
+        cl.close()
+
+        data = _read_snapshot(cl)
+
+        assert [t["task_name"] for t in data["tasks"]] == ["task-a", "task-b"]
+        assert all(t["task_status"] == "success" for t in data["tasks"])
+        assert not cl.session_file.with_suffix(".json.tmp").exists()
+
+    def test_flush_returns_true_once_written(self, make_logger):
+        cl = make_logger()
+        cl.start_task("task-a")
+
+        assert cl.flush(timeout=5) is True
+        assert _read_snapshot(cl)["tasks"][0]["task_name"] == "task-a"
+
+    def test_max_retained_tasks_and_prompts(self, make_logger):
+        """The snapshot keeps only the newest records; the event log keeps all."""
+        cl = make_logger(max_retained_tasks=2, max_retained_prompts=1)
+        for name in ("task-a", "task-b", "task-c"):
+            _run_task(cl, name, prompts=("p1", "p2"))
+        cl.close()
+
+        tasks = _read_snapshot(cl)["tasks"]
+
+        assert [t["task_name"] for t in tasks] == ["task-b", "task-c"]
+        assert [p["prompt_text"] for p in tasks[-1]["prompts"]] == ["p2"]
+        ended = [e["data"]["task_name"] for e in _read_events(cl) if e["type"] == "end_task"]
+        assert ended == ["task-a", "task-b", "task-c"]
+
+    def test_defer_snapshots_writes_only_on_close(self, make_logger):
+        cl = make_logger(defer_snapshots=True)
+        _run_task(cl, "task-a")
+        assert cl.flush(timeout=5)
+
+        assert _read_snapshot(cl)["tasks"] == []
+        assert [e["type"] for e in _read_events(cl)][-1] == "end_task"
+
+        cl.close()
+
+        assert [t["task_name"] for t in _read_snapshot(cl)["tasks"]] == ["task-a"]
+
+
+class TestSave:
+    """Tests for save()."""
+
+    def test_save_writes_pretty_json_with_in_progress_task(self, make_logger, tmp_path):
+        cl = make_logger()
+        _run_task(cl, "task-a")
+        cl.start_task("task-b", attempt_number=2)
+
+        dest = cl.save(tmp_path / "out")
+        text = dest.read_text()
+        data = json.loads(text)
+
+        assert dest == tmp_path / "out" / cl.session_file.name
+        assert '\n  "tasks": [' in text
+        assert [t["task_name"] for t in data["tasks"]] == ["task-a", "task-b"]
+        assert data["tasks"][-1]["attempt_number"] == 2
+        assert data["tasks"][-1]["end_time"] is None
+        assert cl.current_task.task_name == "task-b"
+
+
+class TestClose:
+    """Tests for close()."""
+
+    def test_close_is_idempotent(self, make_logger):
+        cl = make_logger()
+        _run_task(cl, "task-a")
+
+        cl.close()
+        snapshot = cl.session_file.read_bytes()
+        cl.close()
+
+        assert cl.session_file.read_bytes() == snapshot
+        assert not cl._writer.thread.is_alive()
+
+    def test_dropped_logger_is_finalized(self, tmp_path):
+        """An unclosed logger that is garbage collected still writes its events."""
+        cl = CompletionLogger(tmp_path, "task-a")
+        _run_task(cl, "task-a")
+        writer, events_file = cl._writer, cl.events_file
+
+        del cl
+        gc.collect()
+
+        assert not writer.thread.is_alive()
+        assert writer.events is None
+        assert json.loads(events_file.read_text().splitlines()[-1])["type"] == "end_task"
+
+    def test_open_logger_is_flushed_at_exit(self, tmp_path):
+        script = textwrap.dedent(
+            f"""
+            from autowebprompt.agents.base import TaskStatus
+            from autowebprompt.engine.completion_logger import CompletionLogger
+
+            cl = CompletionLogger({str(tmp_path)!r}, "task-a")
+            cl.start_task("task-a")
+            cl.end_task(TaskStatus.SUCCESS)
+            """
+        )
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=30)
+
+        (session_file,) = tmp_path.glob("*.json")
+        (events_file,) = tmp_path.glob("*.jsonl")
+        assert json.loads(session_file.read_text())["tasks"][0]["task_name"] == "task-a"
+        assert json.loads(events_file.read_text().splitlines()[-1])["type"] == "end_task"
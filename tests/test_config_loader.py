@@ -1,42 +1,48 @@
 """Tests for autowebprompt.config.loader module."""
 
+import io
+from datetime import date
+from unittest.mock import patch
+
 import pytest
 import yaml
 
+from autowebprompt.config import loader
 from autowebprompt.config.loader import load_config, merge_task_config, get_provider_config
 
 
-class TestLoadConfig:
-    """Tests for load_config()."""
-
-    def test_load_simple_yaml(self, tmp_path):
-        """load_config returns the dict from a plain YAML file."""
-        config_file = tmp_path / "config.yaml"
-        config_file.write_text(yaml.dump({"agent_type": "claude_web", "timeout": 300}))
-
-        result = load_config(config_file)
-
-        assert result == {"agent_type": "claude_web", "timeout": 300}
-
-    def test_load_unwraps_template_key(self, tmp_path):
-        """When YAML has a top-level 'template' key, load_config unwraps it."""
-        config_file = tmp_path / "template.yaml"
-        data = {"template": {"agent_type": "chatgpt_web", "max_sec": 5400}}
-        config_file.write_text(yaml.dump(data))
-
-        result = load_config(config_file)
-
-        assert result == {"agent_type": "chatgpt_web", "max_sec": 5400}
+def _yaml_stream(data) -> io.StringIO:
+    """An in-memory YAML document, so parsing tests skip the filesystem."""
+    return io.StringIO(yaml.dump(data))
 
-    def test_load_preserves_non_template_keys(self, tmp_path):
-        """When no 'template' key exists, the whole dict is returned as-is."""
-        config_file = tmp_path / "flat.yaml"
-        data = {"provider": "claude", "tasks": ["a", "b"]}
-        config_file.write_text(yaml.dump(data))
 
-        result = load_config(config_file)
+class TestLoadConfig:
+    """Tests for load_config()."""
 
-        assert result == data
+    @pytest.mark.parametrize(
+        "payload,expected",
+        [
+            # A plain YAML document is returned as its dict
+            (
+                {"agent_type": "claude_web", "timeout": 300},
+                {"agent_type": "claude_web", "timeout": 300},
+            ),
+            # A top-level 'template' key is unwrapped
+            (
+                {"template": {"agent_type": "chatgpt_web", "max_sec": 5400}},
+                {"agent_type": "chatgpt_web", "max_sec": 5400},
+            ),
+            # Without a 'template' key the whole dict is returned as-is
+            (
+                {"provider": "claude", "tasks": ["a", "b"]},
+                {"provider": "claude", "tasks": ["a", "b"]},
+            ),
+        ],
+        ids=["simple", "unwraps_template", "preserves_non_template"],
+    )
+    def test_load_variants(self, payload, expected):
+        """load_config returns the parsed document, unwrapping 'template'."""
+        assert load_config(_yaml_stream(payload)) == expected
 
     def test_load_file_not_found_raises(self, tmp_path):
         """load_config raises FileNotFoundError for missing files."""
@@ -52,15 +58,46 @@ class TestLoadConfig:
 
         assert result == {"key": "value"}
 
-    def test_load_empty_yaml_returns_empty_dict(self, tmp_path):
-        """An empty YAML file returns an empty dict."""
-        config_file = tmp_path / "empty.yaml"
-        config_file.write_text("")
-
-        result = load_config(config_file)
+    def test_load_empty_yaml_returns_empty_dict(self):
+        """An empty YAML document returns an empty dict."""
+        result = load_config(io.StringIO(""))
         assert result == {}
 
-    def test_load_nested_config(self, tmp_path):
+    def test_cached_template_file_returns_fresh_copies(self, tmp_path):
+        """The unwrapped template of a cached file is copied for every caller."""
+        config_file = tmp_path / "template.yaml"
+        config_file.write_text(
+            "template:\n  claude_web:\n    retries: 1\nnotes: [a, b]\n"
+        )
+
+        first = load_config(config_file)
+        first["claude_web"]["retries"] = 99
+
+        assert load_config(config_file) == {"claude_web": {"retries": 1}}
+
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        """Repeat loads of an unchanged file reuse the parse but return fresh dicts."""
+        config_file = tmp_path / "cached.yaml"
+        config_file.write_text("agent_type: claude_web\nclaude_web:\n  retries: 1\n")
+
+        with patch("autowebprompt.config.loader.yaml.load", wraps=yaml.load) as parse:
+            first = load_config(config_file)
+            first["claude_web"]["retries"] = 99
+            second = load_config(str(config_file))
+
+            assert parse.call_count == 1
+            assert second["claude_web"]["retries"] == 1
+
+            config_file.write_text("agent_type: chatgpt_web\n")
+            assert load_config(config_file) == {"agent_type": "chatgpt_web"}
+            assert parse.call_count == 2
+
+    @pytest.mark.skipif(not hasattr(yaml, "CSafeLoader"), reason="PyYAML built without libyaml")
+    def test_uses_libyaml_loader_when_available(self):
+        """The C-accelerated safe loader is picked when PyYAML provides it."""
+        assert loader._LOADER is yaml.CSafeLoader
+
+    def test_load_nested_config(self):
         """load_config handles deeply nested YAML structures."""
         data = {
             "template": {
@@ -71,10 +108,7 @@ class TestLoadConfig:
                 },
             }
         }
-        config_file = tmp_path / "nested.yaml"
-        config_file.write_text(yaml.dump(data))
-
-        result = load_config(config_file)
+        result = load_config(_yaml_stream(data))
 
         assert result["agent_type"] == "claude_web"
         assert result["claude_web"]["browser"]["type"] == "chrome_canary"
@@ -132,6 +166,41 @@ class TestMergeTaskConfig:
 
         assert "headless" not in template["browser"]
 
+    def test_result_shares_no_containers_with_template(self):
+        """Nested dicts and lists in the result are copies, not the template's objects."""
+        template = {"browser": {"args": ["--a"]}, "prompts": ["p1"], "retry": {"max": 3}}
+        task = {"browser": {"headless": True}}
+
+        result = merge_task_config(task, template)
+        result["browser"]["args"].append("--b")
+        result["prompts"].append("p2")
+        result["retry"]["max"] = 5
+
+        assert template == {"browser": {"args": ["--a"]}, "prompts": ["p1"], "retry": {"max": 3}}
+
+    def test_task_values_are_used_as_given(self):
+        """Task values land in the result as-is; only template values are copied."""
+        template = {"prompts": ["p1"], "browser": {"args": ["--a"], "type": "chrome"}}
+        task = {"prompts": ["p2"], "browser": {"args": ["--b"]}}
+
+        result = merge_task_config(task, template)
+
+        assert result["prompts"] is task["prompts"]
+        assert result["browser"]["args"] is task["browser"]["args"]
+        assert result == {"prompts": ["p2"], "browser": {"args": ["--b"], "type": "chrome"}}
+
+    def test_fast_copy_handles_yaml_types(self):
+        """_fast_copy only copies dicts/lists; configs hold nothing else mutable."""
+        original = yaml.safe_load("a: [1, {b: 2}]\nc: 2026-01-01\nd: null\ne: true\n")
+        # Configs are YAML-safe: containers are dicts/lists, everything else is immutable
+        assert {type(v) for v in original.values()} <= {list, dict, str, int, float, bool, type(None), date}
+
+        copied = loader._fast_copy(original)
+
+        assert copied == original
+        assert copied["a"] is not original["a"]
+        assert copied["a"][1] is not original["a"][1]
+
     def test_non_dict_value_replaces_dict(self):
         """A non-dict task value replaces a dict template value."""
         template = {"browser": {"type": "chrome"}}
@@ -9,7 +9,7 @@ from click.testing import CliRunner
 from autowebprompt.cli.main import cli
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def runner():
     return CliRunner()
 
@@ -1,5 +1,7 @@
 """Tests for autowebprompt.storage.neon — Neon REST API client."""
 
+import json
+import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -7,16 +9,35 @@ import pytest
 from autowebprompt.storage.neon import NeonClient, NeonAPIError, NeonProject
 
 
-@pytest.fixture
-def mock_httpx():
-    """Patch httpx so NeonClient can be constructed without installing it."""
+@pytest.fixture(scope="module")
+def _httpx_module():
+    """A stand-in httpx module, built and installed once for this test module."""
     mock_module = MagicMock()
-    mock_client_instance = MagicMock()
+    # NeonClient only calls these on its httpx.Client
+    mock_client_instance = MagicMock(spec_set=["get", "post", "close"])
     mock_module.Client.return_value = mock_client_instance
-    with patch.dict("sys.modules", {"httpx": mock_module}):
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(sys.modules, "httpx", mock_module)
         yield mock_module, mock_client_instance
 
 
+@pytest.fixture
+def mock_httpx(_httpx_module):
+    """Patch httpx so NeonClient can be constructed without installing it."""
+    mock_module, mock_client_instance = _httpx_module
+    mock_client_instance.reset_mock(return_value=True, side_effect=True)
+    return mock_module, mock_client_instance
+
+
+def _json_response(status_code, payload):
+    """A mock httpx response carrying *payload* both as bytes and via .json()."""
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.content = json.dumps(payload).encode()
+    resp.json.return_value = payload
+    return resp
+
+
 class TestValidateApiKey:
     def test_valid_key(self, mock_httpx):
         _, mock_client = mock_httpx
@@ -26,7 +47,7 @@ class TestValidateApiKey:
 
         client = NeonClient("neon_key_abc")
         assert client.validate_api_key() is True
-        mock_client.get.assert_called_once_with("/projects")
+        mock_client.get.assert_called_once_with("/projects", params={"limit": 1})
 
     def test_invalid_key(self, mock_httpx):
         _, mock_client = mock_httpx
@@ -44,13 +65,33 @@ class TestValidateApiKey:
         client = NeonClient("neon_key_abc")
         assert client.validate_api_key() is False
 
+    def test_success_is_cached(self, mock_httpx):
+        _, mock_client = mock_httpx
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_client.get.return_value = mock_resp
+
+        client = NeonClient("neon_key_abc")
+        assert client.validate_api_key() is True
+        assert client.validate_api_key() is True
+        mock_client.get.assert_called_once_with("/projects", params={"limit": 1})
+
+    def test_failure_is_not_cached(self, mock_httpx):
+        _, mock_client = mock_httpx
+        mock_resp = MagicMock()
+        mock_resp.status_code = 401
+        mock_client.get.return_value = mock_resp
+
+        client = NeonClient("bad_key")
+        client.validate_api_key()
+        client.validate_api_key()
+        assert mock_client.get.call_count == 2
+
 
 class TestCreateProject:
     def test_success(self, mock_httpx):
         _, mock_client = mock_httpx
-        mock_resp = MagicMock()
-        mock_resp.status_code = 201
-        mock_resp.json.return_value = {
+        mock_resp = _json_response(201, {
             "project": {
                 "id": "proj-abc123",
                 "name": "autowebprompt",
@@ -65,7 +106,7 @@ class TestCreateProject:
             ],
             "databases": [{"name": "neondb"}],
             "roles": [{"name": "user"}],
-        }
+        })
         mock_client.post.return_value = mock_resp
 
         client = NeonClient("neon_key_abc")
@@ -90,10 +131,8 @@ class TestCreateProject:
 
     def test_api_error(self, mock_httpx):
         _, mock_client = mock_httpx
-        mock_resp = MagicMock()
-        mock_resp.status_code = 422
+        mock_resp = _json_response(422, {"message": "Validation failed"})
         mock_resp.text = "Validation failed"
-        mock_resp.json.return_value = {"message": "Validation failed"}
         mock_client.post.return_value = mock_resp
 
         client = NeonClient("neon_key_abc")
@@ -105,9 +144,7 @@ class TestCreateProject:
 
     def test_fallback_without_connection_uris(self, mock_httpx):
         _, mock_client = mock_httpx
-        mock_resp = MagicMock()
-        mock_resp.status_code = 201
-        mock_resp.json.return_value = {
+        mock_resp = _json_response(201, {
             "project": {
                 "id": "proj-xyz",
                 "name": "test",
@@ -116,7 +153,7 @@ class TestCreateProject:
             "connection_uris": [],
             "databases": [{"name": "mydb"}],
             "roles": [{"name": "admin"}],
-        }
+        })
         mock_client.post.return_value = mock_resp
 
         client = NeonClient("neon_key_abc")
@@ -140,3 +177,29 @@ class TestContextManager:
         with NeonClient("key") as client:
             pass
         mock_client.close.assert_called_once()
+
+
+class TestDecodeJson:
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_parses_body(self, monkeypatch, use_orjson):
+        from autowebprompt.storage import neon
+
+        if not use_orjson:
+            monkeypatch.setattr(neon, "orjson", None)
+        elif neon.orjson is None:
+            pytest.skip("orjson not installed")
+        resp = _json_response(200, {"projects": [{"id": "p1"}]})
+
+        assert neon._decode_json(resp) == {"projects": [{"id": "p1"}]}
+
+
+class TestH2Detection:
+    def test_looked_up_once(self):
+        from autowebprompt.storage import neon
+
+        neon._h2_available.cache_clear()
+        with patch("importlib.util.find_spec", return_value=None) as find_spec:
+            assert neon._h2_available() is False
+            assert neon._h2_available() is False
+        find_spec.assert_called_once_with("h2")
+        neon._h2_available.cache_clear()
@@ -0,0 +1,55 @@
+"""Tests for autowebprompt.engine.runner module."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from autowebprompt.engine import runner
+
+
+class TestSleepBeforeRetry:
+    """Tests for _sleep_before_retry()."""
+
+    @pytest.fixture
+    def sleep(self, monkeypatch):
+        mock_sleep = AsyncMock()
+        monkeypatch.setattr(runner.asyncio, "sleep", mock_sleep)
+        return mock_sleep
+
+    async def test_sleeps_delay_plus_jitter_and_doubles(self, sleep, monkeypatch):
+        """The sleep taken carries the jitter; the returned delay doubles."""
+        monkeypatch.setattr(runner.random, "uniform", lambda low, high: high)
+
+        next_delay = await runner._sleep_before_retry(10)
+
+        sleep.assert_awaited_once_with(11)
+        assert next_delay == 20
+
+    async def test_sleep_and_next_delay_are_capped(self, sleep, monkeypatch):
+        """Neither the jittered sleep nor the next delay exceed MAX_RETRY_DELAY."""
+        monkeypatch.setattr(runner.random, "uniform", lambda low, high: high)
+
+        next_delay = await runner._sleep_before_retry(runner.MAX_RETRY_DELAY)
+
+        sleep.assert_awaited_once_with(runner.MAX_RETRY_DELAY)
+        assert next_delay == runner.MAX_RETRY_DELAY
+
+
+class TestLoadConfig:
+    """Tests for runner.load_config()."""
+
+    def test_json_template_is_unwrapped(self, tmp_path):
+        path = tmp_path / "task_config.json"
+        path.write_text('{"template": {"provider": "claude"}}')
+
+        assert runner.load_config(str(path)) == {"provider": "claude"}
+
+    def test_yaml_returns_independent_copies(self, tmp_path):
+        """YAML goes through config.loader, so callers can mutate the result."""
+        path = tmp_path / "config.yaml"
+        path.write_text("template:\n  browser:\n    headless: true\n")
+
+        first = runner.load_config(str(path))
+        first["browser"]["headless"] = False
+
+        assert runner.load_config(str(path)) == {"browser": {"headless": True}}
@@ -5,10 +5,13 @@ from unittest.mock import MagicMock, patch, call
 import pytest
 
 from autowebprompt.storage.schema import (
+    MIGRATION_BATCH_SQL,
     SCHEMA_VERSION,
+    SET_VERSION_SQL,
     get_migration_sql,
     run_migration,
     check_connection,
+    close_connections,
     get_table_status,
 )
 
@@ -38,6 +41,11 @@ class TestGetMigrationSql:
         assert a == b
         assert a is not b
 
+    def test_statements_are_shared(self):
+        a = get_migration_sql()
+        b = get_migration_sql()
+        assert all(x is y for x, y in zip(a, b))
+
 
 class TestRunMigration:
     @patch("autowebprompt.storage.schema.psycopg2", create=True)
@@ -47,18 +55,22 @@ class TestRunMigration:
         mock_psycopg2.connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cur
 
-        # Patch the import inside the function.
-        with patch.dict("sys.modules", {"psycopg2": mock_psycopg2}):
-            version = run_migration("postgresql://test")
+        version = run_migration("postgresql://test")
 
         assert version == SCHEMA_VERSION
         mock_psycopg2.connect.assert_called_once_with("postgresql://test")
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
 
-        # Should have executed all migration statements + SET_VERSION.
-        stmts = get_migration_sql()
-        assert mock_cur.execute.call_count == len(stmts) + 1
+        # All DDL goes in one execute (behind the advisory lock), then SET_VERSION.
+        assert mock_cur.execute.call_count == 2
+        # Multi-statement strings are only safe to send without bound parameters
+        assert mock_cur.execute.call_args_list[0] == call(MIGRATION_BATCH_SQL)
+        ddl = mock_cur.execute.call_args_list[0].args[0]
+        assert ddl.startswith("SELECT pg_advisory_xact_lock(")
+        for stmt in get_migration_sql():
+            assert stmt in ddl
+        assert mock_cur.execute.call_args_list[1].args == (SET_VERSION_SQL, (SCHEMA_VERSION,))
 
     @patch("autowebprompt.storage.schema.psycopg2", create=True)
     def test_rollback_on_error(self, mock_psycopg2):
@@ -68,17 +80,31 @@ class TestRunMigration:
         mock_conn.cursor.return_value = mock_cur
         mock_cur.execute.side_effect = Exception("SQL error")
 
-        with patch.dict("sys.modules", {"psycopg2": mock_psycopg2}):
-            with pytest.raises(Exception, match="SQL error"):
-                run_migration("postgresql://test")
+        with pytest.raises(Exception, match="SQL error"):
+            run_migration("postgresql://test")
 
         mock_conn.rollback.assert_called_once()
         mock_conn.close.assert_called_once()
 
-    def test_raises_without_psycopg2(self):
-        with patch.dict("sys.modules", {"psycopg2": None}):
-            with pytest.raises(RuntimeError, match="psycopg2"):
-                run_migration("postgresql://test")
+    def test_raises_without_psycopg2(self, monkeypatch):
+        monkeypatch.setattr("autowebprompt.storage.schema.psycopg2", None)
+        with pytest.raises(RuntimeError, match="psycopg2"):
+            run_migration("postgresql://test")
+
+    @patch("autowebprompt.storage.schema.psycopg2", create=True)
+    def test_reuses_check_connection(self, mock_psycopg2):
+        mock_conn = MagicMock(closed=0)
+        mock_psycopg2.connect.return_value = mock_conn
+
+        assert check_connection("postgresql://init") is True
+        run_migration("postgresql://init")
+
+        mock_psycopg2.connect.assert_called_once_with("postgresql://init")
+        mock_conn.commit.assert_called_once()
+        mock_conn.close.assert_not_called()
+        assert mock_conn.autocommit is True
+        close_connections()
+        mock_conn.close.assert_called_once()
 
 
 class TestTestConnection:
@@ -89,8 +115,7 @@ class TestTestConnection:
         mock_psycopg2.connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cur
 
-        with patch.dict("sys.modules", {"psycopg2": mock_psycopg2}):
-            assert check_connection("postgresql://test") is True
+        assert check_connection("postgresql://test") is True
 
         mock_cur.execute.assert_called_once_with("SELECT 1")
 
@@ -98,8 +123,7 @@ class TestTestConnection:
     def test_returns_false_on_failure(self, mock_psycopg2):
         mock_psycopg2.connect.side_effect = Exception("Connection refused")
 
-        with patch.dict("sys.modules", {"psycopg2": mock_psycopg2}):
-            assert check_connection("postgresql://test") is False
+        assert check_connection("postgresql://test") is False
 
 
 class TestGetTableStatus:
@@ -111,16 +135,13 @@ class TestGetTableStatus:
         mock_conn.cursor.return_value = mock_cur
 
         # Mock: schema version exists, both tables exist with rows.
-        mock_cur.fetchone.side_effect = [
-            ("1",),       # schema_version
-            (True,),      # tasks exists
-            (42,),        # tasks count
-            (True,),      # task_attempts exists
-            (108,),       # task_attempts count
+        mock_cur.fetchone.return_value = ("1",)
+        mock_cur.fetchall.return_value = [
+            ("tasks", True, 42),
+            ("task_attempts", True, 108),
         ]
 
-        with patch.dict("sys.modules", {"psycopg2": mock_psycopg2}):
-            status = get_table_status("postgresql://test")
+        status = get_table_status("postgresql://test")
 
         assert status["schema_version"] == "1"
         assert status["tables"]["tasks"]["exists"] is True
@@ -128,6 +149,37 @@ class TestGetTableStatus:
         assert status["tables"]["task_attempts"]["exists"] is True
         assert status["tables"]["task_attempts"]["rows"] == 108
 
+    @patch("autowebprompt.storage.schema.psycopg2", create=True)
+    def test_status_uses_one_query_for_all_tables(self, mock_psycopg2):
+        mock_conn = MagicMock(closed=0)
+        mock_cur = MagicMock()
+        mock_psycopg2.connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cur
+        mock_cur.fetchone.return_value = None
+        mock_cur.fetchall.return_value = [("tasks", True, 5), ("task_attempts", False, 0)]
+
+        status = get_table_status("postgresql://status")
+
+        # One schema_version read plus one status query.
+        assert mock_cur.execute.call_count == 2
+        assert status["schema_version"] is None
+        assert status["tables"]["tasks"] == {"exists": True, "rows": 5}
+        assert status["tables"]["task_attempts"] == {"exists": False, "rows": 0}
+        close_connections()
+
+    @patch("autowebprompt.storage.schema.psycopg2", create=True)
+    def test_status_reuses_check_connection(self, mock_psycopg2):
+        mock_conn = MagicMock(closed=0)
+        mock_psycopg2.connect.return_value = mock_conn
+        mock_conn.cursor.return_value.fetchall.return_value = []
+
+        assert check_connection("postgresql://shared") is True
+        get_table_status("postgresql://shared")
+        close_connections()
+
+        mock_psycopg2.connect.assert_called_once_with("postgresql://shared")
+        mock_conn.close.assert_called_once()
+
     def test_dry_run_sql_is_valid(self):
         """Verify the SQL strings are syntactically reasonable."""
         stmts = get_migration_sql()
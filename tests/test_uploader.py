@@ -0,0 +1,149 @@
+"""Tests for autowebprompt.storage.uploader module."""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from autowebprompt.storage import models
+from autowebprompt.storage.uploader import ResultUploader
+
+
+@pytest.fixture
+def db_session_factory():
+    """In-memory SQLite database with the storage models and two tasks."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Task.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add_all([
+            models.Task(id=1, task_name="alpha", task_source="src"),
+            models.Task(id=2, task_name="beta", task_source="src"),
+        ])
+        session.commit()
+    with patch("autowebprompt.storage.models.get_session", side_effect=factory):
+        yield factory
+    engine.dispose()
+
+
+def _row(**overrides):
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    row = {
+        "task_name": "alpha",
+        "task_source": "src",
+        "artifact_s3_uris": ["s3://bucket/a.xlsx"],
+        "conversation_s3_uri": "s3://bucket/conv.json",
+        "start_time": start,
+        "end_time": start + timedelta(minutes=30),
+        "cost": None,
+        "task_id": None,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestSaveBatchToDatabase:
+    """Tests for ResultUploader.save_batch_to_database()."""
+
+    def test_inserts_rows_and_returns_ids_in_order(self, db_session_factory):
+        """Every resolvable row is inserted; unknown tasks map to None."""
+        uploader = ResultUploader({"db_enabled": True, "agent_model_name": "m"})
+
+        ids = uploader.save_batch_to_database([
+            _row(),
+            _row(task_name="missing"),
+            _row(task_id=2, task_name="ignored"),
+        ])
+
+        assert ids[1] is None
+        assert ids[0] is not None and ids[2] is not None
+        with db_session_factory() as session:
+            attempts = {a.id: a for a in session.scalars(select(models.TaskAttempt))}
+        assert attempts[ids[0]].task_id == 1
+        assert attempts[ids[2]].task_id == 2
+        assert attempts[ids[0]].time_taken_mins == 30
+        assert attempts[ids[0]].prompt_files == ["s3://bucket/conv.json"]
+        assert attempts[ids[0]].agent_model_name == "m"
+
+    def test_save_to_database_wraps_batch(self, db_session_factory):
+        """The single-row API returns the new attempt ID."""
+        uploader = ResultUploader({"db_enabled": True})
+        row = _row()
+
+        attempt_id = uploader.save_to_database(**row)
+
+        assert isinstance(attempt_id, int)
+
+    def test_resolved_task_names_are_cached(self, db_session_factory):
+        """A task name found once is not looked up again by the same uploader."""
+        uploader = ResultUploader({"db_enabled": True})
+        uploader.save_batch_to_database([_row()])
+        assert uploader._task_id_cache == {("alpha", "src"): 1}
+
+        with db_session_factory() as session:
+            session.execute(sqlalchemy.update(models.Task).values(task_name="renamed"))
+            session.commit()
+        ids = uploader.save_batch_to_database([_row()])
+
+        assert ids[0] is not None
+
+    def test_disabled_returns_none_for_each_row(self):
+        """With the database disabled nothing is written."""
+        uploader = ResultUploader({"db_enabled": False})
+
+        assert uploader.save_batch_to_database([_row(), _row()]) == [None, None]
+
+
+class TestUploadConversation:
+    """Tests for ResultUploader.upload_conversation()."""
+
+    def test_payload_is_compact_utf8_json(self):
+        """Non-ASCII text stays as UTF-8 and non-JSON values are stringified."""
+        uploader = ResultUploader({})
+        history = [{"role": "user", "content": "café", "sent_at": datetime(2026, 1, 1)}]
+
+        with patch.object(uploader, "upload_bytes_to_s3", return_value="s3://b/k") as upload:
+            uri = uploader.upload_conversation(history, "task a", timestamp="20260101_000000")
+
+        assert uri == "s3://b/k"
+        payload, key = upload.call_args.args[:2]
+        assert key.endswith("/20260101_000000_task_a.json")
+        assert "café".encode("utf-8") in payload
+        assert b", " not in payload
+        message = json.loads(payload)["messages"][0]
+        assert message["sent_at"].startswith("2026-01-01")
+
+
+class TestUploadResults:
+    """Tests for ResultUploader.upload_results()."""
+
+    def test_identical_artifacts_are_uploaded_once(self, tmp_path):
+        """Byte-identical files share one upload; each path still gets its URI."""
+        first = tmp_path / "model.xlsx"
+        retry = tmp_path / "model (1).xlsx"
+        other = tmp_path / "other.xlsx"
+        first.write_bytes(b"same bytes")
+        retry.write_bytes(b"same bytes")
+        other.write_bytes(b"diff bytes")
+        uploader = ResultUploader({})
+        uploader._s3_client = object()
+
+        with patch.object(
+            uploader, "upload_artifact", side_effect=lambda path, *args: f"s3://b/{path.name}"
+        ) as upload:
+            result = uploader.upload_results("t", "src", artifact_paths=[first, retry, other])
+
+        assert upload.call_count == 2
+        assert result["artifact_s3_uris"] == [
+            "s3://b/model.xlsx", "s3://b/model.xlsx", "s3://b/other.xlsx",
+        ]
+        assert result["success"] is True
@@ -1,24 +1,68 @@
 """Tests for autowebprompt.validators.excel module."""
 
-import sys
-from unittest.mock import patch, MagicMock
+import functools
+import io
+import zipfile
+from unittest.mock import patch
 
 import pytest
 
 from autowebprompt.agents.base import TaskStatus
+from autowebprompt.validators import excel
 from autowebprompt.validators.excel import validate_excel_file
 
 
-def _mock_openpyxl(sheetnames, side_effect=None):
-    """Create a mock openpyxl module with a load_workbook that returns a workbook with given sheetnames."""
-    mock_module = MagicMock()
-    if side_effect:
-        mock_module.load_workbook.side_effect = side_effect
-    else:
-        mock_wb = MagicMock()
-        mock_wb.sheetnames = sheetnames
-        mock_module.load_workbook.return_value = mock_wb
-    return mock_module
+@functools.lru_cache(maxsize=None)
+def _xlsx_bytes(sheetnames: tuple[str, ...], trailer: str = "") -> bytes:
+    """A minimal uncompressed .xlsx package containing only xl/workbook.xml."""
+    sheets = "".join(
+        f'<sheet name="{name}" sheetId="{i}" r:id="rId{i}"/>'
+        for i, name in enumerate(sheetnames, start=1)
+    )
+    workbook_xml = (
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f"<sheets>{sheets}</sheets>{trailer}</workbook>"
+    )
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as archive:
+        archive.writestr("xl/workbook.xml", workbook_xml)
+    return buf.getvalue()
+
+
+def _write_xlsx_package(path, sheetnames, trailer=""):
+    """Write a minimal .xlsx package to *path*."""
+    path.write_bytes(_xlsx_bytes(tuple(sheetnames), trailer))
+
+
+@pytest.fixture(scope="session")
+def make_xlsx(tmp_path_factory):
+    """
+    Factory for minimal .xlsx packages, shared across the session.
+
+    Each distinct (sheetnames, name) package is written once; tests must treat
+    the returned path as read-only.
+    """
+    directory = tmp_path_factory.mktemp("xlsx")
+    written = {}
+
+    def _make(sheetnames, name="book.xlsx"):
+        key = (tuple(sheetnames), name)
+        path = written.get(key)
+        if path is None:
+            path = directory / f"{len(written)}-{name}"
+            _write_xlsx_package(path, sheetnames)
+            written[key] = path
+        return path
+    return _make
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sheet_name_cache():
+    """Each test sees the validator's sheet-name cache empty."""
+    excel._cached_sheet_names.cache_clear()
+    yield
+    excel._cached_sheet_names.cache_clear()
 
 
 class TestValidateExcelFile:
@@ -31,7 +75,7 @@ class TestValidateExcelFile:
         is_valid, status, msg = validate_excel_file(missing)
 
         assert is_valid is False
-        assert status == TaskStatus.DOWNLOAD_FAILED
+        assert status is TaskStatus.DOWNLOAD_FAILED
         assert "does not exist" in msg
 
     def test_empty_file(self, tmp_path):
@@ -42,212 +86,193 @@ class TestValidateExcelFile:
         is_valid, status, msg = validate_excel_file(empty_file)
 
         assert is_valid is False
-        assert status == TaskStatus.DOWNLOAD_FAILED
+        assert status is TaskStatus.DOWNLOAD_FAILED
         assert "empty" in msg.lower()
 
     def test_corrupted_file(self, tmp_path):
-        """Returns FILE_CORRUPTED when openpyxl cannot open the file."""
+        """Returns FILE_CORRUPTED when the file is not a zip package."""
         bad_file = tmp_path / "corrupt.xlsx"
         bad_file.write_bytes(b"not a real xlsx file content")
 
-        mock_openpyxl = _mock_openpyxl([], side_effect=Exception("Bad format"))
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(bad_file)
+        is_valid, status, msg = validate_excel_file(bad_file)
 
         assert is_valid is False
-        assert status == TaskStatus.FILE_CORRUPTED
+        assert status is TaskStatus.FILE_CORRUPTED
         assert "Cannot open" in msg
 
-    def test_valid_file_with_both_sheets(self, tmp_path):
+    def test_bad_magic_short_circuits(self, tmp_path):
+        """A file without the zip header is rejected without opening it as a zip."""
+        bad_file = tmp_path / "corrupt.xlsx"
+        bad_file.write_bytes(b"<html>error page</html>" + b"PK\x05\x06" + b"\x00" * 18)
+
+        with patch("autowebprompt.validators.excel.zipfile.ZipFile") as zip_file:
+            is_valid, status, msg = validate_excel_file(bad_file)
+
+        assert status is TaskStatus.FILE_CORRUPTED
+        assert "bad magic" in msg
+        zip_file.assert_not_called()
+
+    def test_valid_file_with_both_sheets(self, make_xlsx):
         """Returns SUCCESS when file has both 'model' and 'answers' sheets."""
-        xlsx_file = tmp_path / "good.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+        xlsx_file = make_xlsx(["Financial Model", "Answers Sheet", "Summary"], "good.xlsx")
 
-        mock_openpyxl = _mock_openpyxl(["Financial Model", "Answers Sheet", "Summary"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(xlsx_file)
+        is_valid, status, msg = validate_excel_file(xlsx_file)
 
         assert is_valid is True
-        assert status == TaskStatus.SUCCESS
+        assert status is TaskStatus.SUCCESS
         assert msg == "Valid"
 
-    def test_missing_model_sheet(self, tmp_path):
-        """Returns MISSING_SHEETS when 'model' sheet is not found."""
-        xlsx_file = tmp_path / "no_model.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
-
-        mock_openpyxl = _mock_openpyxl(["Answers", "Summary"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(xlsx_file)
+    @pytest.mark.parametrize(
+        "sheets, require_model, require_answers, expect_valid, must_contain",
+        [
+            (["Answers", "Summary"], True, True, False, ["model"]),
+            (["Financial Model", "Summary"], True, True, False, ["answers"]),
+            (["Sheet1", "Data"], True, True, False, ["model", "answers"]),
+            (["Random", "Stuff"], False, False, True, []),
+            (["My Model"], True, False, True, []),
+            (["Answers", "Data"], True, False, False, ["model"]),
+            (["My Answers"], False, True, True, []),
+            (["Model", "Data"], False, True, False, ["answers"]),
+        ],
+        ids=[
+            "missing_model",
+            "missing_answers",
+            "missing_both",
+            "no_requirements",
+            "only_model_required_and_present",
+            "only_model_required_but_missing",
+            "only_answers_required_and_present",
+            "only_answers_required_but_missing",
+        ],
+    )
+    def test_sheet_requirements(
+        self, make_xlsx, sheets, require_model, require_answers, expect_valid, must_contain
+    ):
+        """Required sheets are checked per flag; misses report MISSING_SHEETS."""
+        xlsx_file = make_xlsx(sheets)
+
+        is_valid, status, msg = validate_excel_file(
+            xlsx_file,
+            require_model_sheet=require_model,
+            require_answers_sheet=require_answers,
+        )
+
+        assert is_valid is expect_valid
+        assert status is (TaskStatus.SUCCESS if expect_valid else TaskStatus.MISSING_SHEETS)
+        for word in must_contain:
+            assert word in msg.lower()
+
+    def test_workbook_not_read_without_requirements(self, make_xlsx):
+        """With both requirements off only the zip header is checked."""
+        xlsx_file = make_xlsx(["Random", "Stuff"])
+
+        with patch.object(excel, "_cached_sheet_names") as read:
+            is_valid, status, msg = validate_excel_file(
+                xlsx_file, require_model_sheet=False, require_answers_sheet=False
+            )
 
-        assert is_valid is False
-        assert status == TaskStatus.MISSING_SHEETS
-        assert "model" in msg.lower()
+        assert is_valid is True
+        read.assert_not_called()
 
-    def test_missing_answers_sheet(self, tmp_path):
-        """Returns MISSING_SHEETS when 'answers' sheet is not found."""
-        xlsx_file = tmp_path / "no_answers.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+    def test_non_zip_rejected_without_requirements(self, tmp_path):
+        """The header-only check still reports a non-zip file as corrupted."""
+        bad_file = tmp_path / "corrupt.xlsx"
+        bad_file.write_bytes(b"not a real xlsx file content")
 
-        mock_openpyxl = _mock_openpyxl(["Financial Model", "Summary"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(xlsx_file)
+        is_valid, status, msg = validate_excel_file(
+            bad_file, require_model_sheet=False, require_answers_sheet=False
+        )
 
         assert is_valid is False
-        assert status == TaskStatus.MISSING_SHEETS
-        assert "answers" in msg.lower()
+        assert status is TaskStatus.FILE_CORRUPTED
 
-    def test_missing_both_sheets(self, tmp_path):
-        """Returns MISSING_SHEETS when both required sheets are absent."""
-        xlsx_file = tmp_path / "no_both.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+    def test_case_insensitive_sheet_matching(self, make_xlsx):
+        """Sheet name matching is case-insensitive."""
+        xlsx_file = make_xlsx(["FINANCIAL MODEL", "ANSWERS"], "case.xlsx")
 
-        mock_openpyxl = _mock_openpyxl(["Sheet1", "Data"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(xlsx_file)
+        is_valid, status, msg = validate_excel_file(xlsx_file)
 
-        assert is_valid is False
-        assert status == TaskStatus.MISSING_SHEETS
-        assert "model" in msg.lower()
-        assert "answers" in msg.lower()
+        assert is_valid is True
+        assert status is TaskStatus.SUCCESS
 
-    def test_no_sheet_requirements(self, tmp_path):
-        """Returns SUCCESS when sheet requirements are disabled."""
-        xlsx_file = tmp_path / "any_sheets.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+    def test_unicode_sheet_names(self, make_xlsx):
+        """Matching ignores accents and uses full Unicode case folding."""
+        xlsx_file = make_xlsx(["MODÈLE financier", "Réponses ANSWERS"], "unicode.xlsx")
 
-        mock_openpyxl = _mock_openpyxl(["Random", "Stuff"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(
-                xlsx_file,
-                require_model_sheet=False,
-                require_answers_sheet=False,
-            )
+        is_valid, status, msg = validate_excel_file(xlsx_file)
 
         assert is_valid is True
-        assert status == TaskStatus.SUCCESS
+        assert status is TaskStatus.SUCCESS
 
-    def test_only_model_required_and_present(self, tmp_path):
-        """Returns SUCCESS when only model is required and it exists."""
-        xlsx_file = tmp_path / "model_only.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+    def test_many_sheets(self, make_xlsx):
+        """Required sheets are found after hundreds of unrelated ones."""
+        xlsx_file = make_xlsx([f"Sheet{i}" for i in range(500)] + ["model", "ANSWERS"], "many.xlsx")
 
-        mock_openpyxl = _mock_openpyxl(["My Model"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(
-                xlsx_file,
-                require_model_sheet=True,
-                require_answers_sheet=False,
-            )
+        is_valid, status, msg = validate_excel_file(xlsx_file)
 
         assert is_valid is True
-        assert status == TaskStatus.SUCCESS
+        assert status is TaskStatus.SUCCESS
 
-    def test_only_model_required_but_missing(self, tmp_path):
-        """Returns MISSING_SHEETS when only model is required but absent."""
-        xlsx_file = tmp_path / "no_model2.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+    def test_answer_singular_matches(self, make_xlsx):
+        """The validator also matches 'answer' (singular) for the answers sheet."""
+        xlsx_file = make_xlsx(["Model", "Answer"], "singular.xlsx")
 
-        mock_openpyxl = _mock_openpyxl(["Answers", "Data"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(
-                xlsx_file,
-                require_model_sheet=True,
-                require_answers_sheet=False,
-            )
+        is_valid, status, msg = validate_excel_file(xlsx_file)
 
-        assert is_valid is False
-        assert status == TaskStatus.MISSING_SHEETS
+        assert is_valid is True
+        assert status is TaskStatus.SUCCESS
 
-    def test_only_answers_required_and_present(self, tmp_path):
-        """Returns SUCCESS when only answers is required and exists."""
-        xlsx_file = tmp_path / "answers_only.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+    def test_accepts_string_path(self, make_xlsx):
+        """validate_excel_file accepts a string path, not just a Path object."""
+        xlsx_file = make_xlsx(["Model", "Answers"], "string_path.xlsx")
 
-        mock_openpyxl = _mock_openpyxl(["My Answers"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(
-                xlsx_file,
-                require_model_sheet=False,
-                require_answers_sheet=True,
-            )
+        is_valid, status, msg = validate_excel_file(str(xlsx_file))
 
         assert is_valid is True
-        assert status == TaskStatus.SUCCESS
 
-    def test_only_answers_required_but_missing(self, tmp_path):
-        """Returns MISSING_SHEETS when only answers is required but absent."""
-        xlsx_file = tmp_path / "no_answers2.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+    def test_package_missing_sheets_detected(self, make_xlsx):
+        """Sheet checks apply to names read from the package."""
+        xlsx_file = make_xlsx(["Model"], "package.xlsx")
 
-        mock_openpyxl = _mock_openpyxl(["Model", "Data"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(
-                xlsx_file,
-                require_model_sheet=False,
-                require_answers_sheet=True,
-            )
+        is_valid, status, msg = validate_excel_file(xlsx_file)
 
         assert is_valid is False
-        assert status == TaskStatus.MISSING_SHEETS
+        assert status is TaskStatus.MISSING_SHEETS
+        assert "answers" in msg
 
-    def test_case_insensitive_sheet_matching(self, tmp_path):
-        """Sheet name matching is case-insensitive."""
-        xlsx_file = tmp_path / "case.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+    def test_unchanged_file_is_read_once(self, tmp_path):
+        """Revalidating an unchanged file reuses its sheet names."""
+        xlsx_file = tmp_path / "cached.xlsx"
+        _write_xlsx_package(xlsx_file, ["Model", "Answers"])
 
-        mock_openpyxl = _mock_openpyxl(["FINANCIAL MODEL", "ANSWERS"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(xlsx_file)
+        with patch.object(excel, "_read_sheet_names", wraps=excel._read_sheet_names) as read:
+            assert validate_excel_file(xlsx_file)[0] is True
+            assert validate_excel_file(str(xlsx_file))[0] is True
+            assert read.call_count == 1
 
-        assert is_valid is True
-        assert status == TaskStatus.SUCCESS
+            _write_xlsx_package(xlsx_file, ["Model only"])
+            assert validate_excel_file(xlsx_file)[1] is TaskStatus.MISSING_SHEETS
+            assert read.call_count == 2
 
-    def test_answer_singular_matches(self, tmp_path):
-        """The validator also matches 'answer' (singular) for the answers sheet."""
-        xlsx_file = tmp_path / "singular.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+    def test_parsing_stops_after_sheets(self, tmp_path):
+        """Nothing after </sheets> is parsed, even if it is large or malformed."""
+        xlsx_file = tmp_path / "big.xlsx"
+        trailer = '<definedNames><definedName name="x">' + "A" * (1 << 20) + "<unclosed>"
+        _write_xlsx_package(xlsx_file, ["Model", "Answers"], trailer=trailer)
 
-        mock_openpyxl = _mock_openpyxl(["Model", "Answer"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(xlsx_file)
+        is_valid, status, msg = validate_excel_file(xlsx_file)
 
         assert is_valid is True
-        assert status == TaskStatus.SUCCESS
-
-    def test_openpyxl_not_installed(self, tmp_path):
-        """Returns SUCCESS with warning when openpyxl is not installed."""
-        xlsx_file = tmp_path / "no_openpyxl.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
-
-        # Remove openpyxl from sys.modules to simulate it not being installed
-        saved = sys.modules.pop("openpyxl", None)
-        try:
-            import builtins
-            original_import = builtins.__import__
-
-            def mock_import(name, *args, **kwargs):
-                if name == "openpyxl":
-                    raise ImportError("No module named 'openpyxl'")
-                return original_import(name, *args, **kwargs)
-
-            with patch("builtins.__import__", side_effect=mock_import):
-                is_valid, status, msg = validate_excel_file(xlsx_file)
-
-            assert is_valid is True
-            assert status == TaskStatus.SUCCESS
-            assert "openpyxl not available" in msg
-        finally:
-            if saved is not None:
-                sys.modules["openpyxl"] = saved
-
-    def test_accepts_string_path(self, tmp_path):
-        """validate_excel_file accepts a string path, not just a Path object."""
-        xlsx_file = tmp_path / "string_path.xlsx"
-        xlsx_file.write_bytes(b"\x00" * 100)
+        assert status is TaskStatus.SUCCESS
 
-        mock_openpyxl = _mock_openpyxl(["Model", "Answers"])
-        with patch.dict(sys.modules, {"openpyxl": mock_openpyxl}):
-            is_valid, status, msg = validate_excel_file(str(xlsx_file))
+    def test_zip_without_workbook_is_corrupted(self, tmp_path):
+        """A zip with no xl/workbook.xml is not a workbook."""
+        xlsx_file = tmp_path / "not_a_workbook.xlsx"
+        with zipfile.ZipFile(xlsx_file, "w") as archive:
+            archive.writestr("readme.txt", "hello")
 
-        assert is_valid is True
+        is_valid, status, msg = validate_excel_file(xlsx_file)
+
+        assert is_valid is False
+        assert status is TaskStatus.FILE_CORRUPTED
+        assert "no xl/workbook.xml" in msg